@@ -3,14 +3,38 @@
 @Author: Eric Santos <ericshantos13@gmail.com>
 
 Application factory module to create and configure the Flask app instance,
-including initializing scheduler, enabling CORS, and registering routers.
+including setting up logging, initializing scheduler, enabling CORS,
+installing the request timing, rate limiting and visit tracking middleware
+and registering routers.
+
+Creating the app has no side effects beyond the app itself: each factory
+has its own copy of the default components, built on first use (the
+middleware resolves the visit tracker with the first request), and the
+logging listener and report scheduler
+threads are started by the first request of each process. A gunicorn
+master that preloads the app, or a CLI tool importing it, therefore starts
+no threads, and each forked worker starts its own.
 """
 
+import logging
+import os
+import threading
+from typing import Optional
+
 from flask import Flask
 from flask_cors import CORS
 
-from .routers import home_router
-from .utils import scheduler
+from .middleware import (
+    RateLimitMiddleware,
+    RequestTimingMiddleware,
+    VisitTrackingMiddleware,
+)
+from .routers import home_router, metrics_router, stats_router, track_router
+from .services import MetricsService, StatsService
+from .utils import components as default_components
+from .utils.async_logging import AsyncLogging
+from .utils.registry import EXTENSION_NAME, Components
+from .views.standard_response import create_serializer
 
 
 class AppFactory:
@@ -18,15 +42,84 @@ class AppFactory:
     Factory class for creating and configuring the Flask application.
     """
 
-    def __init__(self, env_config: str = "dev"):
+    def __init__(
+        self,
+        env_config: str = "dev",
+        async_logging: bool = True,
+        log_level: int = logging.INFO,
+        track_visits: bool = True,
+        json_backend: str = "auto",
+        count_throttled: bool = False,
+        time_requests: bool = True,
+        components: Optional[Components] = None,
+        start_scheduler: bool = True,
+    ):
         """
         Initializes the factory with environment configuration.
 
         Args:
             env_config (str): Environment configuration name,
             e.g. "dev", "prod".
+            async_logging (bool): Whether log handlers run on a background
+            queue listener instead of the request threads.
+            log_level (int): Level of the root logger when async logging
+            is enabled.
+            track_visits (bool): Whether routes are tracked unless their
+            Router opts out. If False, only routers created with
+            track=True are tracked.
+            json_backend (str): JSON serializer for API responses: "orjson",
+            "json" (standard library), or "auto" to use orjson when installed.
+            count_throttled (bool): Whether requests rejected by the rate
+            limiter (429) still count as visits.
+            time_requests (bool): Whether per-route request latency is
+            recorded.
+            components (Components, optional): Registry the app takes its
+            visit tracker, scheduler and services from. If None, a copy of
+            the default components of app.utils is used, so that the
+            factory's instances and services are its own.
+            start_scheduler (bool): Whether the report scheduler starts
+            with the first request of each process.
         """
         self.env_config = env_config
+        self.logging = AsyncLogging(level=log_level) if async_logging else None
+        self.track_visits = track_visits
+        self.serializer = create_serializer(json_backend)
+        self.count_throttled = count_throttled
+        self.time_requests = time_requests
+        self.components = components or Components(base=default_components)
+        self.start_scheduler = start_scheduler
+
+        self._started_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+        # Services are registered here, as they depend on the app layers
+        if "stats_service" not in self.components:
+            self.components.register("stats_service", StatsService.from_env)
+        if "metrics_service" not in self.components:
+            self.components.register("metrics_service", MetricsService.from_env)
+
+    def _start_background(self) -> None:
+        """
+        Starts the logging listener and the report scheduler, once per
+        process (threads do not survive a fork).
+        """
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+
+        with self._start_lock:
+            if self._started_pid == pid:
+                return
+
+            # Keep log handler I/O off the request threads
+            if self.logging is not None:
+                self.logging.start()
+
+            # Start the visit reporting scheduler
+            if self.start_scheduler:
+                self.components.get("scheduler").start()
+
+            self._started_pid = pid
 
     def __call__(self) -> Flask:
         """
@@ -36,14 +129,42 @@ class AppFactory:
             Flask: Configured Flask application.
         """
         app = Flask(__name__)
+        app.extensions[EXTENSION_NAME] = self.components
 
-        # Start the visit reporting scheduler
-        scheduler.start()
+        # Background threads start with the first request, so they run in
+        # the process serving it
+        app.before_request(self._start_background)
+
+        # Serialize API responses with the selected JSON backend
+        self.serializer.install(app)
 
         # Enable Cross-Origin Resource Sharing (CORS)
         CORS(app)
 
+        # Timing hooks come first, so the other hooks are measured too. The
+        # middleware takes the visit tracker from the app's components.
+        if self.time_requests:
+            RequestTimingMiddleware().init_app(app)
+
+        # Middleware is installed before routers register, so they can
+        # apply their tracking opt-in/out and rate limits. Hooks run in
+        # registration order: a limiter registered first rejects requests
+        # before they are counted as visits.
+        limiter = RateLimitMiddleware.from_env()
+        tracking = VisitTrackingMiddleware(
+            track_by_default=self.track_visits, trust_proxy=limiter.trust_proxy
+        )
+        if self.count_throttled:
+            tracking.init_app(app)
+            limiter.init_app(app)
+        else:
+            limiter.init_app(app)
+            tracking.init_app(app)
+
         # Register blueprints (routers)
         home_router.to(app)
+        stats_router.to(app)
+        metrics_router.to(app)
+        track_router.to(app)
 
         return app
@@ -6,10 +6,16 @@ Package initializer for application controllers.
 
 Exports:
     - HomeController: Controller for handling home page requests.
+    - MetricsController: Controller for the Prometheus metrics route.
+    - StatsController: Controller for the read-only statistics routes.
+    - TrackController: Controller for client-side tracking beacons.
 """
 
 from .home_controller import HomeController
+from .metrics_controller import MetricsController
+from .stats_controller import StatsController
+from .track_controller import TrackController
 
-__all__ = ["HomeController"]
+__all__ = ["HomeController", "MetricsController", "StatsController", "TrackController"]
 
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
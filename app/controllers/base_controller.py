@@ -7,6 +7,7 @@ request handling and response formatting in the
 application.
 """
 
+from functools import wraps
 from typing import Any, Callable, Tuple
 
 from flask import Response
@@ -42,3 +43,31 @@ class BaseController:
             return StandardResponse(success=True, data=result)()
         except Exception as e:
             return StandardResponse(success=False, message=str(e), status_code=400)()
+
+    @staticmethod
+    def static(service_method: Callable[[], Any]) -> Callable[[], Tuple[Response, int]]:
+        """
+        Decorator declaring a view whose response never changes. The
+        service method runs once, at declaration, and its standardized
+        response is serialized into prebuilt bytes with a strong ETag;
+        requests only copy those bytes (or get a 304 Not Modified).
+
+        Args:
+            service_method (Callable): Service function returning the
+            constant payload.
+
+        Returns:
+            Callable: View function serving the prebuilt response.
+        """
+        try:
+            result = service_method()
+            standard = StandardResponse(success=True, data=result)
+        except Exception as e:
+            standard = StandardResponse(success=False, message=str(e), status_code=400)
+        static_response = standard.freeze()
+
+        @wraps(service_method)
+        def view() -> Tuple[Response, int]:
+            return static_response()
+
+        return view
@@ -6,11 +6,6 @@ Module containing the HomeController class, responsible for handling
 requests to the home route of the application.
 """
 
-from typing import Tuple
-
-from flask import Response
-
-from ..services import TrackService
 from .base_controller import BaseController
 
 
@@ -20,17 +15,14 @@ class HomeController:
     """
 
     @staticmethod
-    def welcome() -> Tuple[Response, int]:
+    @BaseController.static
+    def welcome() -> str:
         """
-        Handles a GET request to the home route by tracking the visit and
-        returning a welcome message.
+        Handles a GET request to the home route by returning a welcome
+        message. The visit is recorded by the tracking middleware, and the
+        response is prebuilt once (see BaseController.static).
 
         Returns:
-            Tuple[Response, int]: A Flask response object and HTTP status code.
+            str: The welcome message.
         """
-
-        def hello():
-            TrackService(endpoint="home").track()
-            return "Olá, seja bem-vindo!"
-
-        return BaseController.handle_request(service_method=hello)
+        return "Olá, seja bem-vindo!"
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Module containing the MetricsController class, responsible for handling
+requests to the Prometheus metrics route.
+"""
+
+from typing import Tuple
+
+from flask import Response
+
+from ..services import MetricsService
+from ..services.metrics_service import CONTENT_TYPE
+from ..utils import current_components
+
+
+class MetricsController:
+    """
+    Controller class for handling metrics scrapes.
+    """
+
+    @staticmethod
+    def service() -> MetricsService:
+        """
+        Returns:
+            MetricsService: The metrics service of the current application.
+        """
+        return current_components().get("metrics_service")
+
+    @staticmethod
+    def metrics() -> Tuple[Response, int]:
+        """
+        Handles a GET request for the metrics, in the Prometheus text
+        exposition format.
+
+        Returns:
+            Tuple[Response, int]: A Flask response object and HTTP status code.
+        """
+        body = MetricsController.service().exposition()
+        return Response(body, content_type=CONTENT_TYPE), 200
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Module containing the StatsController class, responsible for handling
+requests to the read-only statistics routes.
+"""
+
+from typing import Tuple
+
+from flask import Response, request
+
+from ..services import StatsService
+from ..utils import current_components
+from ..utils.visit_feed import FeedFullError
+from ..views import StandardResponse
+from .base_controller import BaseController
+
+_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class StatsController:
+    """
+    Controller class for handling statistics requests.
+    """
+
+    @staticmethod
+    def service() -> StatsService:
+        """
+        Returns:
+            StatsService: The statistics service of the current application.
+        """
+        return current_components().get("stats_service")
+
+    @staticmethod
+    def stats() -> Tuple[Response, int]:
+        """
+        Handles a GET request for the current visit statistics, served
+        from the cached snapshot (304 if the client's copy is current).
+
+        Returns:
+            Tuple[Response, int]: A Flask response object and HTTP status code.
+        """
+        return StatsController.service().snapshot()()
+
+    @staticmethod
+    def history() -> Tuple[Response, int]:
+        """
+        Handles a GET request for the visit history, with the optional
+        query parameters resolution (hour, day, week or month), from and
+        to (YYYY-MM-DD).
+
+        Returns:
+            Tuple[Response, int]: A Flask response object and HTTP status code.
+        """
+        return BaseController.handle_request(
+            StatsController.service().history_range,
+            request.args.get("resolution", "day"),
+            request.args.get("from"),
+            request.args.get("to"),
+        )
+
+    @staticmethod
+    def stream() -> Tuple[Response, int]:
+        """
+        Handles a GET request for the live visit feed, streamed as
+        Server-Sent Events (503 if too many clients are connected).
+
+        Returns:
+            Tuple[Response, int]: A streaming Flask response and HTTP status code.
+        """
+        try:
+            frames = StatsController.service().stream()
+        except FeedFullError as e:
+            return StandardResponse(success=False, message=str(e), status_code=503)()
+
+        response = Response(
+            frames, mimetype="text/event-stream", headers=_STREAM_HEADERS
+        )
+        return response, 200
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Module containing the TrackController class, responsible for handling
+client-side tracking requests.
+"""
+
+from typing import Tuple
+
+from flask import Response, current_app, request
+
+from ..middleware.visit_tracking import EXTENSION_NAME as TRACKING_EXTENSION
+from ..services import BatchTrackService, TrackService
+from .base_controller import BaseController
+
+
+class TrackController:
+    """
+    Controller class for handling tracking beacons.
+    """
+
+    @staticmethod
+    def batch() -> Tuple[Response, int]:
+        """
+        Handles a POST request carrying a batch of visit events. The body
+        is parsed as JSON whatever its content type, since
+        navigator.sendBeacon posts text/plain. Events are keyed by the
+        route their path matches, like server-side visits; paths matching
+        no tracked route are dropped.
+
+        Returns:
+            Tuple[Response, int]: A Flask response object and HTTP status code.
+        """
+        payload = request.get_json(force=True, silent=True)
+        tracking = current_app.extensions[TRACKING_EXTENSION]
+        service = BatchTrackService(
+            payload,
+            visitor=TrackService.fingerprint(tracking.trust_proxy),
+            resolve=tracking.path_key,
+        )
+        return BaseController.handle_request(service_method=service.track)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Package initializer for application middleware.
+
+Exports:
+    - RateLimit: A request budget (e.g. "60/minute").
+    - RateLimitMiddleware: Per-client token-bucket rate limiting.
+    - RequestTimingMiddleware: Records per-route request latency.
+    - VisitTrackingMiddleware: Records visits for every routed request.
+"""
+
+from .rate_limit import RateLimit, RateLimitMiddleware
+from .request_timing import RequestTimingMiddleware
+from .visit_tracking import VisitTrackingMiddleware
+
+__all__ = [
+    "RateLimit",
+    "RateLimitMiddleware",
+    "RequestTimingMiddleware",
+    "VisitTrackingMiddleware",
+]
+
+__author__ = "Eric Santos <ericshantos13@gmail.com>"
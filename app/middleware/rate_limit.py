@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines per-client rate limiting with token buckets.
+
+Each limit keeps its buckets in a fixed-capacity LRU table keyed by client
+address, so a check is O(1) and memory stays bounded however many clients
+show up (the least recently seen client is forgotten first). The
+RateLimitMiddleware checks the limit of the matched route from a
+before-request hook and answers 429 before any controller runs; registered
+ahead of the tracking middleware, throttled requests are not counted as
+visits.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from flask import Flask, Response, request
+
+from ..services import TrackService
+from ..utils.env_loader import EnvLoader
+from ..views import StandardResponse
+
+EXTENSION_NAME = "rate_limit"
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+_UNLIMITED_METHODS = frozenset({"OPTIONS"})
+
+
+class RateLimit:
+    """
+    A request budget: `requests` per `period` seconds, with bursts of up
+    to `burst` requests.
+
+    Attributes:
+        requests (int): Requests allowed per period.
+        period (float): Length of the period, in seconds.
+        burst (int): Bucket size (default: requests).
+    """
+
+    def __init__(
+        self, requests: int, period: float = 60.0, burst: Optional[int] = None
+    ):
+        """
+        Args:
+            requests (int): Requests allowed per period.
+            period (float): Length of the period, in seconds.
+            burst (int, optional): Bucket size (default: requests).
+
+        Raises:
+            ValueError: If a value is not positive.
+        """
+        if requests <= 0 or period <= 0 or (burst is not None and burst <= 0):
+            raise ValueError("Rate limit values must be positive.")
+
+        self.requests = requests
+        self.period = period
+        self.burst = burst or requests
+
+    @classmethod
+    def parse(cls, text: str) -> "RateLimit":
+        """
+        Parses a limit such as "60/minute" or "5/second".
+
+        Args:
+            text (str): "<requests>/<second|minute|hour|day>".
+
+        Returns:
+            RateLimit: The parsed limit.
+
+        Raises:
+            ValueError: If the text is malformed.
+        """
+        requests, _, period = text.strip().partition("/")
+        if period not in _PERIODS or not requests.isdigit():
+            raise ValueError(f"Invalid rate limit: '{text}'")
+        return cls(int(requests), _PERIODS[period])
+
+    @property
+    def rate(self) -> float:
+        """
+        Returns:
+            float: Tokens refilled per second.
+        """
+        return self.requests / self.period
+
+
+class TokenBucketTable:
+    """
+    Token buckets of one rate limit, kept in a bounded LRU table.
+
+    Attributes:
+        limit (RateLimit): The limit enforced.
+        capacity (int): Maximum number of clients tracked.
+    """
+
+    def __init__(self, limit: RateLimit, capacity: int = 10000):
+        """
+        Args:
+            limit (RateLimit): The limit enforced.
+            capacity (int): Maximum number of clients tracked.
+        """
+        self.limit = limit
+        self.capacity = capacity
+
+        # client -> [tokens, last refill (monotonic)]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, client: str) -> float:
+        """
+        Takes one token from the client's bucket.
+
+        Args:
+            client (str): Client key (e.g. its address).
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until
+            a token becomes available.
+        """
+        now = time.monotonic()
+        rate, burst = self.limit.rate, self.limit.burst
+
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.capacity:
+                    self._buckets.popitem(last=False)
+                self._buckets[client] = [burst - 1.0, now]
+                return 0.0
+
+            self._buckets.move_to_end(client)
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+
+class RateLimitMiddleware:
+    """
+    Flask extension rejecting clients that exceed their route's limit.
+
+    Attributes:
+        default_limit (Optional[RateLimit]): Limit of routes without their
+        own (None leaves them unlimited).
+        capacity (int): Clients tracked per limit.
+        trust_proxy (bool): Key clients by the address the nearest proxy
+        reports (last X-Forwarded-For entry) instead of the socket peer.
+    """
+
+    def __init__(
+        self,
+        default_limit: Optional[RateLimit] = None,
+        capacity: int = 10000,
+        trust_proxy: bool = False,
+    ):
+        """
+        Initializes the middleware (not bound to an app yet).
+
+        Args:
+            default_limit (RateLimit, optional): Limit of routes without
+            their own.
+            capacity (int): Clients tracked per limit.
+            trust_proxy (bool): Whether to trust X-Forwarded-For.
+        """
+        self.default_limit = default_limit
+        self.capacity = capacity
+        self.trust_proxy = trust_proxy
+
+        self._default_table = self._table(default_limit)
+        self._limits: Dict[str, Optional[TokenBucketTable]] = {}
+        # id(url rule) -> bucket table, or None when the rule is unlimited
+        self._tables: Dict[int, Optional[TokenBucketTable]] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimitMiddleware":
+        """
+        Builds the middleware from RATE_LIMIT (e.g. "120/minute", unset to
+        only limit routes configured in their Router), RATE_LIMIT_TABLE_SIZE
+        and RATE_LIMIT_TRUST_PROXY.
+
+        Returns:
+            RateLimitMiddleware: The middleware.
+        """
+        loader = EnvLoader(
+            "RATE_LIMIT", "RATE_LIMIT_TABLE_SIZE", "RATE_LIMIT_TRUST_PROXY"
+        )
+        default = loader.get("RATE_LIMIT")
+
+        return cls(
+            default_limit=RateLimit.parse(str(default)) if default else None,
+            capacity=int(loader.get("RATE_LIMIT_TABLE_SIZE") or 10000),
+            trust_proxy=str(loader.get("RATE_LIMIT_TRUST_PROXY")).lower()
+            in ("1", "true", "yes"),
+        )
+
+    def _table(self, limit: Optional[RateLimit]) -> Optional[TokenBucketTable]:
+        return TokenBucketTable(limit, self.capacity) if limit else None
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Registers the rate limiting hook on the application.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        app.extensions[EXTENSION_NAME] = self
+        app.before_request(self._check)
+
+    def set_limit(self, endpoint: str, limit: Union[RateLimit, str, None]) -> None:
+        """
+        Sets the limit of one route.
+
+        Args:
+            endpoint (str): Flask endpoint name (e.g. "home.welcome").
+            limit (Union[RateLimit, str, None]): The limit, as an object or
+            text (e.g. "10/second"); None makes the route unlimited.
+        """
+        if isinstance(limit, str):
+            limit = RateLimit.parse(limit)
+        self._limits[endpoint] = self._table(limit)
+        self._tables.clear()
+
+    def _client(self) -> str:
+        return TrackService.client_address(self.trust_proxy)
+
+    def _resolve(self, rule_id: int) -> Optional[TokenBucketTable]:
+        """
+        Finds the bucket table of the current request's route and caches it.
+        """
+        endpoint = request.endpoint or ""
+        table = self._limits.get(endpoint, self._default_table)
+        self._tables[rule_id] = table
+        return table
+
+    def _check(self) -> Optional[Tuple[Response, int]]:
+        """
+        Before-request hook: answers 429 if the client ran out of tokens.
+        """
+        if request.method in _UNLIMITED_METHODS:
+            return None
+
+        rule = request.url_rule
+        if rule is None:
+            table = self._default_table
+        else:
+            rule_id = id(rule)
+            table = (
+                self._tables[rule_id]
+                if rule_id in self._tables
+                else self._resolve(rule_id)
+            )
+        if table is None:
+            return None
+
+        retry_after = table.consume(self._client())
+        if not retry_after:
+            return None
+
+        response, status = StandardResponse(
+            success=False, message="Too many requests.", status_code=429
+        )()
+        response.headers["Retry-After"] = str(int(retry_after) + 1)
+        return response, status
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the RequestTimingMiddleware class, which measures how
+long every routed request takes and records it in the tracker's per-route
+latency histograms.
+
+The clock starts in the first before-request hook and stops when the
+request context is torn down, so the measure covers the other hooks (rate
+limiting, visit tracking), the view and error handling. Requests that
+match no route are not timed, which keeps the number of histograms bound
+to the number of URL rules. Routes opted out of visit tracking (/stats,
+/metrics, /track) are not timed either, so polling them does not change
+the statistics it reads.
+"""
+
+import time
+from typing import Optional
+
+from flask import Flask, current_app, g, request
+
+from ..utils import current_components
+from ..utils.visit_tracker import VisitTracker
+from .visit_tracking import EXTENSION_NAME as TRACKING_EXTENSION
+
+EXTENSION_NAME = "request_timing"
+
+
+class RequestTimingMiddleware:
+    """
+    Flask extension recording per-route request latency.
+
+    Attributes:
+        visit_tracker (VisitTracker): Tracker receiving the durations.
+    """
+
+    def __init__(self, visit_tracker: Optional[VisitTracker] = None):
+        """
+        Initializes the middleware (not bound to an app yet).
+
+        Args:
+            visit_tracker (VisitTracker, optional): Tracker receiving the
+            durations. If None, the tracker of the application's components
+            is used, built on first use.
+        """
+        self._visit_tracker = visit_tracker
+
+    @property
+    def visit_tracker(self) -> VisitTracker:
+        """
+        Returns:
+            VisitTracker: The tracker receiving the durations.
+        """
+        if self._visit_tracker is not None:
+            return self._visit_tracker
+        return current_components().get("visit_tracker")
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Registers the timing hooks on the application. Must be called
+        before the other middleware, so their hooks are timed too.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        app.extensions[EXTENSION_NAME] = self
+        app.before_request(self._start)
+        app.teardown_request(self._stop)
+
+    def _start(self) -> None:
+        """
+        Before-request hook starting the clock.
+        """
+        g.request_started = time.perf_counter()
+
+    def _stop(self, _error: object = None) -> None:
+        """
+        Teardown hook recording the duration of a routed, tracked request.
+        """
+        started = g.get("request_started")
+        rule = request.url_rule
+        if started is None or rule is None:
+            return
+
+        tracking = current_app.extensions.get(TRACKING_EXTENSION)
+        if tracking is not None and tracking.rule_key(rule) is None:
+            return
+
+        self.visit_tracker.record_latency(rule.rule, time.perf_counter() - started)
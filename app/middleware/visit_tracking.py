@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the VisitTrackingMiddleware class, which records a
+visit for every routed request from a single before-request hook.
+
+Visits are keyed by the matched URL rule (e.g. "/" or "/posts/<int:id>"),
+so parametrized paths do not explode the number of tracked endpoints, and
+requests that match no route (404s, scanners) are not counted. Tracking
+can be turned off or on per blueprint (see Router). The decision and the
+key are resolved once per URL rule and cached, so a tracked request costs
+one dictionary lookup plus the tracker update. Paths reported by clients
+(visit beacons) are matched against the same URL map and keyed the same
+way, so they cannot add endpoints either.
+"""
+
+from typing import Dict, Optional
+
+from flask import Flask, current_app, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RoutingException, Rule
+
+from ..services import TrackService
+from ..utils import current_components
+from ..utils.visit_tracker import VisitTracker
+
+EXTENSION_NAME = "visit_tracking"
+
+_UNTRACKED_METHODS = frozenset({"OPTIONS"})
+
+
+class VisitTrackingMiddleware:
+    """
+    Flask extension tracking visits to every registered route.
+
+    Attributes:
+        visit_tracker (VisitTracker): Tracker receiving the visits.
+        track_by_default (bool): Whether blueprints without an explicit
+        setting are tracked.
+        unique_visitors (bool): Whether a client fingerprint is passed to
+        the tracker to estimate unique visitors.
+        trust_proxy (bool): Whether client addresses are read from
+        X-Forwarded-For (see TrackService.client_address).
+    """
+
+    def __init__(
+        self,
+        visit_tracker: Optional[VisitTracker] = None,
+        track_by_default: bool = True,
+        unique_visitors: bool = True,
+        trust_proxy: bool = False,
+    ):
+        """
+        Initializes the middleware (not bound to an app yet).
+
+        Args:
+            visit_tracker (VisitTracker, optional): Tracker receiving the
+            visits. If None, the tracker of the application's components is
+            used, built on first use.
+            track_by_default (bool): Whether blueprints without an explicit
+            setting are tracked.
+            unique_visitors (bool): Whether to fingerprint clients for
+            unique-visitor estimates.
+            trust_proxy (bool): Whether to trust X-Forwarded-For.
+        """
+        self._visit_tracker = visit_tracker
+        self.track_by_default = track_by_default
+        self.unique_visitors = unique_visitors
+        self.trust_proxy = trust_proxy
+
+        self._blueprints: Dict[str, bool] = {}
+        # id(url rule) -> tracking key, or None when the rule is not tracked
+        self._keys: Dict[int, Optional[str]] = {}
+
+    @property
+    def visit_tracker(self) -> VisitTracker:
+        """
+        Returns:
+            VisitTracker: The tracker receiving the visits.
+        """
+        if self._visit_tracker is not None:
+            return self._visit_tracker
+        return current_components().get("visit_tracker")
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Registers the tracking hook on the application.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        app.extensions[EXTENSION_NAME] = self
+        app.before_request(self._track)
+
+    def set_blueprint_tracking(self, blueprint: str, enabled: bool) -> None:
+        """
+        Opts a blueprint in or out of tracking.
+
+        Args:
+            blueprint (str): Name of the blueprint.
+            enabled (bool): Whether its routes are tracked.
+        """
+        self._blueprints[blueprint] = enabled
+        self._keys.clear()
+
+    def _resolve(self, rule: Rule) -> Optional[str]:
+        """
+        Decides whether a URL rule is tracked and caches the answer.
+
+        Returns:
+            Optional[str]: The tracking key, or None if not tracked.
+        """
+        blueprint = rule.endpoint.rpartition(".")[0]
+        enabled = self._blueprints.get(blueprint, self.track_by_default)
+        key = rule.rule if enabled else None
+        self._keys[id(rule)] = key
+        return key
+
+    def rule_key(self, rule: Rule) -> Optional[str]:
+        """
+        Returns the tracking key of a URL rule.
+
+        Args:
+            rule (Rule): The matched URL rule.
+
+        Returns:
+            Optional[str]: The key, or None if the rule is not tracked.
+        """
+        rule_id = id(rule)
+        return self._keys[rule_id] if rule_id in self._keys else self._resolve(rule)
+
+    def path_key(self, path: str) -> Optional[str]:
+        """
+        Returns the tracking key of a path reported by a client, matched
+        against the current application's routes as a GET request.
+
+        Args:
+            path (str): The path (e.g. "/posts/42").
+
+        Returns:
+            Optional[str]: The key (e.g. "/posts/<int:id>"), or None if the
+            path matches no tracked route.
+        """
+        adapter = current_app.url_map.bind("localhost")
+        try:
+            rule, _ = adapter.match(path, method="GET", return_rule=True)
+        except (HTTPException, RoutingException):
+            return None
+
+        return self.rule_key(rule)
+
+    def _track(self) -> None:
+        """
+        Before-request hook recording the visit.
+        """
+        rule = request.url_rule
+        if rule is None or request.method in _UNTRACKED_METHODS:
+            return
+
+        key = self.rule_key(rule)
+        if key is None:
+            return
+
+        visitor = (
+            TrackService.fingerprint(self.trust_proxy) if self.unique_visitors else None
+        )
+        self.visit_tracker.log_visit(key, visitor)
@@ -7,11 +7,13 @@ Package initializer for data models.
 Exports:
     - APIResponse: Standardized response data model.
     - VisitReport: Data model summarizing visits and their logs.
+    - VisitSnapshot: One generation of visit counters.
 """
 
 from .report_schema import VisitReport
 from .responses import APIResponse
+from .visit_snapshot import VisitSnapshot
 
-__all__ = ["APIResponse", "VisitReport"]
+__all__ = ["APIResponse", "VisitReport", "VisitSnapshot"]
 
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict
 
@@ -13,8 +13,22 @@ class VisitReport:
         log (Dict[str, int]): Dictionary mapping
         time (e.g., hour) to number of visits.
         date (datetime): Date of the report.
+        endpoints (Dict[str, int]): Dictionary mapping
+        endpoint names to number of visits.
+        uniques (Dict[str, int]): Dictionary mapping
+        endpoint names to estimated unique visitors.
+        unique_count (int): Estimated unique visitors across all endpoints.
+        history (Dict[str, int]): Dictionary mapping
+        day (e.g., "2024-05-01") to number of visits, oldest first.
+        latencies (Dict[str, Dict[str, float]]): Dictionary mapping
+        routes to their request count and duration percentiles (ms).
     """
 
     count: int
     log: Dict[str, int]
     date: datetime
+    endpoints: Dict[str, int] = field(default_factory=dict)
+    uniques: Dict[str, int] = field(default_factory=dict)
+    unique_count: int = 0
+    history: Dict[str, int] = field(default_factory=dict)
+    latencies: Dict[str, Dict[str, float]] = field(default_factory=dict)
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict
+
+
+@dataclass
+class VisitSnapshot:
+    """
+    Data class holding one generation of visit counters, as handed over by
+    VisitTracker.snapshot_and_reset().
+
+    Attributes:
+        total (int): Total number of visits.
+        endpoints (Dict[str, int]): Dictionary mapping
+        endpoint names to number of visits.
+        hourly (Dict[str, int]): Dictionary mapping
+        hour (e.g., "14h") to number of visits.
+        uniques (Dict[str, int]): Dictionary mapping
+        endpoint names to estimated unique visitors.
+        unique_total (int): Estimated unique visitors across all endpoints.
+        latencies (Dict[str, Dict[str, float]]): Dictionary mapping
+        routes to their request count and duration percentiles (ms).
+        generation (int): Sequence number of the snapshotted generation.
+        taken_at (datetime): When the snapshot was taken.
+    """
+
+    total: int
+    endpoints: Dict[str, int]
+    hourly: Dict[str, int] = field(default_factory=dict)
+    uniques: Dict[str, int] = field(default_factory=dict)
+    unique_total: int = 0
+    latencies: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    generation: int = 0
+    taken_at: datetime = field(default_factory=datetime.now)
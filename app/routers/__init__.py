@@ -6,10 +6,16 @@ Package initializer for route modules.
 
 Exports:
     - home_router: Router instance for the home page routes.
+    - metrics_router: Router instance for the Prometheus metrics route.
+    - stats_router: Router instance for the statistics routes.
+    - track_router: Router instance for the client-side tracking routes.
 """
 
 from .home_route import router as home_router
+from .metrics_route import router as metrics_router
+from .stats_route import router as stats_router
+from .track_route import router as track_router
 
-__all__ = ["home_router"]
+__all__ = ["home_router", "metrics_router", "stats_router", "track_router"]
 
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
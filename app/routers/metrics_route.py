@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module initializes the 'metrics' router using the Router class,
+registering the Prometheus scrape route. Scrapes are not counted as visits.
+
+Routes:
+    - GET /metrics : mapped to MetricsController.metrics
+"""
+
+from ..controllers import MetricsController
+from .router import Router
+
+router = Router(__name__, "metrics", url_prefix="/metrics", track=False)
+
+router.add_controller("", MetricsController.metrics, methods=["GET"])
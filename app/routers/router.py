@@ -8,10 +8,14 @@ modular route registration and integration with Flask
 applications.
 """
 
-from typing import Callable
+from typing import Callable, Dict, Optional, Union
 
 from flask import Blueprint, Flask
 
+from ..middleware.rate_limit import EXTENSION_NAME as RATE_LIMIT_EXTENSION
+from ..middleware.rate_limit import RateLimit
+from ..middleware.visit_tracking import EXTENSION_NAME as TRACKING_EXTENSION
+
 
 class Router:
     """
@@ -22,9 +26,18 @@ class Router:
     Attributes:
         _blueprint (Blueprint): The internal Flask
         Blueprint instance.
+        track (Optional[bool]): Whether visits to this
+        router's routes are tracked (None follows the
+        application default).
     """
 
-    def __init__(self, module: str, name: str, url_prefix: str = ""):
+    def __init__(
+        self,
+        module: str,
+        name: str,
+        url_prefix: str = "",
+        track: Optional[bool] = None,
+    ):
         """
         Initializes the Router with a Flask Blueprint.
 
@@ -34,8 +47,12 @@ class Router:
             name (str): The name of the blueprint.
             url_prefix (str, optional): The URL prefix for
                 all routes in this blueprint.
+            track (bool, optional): Opts the routes in (True)
+                or out (False) of visit tracking.
         """
         self._blueprint = Blueprint(name, module, url_prefix=url_prefix)
+        self.track = track
+        self._rate_limits: Dict[str, Union[RateLimit, str]] = {}
 
     def route(self, rules: str, **options) -> Callable:
         """
@@ -50,26 +67,49 @@ class Router:
         """
         return self._blueprint.route(rules, **options)
 
-    def add_controller(self, rule: str, view_func: Callable, **options) -> None:
+    def add_controller(
+        self,
+        rule: str,
+        view_func: Callable,
+        rate_limit: Union[RateLimit, str, None] = None,
+        **options,
+    ) -> None:
         """
         Adds a URL rule to the Blueprint programmatically.
 
         Args:
             rule (str): URL rule as string.
             view_func (Callable): The view function to call for this route.
+            rate_limit (Union[RateLimit, str], optional): Per-client limit
+                of this route (e.g. "10/second"), overriding the
+                application default.
             **options: Additional options passed to Blueprint.add_url_rule().
         """
         self._blueprint.add_url_rule(rule, view_func=view_func, **options)
 
+        if rate_limit is not None:
+            endpoint = options.get("endpoint") or view_func.__name__
+            self._rate_limits[endpoint] = rate_limit
+
     def to(self, app: Flask) -> None:
         """
-        Registers the internal Blueprint with a Flask application.
+        Registers the internal Blueprint with a Flask application
+        and applies its tracking setting and rate limits, if any.
 
         Args:
             app (Flask): The Flask application instance.
         """
         app.register_blueprint(self._blueprint)
 
+        tracking = app.extensions.get(TRACKING_EXTENSION)
+        if tracking is not None and self.track is not None:
+            tracking.set_blueprint_tracking(self._blueprint.name, self.track)
+
+        limiter = app.extensions.get(RATE_LIMIT_EXTENSION)
+        if limiter is not None:
+            for endpoint, limit in self._rate_limits.items():
+                limiter.set_limit(f"{self._blueprint.name}.{endpoint}", limit)
+
     @property
     def blueprint(self) -> Blueprint:
         """
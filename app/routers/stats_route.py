@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module initializes the 'stats' router using the Router class,
+registering the read-only statistics routes. Requests to these routes
+are not counted as visits.
+
+Routes:
+    - GET /stats : mapped to StatsController.stats
+    - GET /stats/history : mapped to StatsController.history
+    - GET /stats/stream : mapped to StatsController.stream (SSE)
+"""
+
+from ..controllers import StatsController
+from .router import Router
+
+router = Router(__name__, "stats", url_prefix="/stats", track=False)
+
+router.add_controller("", StatsController.stats, methods=["GET"])
+router.add_controller("/history", StatsController.history, methods=["GET"])
+router.add_controller("/stream", StatsController.stream, methods=["GET"])
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module initializes the 'track' router using the Router class,
+registering the client-side tracking routes. The beacon requests
+themselves are not counted as visits.
+
+Routes:
+    - POST /track/batch : mapped to TrackController.batch
+"""
+
+from ..controllers import TrackController
+from .router import Router
+
+router = Router(__name__, "track", url_prefix="/track", track=False)
+
+router.add_controller("/batch", TrackController.batch, methods=["POST"])
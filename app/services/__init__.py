@@ -5,11 +5,17 @@
 Package initializer for the tracking service module.
 
 Exports:
+    - BatchTrackService: Service class recording batches of visit beacons.
+    - MetricsService: Service class rendering the Prometheus metrics.
     - TrackService: Service class responsible for tracking visits on endpoints.
+    - StatsService: Service class serving cached visit statistics.
 """
 
+from .batch_track_service import BatchTrackService
+from .metrics_service import MetricsService
+from .stats_service import StatsService
 from .track_visit_service import TrackService
 
-__all__ = ["TrackService"]
+__all__ = ["BatchTrackService", "MetricsService", "StatsService", "TrackService"]
 
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
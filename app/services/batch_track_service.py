@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the BatchTrackService class, responsible for
+validating batches of client-side visit beacons and recording them
+in the shared tracker with a single bulk update.
+
+A batch is a JSON array of events, each one [endpoint, timestamp] or
+[endpoint, timestamp, client_id], optionally wrapped as {"events": [...]}.
+Event endpoints are mapped to tracking keys (e.g. URL rules) before they
+are counted, so clients cannot create new endpoints at will.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils import current_components
+
+Visit = Tuple[str, float, Optional[str]]
+
+
+class BatchTrackService:
+    """
+    Service class to record a batch of visit events.
+
+    Attributes:
+        MAX_EVENTS (int): Maximum number of events accepted per batch.
+        MAX_ENDPOINT_LENGTH (int): Maximum length of an endpoint name.
+        MAX_AGE (float): Oldest accepted event, in seconds; older (or
+        future) timestamps are replaced by the arrival time.
+    """
+
+    MAX_EVENTS = 500
+    MAX_ENDPOINT_LENGTH = 256
+    MAX_AGE = 3600.0
+
+    def __init__(
+        self,
+        payload: Any,
+        visitor: Optional[str] = None,
+        resolve: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        """
+        Initializes the service with the decoded request body.
+
+        Args:
+            payload (Any): The decoded JSON batch.
+            visitor (str, optional): Fingerprint of the sending client, used
+            for events without a client id.
+            resolve (Callable[[str], Optional[str]], optional): Maps an event
+            endpoint to its tracking key, or to None to drop the event. If
+            None, endpoints are counted as sent.
+        """
+        self._payload = payload
+        self._visitor = visitor
+        self._resolve = resolve
+
+    def track(self) -> dict:
+        """
+        Validates the batch and records its events.
+
+        Returns:
+            dict: The number of events accepted ({"accepted": n}); dropped
+            and deduplicated events are not included.
+
+        Raises:
+            ValueError: If the batch or one of its events is malformed.
+        """
+        visits = self._parse()
+        tracker = current_components().get("visit_tracker")
+        accepted = tracker.log_visits(visits)
+        return {"accepted": accepted}
+
+    def _parse(self) -> List[Visit]:
+        events = self._payload
+        if isinstance(events, dict):
+            events = events.get("events")
+        if not isinstance(events, list):
+            raise ValueError("Expected a JSON array of events.")
+        if len(events) > self.MAX_EVENTS:
+            raise ValueError(f"A batch holds at most {self.MAX_EVENTS} events.")
+
+        now = time.time()
+        oldest = now - self.MAX_AGE
+        visits = []
+        # Endpoint -> tracking key, resolved once per batch
+        keys: Dict[str, Optional[str]] = {}
+
+        for event in events:
+            if not isinstance(event, list) or not 2 <= len(event) <= 3:
+                raise ValueError(
+                    "Each event must be [endpoint, timestamp, client_id?]."
+                )
+
+            endpoint, timestamp = event[0], event[1]
+            client_id = event[2] if len(event) == 3 else None
+
+            if not isinstance(endpoint, str) or not endpoint:
+                raise ValueError("Event endpoint must be a non-empty string.")
+            if len(endpoint) > self.MAX_ENDPOINT_LENGTH:
+                raise ValueError("Event endpoint is too long.")
+            if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+                raise ValueError("Event timestamp must be a Unix time in seconds.")
+            if client_id is not None and not isinstance(client_id, str):
+                raise ValueError("Event client id must be a string.")
+
+            if self._resolve is not None:
+                if endpoint not in keys:
+                    keys[endpoint] = self._resolve(endpoint)
+                endpoint = keys[endpoint]
+                if endpoint is None:
+                    continue
+
+            if not oldest <= timestamp <= now:
+                timestamp = now
+            visitor = f"id|{client_id}" if client_id else self._visitor
+            visits.append((endpoint, float(timestamp), visitor))
+
+        return visits
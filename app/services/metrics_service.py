@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the MetricsService class, which exposes the visit
+counters, the report scheduler state and the email delivery statistics in
+the Prometheus text exposition format.
+
+The body is cached together with a cheap change key (tracker generation
+and total, scheduler and delivery counters) that is read without taking
+the store lock. Scrapes that find the key unchanged reuse the cached bytes;
+only the first scrape after a change copies the per-endpoint counters and
+formats them, reusing the escaped label prefix of every known endpoint.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.registry import Components
+from ..utils.report_scheduler import ReportScheduler
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "notifica"
+
+ChangeKey = Tuple[object, ...]
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a label value as required by the exposition format.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _header(name: str, kind: str, help_text: str) -> str:
+    return f"# HELP {_PREFIX}_{name} {help_text}\n# TYPE {_PREFIX}_{name} {kind}\n"
+
+
+def _sample(name: str, value: float) -> str:
+    return f"{_PREFIX}_{name} {value}\n"
+
+
+class MetricsService:
+    """
+    Service rendering the Prometheus metrics of the application.
+
+    Attributes:
+        report_scheduler (ReportScheduler): Scheduler whose tracker, jobs and
+        email reporter are exported.
+    """
+
+    def __init__(self, report_scheduler: ReportScheduler):
+        """
+        Initializes the service.
+
+        Args:
+            report_scheduler (ReportScheduler): Scheduler whose tracker, jobs
+            and email reporter are exported.
+        """
+        self.report_scheduler = report_scheduler
+
+        self._body = b""
+        self._key: Optional[ChangeKey] = None
+        # endpoint -> escaped sample prefix, kept for the current generation
+        self._labels: Dict[str, str] = {}
+        self._labels_generation = -1
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, components: Components) -> "MetricsService":
+        """
+        Builds the service for the application's report scheduler.
+
+        Args:
+            components (Components): Registry holding the scheduler.
+
+        Returns:
+            MetricsService: The service.
+        """
+        return cls(components.get("scheduler"))
+
+    def _change_key(self) -> ChangeKey:
+        """
+        Reads the values identifying the current state, without taking the
+        tracker store lock nor copying its counters.
+
+        Returns:
+            ChangeKey: Key that changes whenever any exported value does.
+        """
+        reporter = self.report_scheduler.report_sender
+        tracker = self.report_scheduler.visit_tracker
+        outbox = reporter.outbox
+
+        return (
+            tracker.generation,
+            tracker.total_accesses,
+            self.report_scheduler.last_report,
+            self.report_scheduler.next_report,
+            reporter.sender_stats,
+            tuple(outbox.stats.values()) if outbox is not None else None,
+        )
+
+    def exposition(self) -> bytes:
+        """
+        Returns the metrics body, rebuilding it only if something changed.
+        While one thread rebuilds it, the others keep serving the previous
+        body.
+
+        Returns:
+            bytes: The metrics in the Prometheus text format.
+        """
+        key = self._change_key()
+        if key == self._key:
+            return self._body
+
+        if self._key is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            return self._body
+
+        try:
+            if key != self._key:
+                self._body = self._render().encode("utf-8")
+                self._key = key
+            return self._body
+        finally:
+            self._lock.release()
+
+    def _render(self) -> str:
+        """
+        Formats every metric.
+
+        Returns:
+            str: The exposition text.
+        """
+        report_scheduler = self.report_scheduler
+        tracker = report_scheduler.visit_tracker
+        reporter = report_scheduler.report_sender
+
+        # Endpoints of past generations are forgotten, so the label cache
+        # stays as small as the counters themselves
+        generation = tracker.generation
+        if generation != self._labels_generation:
+            self._labels, self._labels_generation = {}, generation
+
+        parts: List[str] = [
+            _header("visit_generation", "gauge", "Visit counter generation."),
+            _sample("visit_generation", generation),
+            _header("visits_total", "counter", "Visits in the current generation."),
+            _sample("visits_total", tracker.total_accesses),
+            _header(
+                "endpoint_visits_total",
+                "counter",
+                "Visits per endpoint in the current generation.",
+            ),
+        ]
+        for endpoint, visits in tracker.visit_log.items():
+            parts.append(f"{self._label(endpoint)} {visits}\n")
+
+        next_report = report_scheduler.next_report
+        last_report = report_scheduler.last_report
+        parts += [
+            _header("scheduler_jobs", "gauge", "Jobs scheduled."),
+            _sample("scheduler_jobs", len(report_scheduler.jobs.jobs)),
+            _header(
+                "report_next_timestamp_seconds", "gauge", "When the next report is due."
+            ),
+            _sample(
+                "report_next_timestamp_seconds",
+                next_report.timestamp() if next_report else 0,
+            ),
+            _header(
+                "report_last_timestamp_seconds", "gauge", "When the last report ran."
+            ),
+            _sample(
+                "report_last_timestamp_seconds",
+                last_report.timestamp() if last_report else 0,
+            ),
+        ]
+
+        # Skipped until a sender exists (none is built just to be scraped)
+        sender_stats = reporter.sender_stats
+        if sender_stats is not None:
+            parts += [
+                _header("email_sent_total", "counter", "Emails sent over SMTP."),
+                _sample("email_sent_total", sender_stats["sent"]),
+                _header(
+                    "email_failed_total", "counter", "Emails that could not be sent."
+                ),
+                _sample("email_failed_total", sender_stats["failed"]),
+                _header("email_connections_total", "counter", "SMTP sessions opened."),
+                _sample("email_connections_total", sender_stats["connections"]),
+            ]
+
+        if reporter.outbox is not None:
+            outbox_stats = reporter.outbox.stats
+            parts += [
+                _header("email_outbox_depth", "gauge", "Emails waiting in the outbox."),
+                _sample("email_outbox_depth", outbox_stats["depth"]),
+                _header(
+                    "email_outbox_delivered_total",
+                    "counter",
+                    "Emails delivered from the outbox.",
+                ),
+                _sample("email_outbox_delivered_total", outbox_stats["delivered"]),
+                _header(
+                    "email_outbox_retries_total", "counter", "Outbox delivery retries."
+                ),
+                _sample("email_outbox_retries_total", outbox_stats["retries"]),
+                _header(
+                    "email_outbox_dead_letters_total",
+                    "counter",
+                    "Emails dead-lettered after their last attempt.",
+                ),
+                _sample(
+                    "email_outbox_dead_letters_total", outbox_stats["dead_letters"]
+                ),
+            ]
+
+        return "".join(parts)
+
+    def _label(self, endpoint: str) -> str:
+        """
+        Returns the sample name and label set of an endpoint, escaping it
+        only the first time it is seen.
+        """
+        label = self._labels.get(endpoint)
+        if label is None:
+            label = f'{_PREFIX}_endpoint_visits_total{{endpoint="{_escape(endpoint)}"}}'
+            self._labels[endpoint] = label
+        return label
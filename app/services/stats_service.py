@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the StatsService class, which serves the current
+visit counters from a cached, versioned snapshot.
+
+The snapshot is rebuilt at most once per cache interval, by a single
+thread; every other request reuses the prebuilt response, so polling
+dashboards neither take the tracker locks nor copy its dictionaries.
+Its ETag combines the tracker generation, the total visits and the number
+of timed requests, which together identify the counter state. Only tracked
+routes are timed, so polling the statistics leaves the ETag unchanged. Live updates
+are streamed through a VisitFeed, and past days are read from the
+VisitHistory, if enabled.
+"""
+
+import threading
+import time
+from datetime import date, datetime
+from datetime import time as day_time
+from datetime import timedelta
+from typing import Any, Dict, Iterator, Optional
+
+from ..utils.env_loader import EnvLoader
+from ..utils.registry import Components
+from ..utils.visit_feed import VisitFeed
+from ..utils.visit_history import RESOLUTIONS, VisitHistory
+from ..utils.visit_tracker import VisitTracker
+from ..views import StandardResponse, StaticResponse
+
+# Days covered by a history query without an explicit start
+_DEFAULT_SPANS = {"hour": 1, "day": 30, "week": 182, "month": 365}
+
+
+class StatsService:
+    """
+    Service providing cached visit statistics.
+
+    Attributes:
+        visit_tracker (VisitTracker): Tracker the statistics are read from.
+        ttl (float): Seconds a snapshot is served before being rebuilt.
+        feed (VisitFeed): Live feed of visit deltas.
+        history (Optional[VisitHistory]): Persistent visit history.
+    """
+
+    def __init__(
+        self,
+        visit_tracker: VisitTracker,
+        ttl: float = 2.0,
+        feed: Optional[VisitFeed] = None,
+        history: Optional[VisitHistory] = None,
+    ):
+        """
+        Initializes the service.
+
+        Args:
+            visit_tracker (VisitTracker): Tracker the statistics are read from.
+            ttl (float): Seconds a snapshot is served before being rebuilt.
+            feed (VisitFeed, optional): Live feed of visit deltas. If None,
+            a VisitFeed with default settings is used.
+            history (VisitHistory, optional): Persistent visit history.
+        """
+        self.visit_tracker = visit_tracker
+        self.ttl = ttl
+        self.feed = feed or VisitFeed(visit_tracker)
+        self.history = history
+
+        self._response: Optional[StaticResponse] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, components: Components) -> "StatsService":
+        """
+        Builds the service for the registered tracker, reading the cache
+        interval from STATS_CACHE_TTL (default is 2 seconds) and the
+        stream subscriber limit from STATS_STREAM_MAX_CLIENTS (default
+        is 500).
+
+        Args:
+            components (Components): Registry holding the visit tracker,
+            the history and the report scheduler (whose thread samples
+            the live feed).
+
+        Returns:
+            StatsService: The service.
+        """
+        visit_tracker = components.get("visit_tracker")
+        report_scheduler = components.get("scheduler")
+        loader = EnvLoader("STATS_CACHE_TTL", "STATS_STREAM_MAX_CLIENTS")
+        feed = VisitFeed(
+            visit_tracker,
+            max_subscribers=int(loader.get("STATS_STREAM_MAX_CLIENTS") or 500),
+            # Sampled by the report scheduler thread, not a thread of its own
+            jobs=report_scheduler.jobs if report_scheduler is not None else None,
+        )
+        return cls(
+            visit_tracker,
+            ttl=float(loader.get("STATS_CACHE_TTL") or 2.0),
+            feed=feed,
+            history=components.get("visit_history"),
+        )
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        Reads the current statistics from the tracker.
+
+        Returns:
+            Dict[str, Any]: Generation, total, per-endpoint, per-hour,
+            unique-visitor and per-route latency data.
+        """
+        tracker = self.visit_tracker
+        return {
+            "generation": tracker.generation,
+            "total": tracker.total_accesses,
+            "endpoints": tracker.visit_log,
+            "hourly": tracker.hourly_log,
+            "uniques": tracker.unique_visitors,
+            "latency": tracker.latency_summaries,
+        }
+
+    def snapshot(self) -> StaticResponse:
+        """
+        Returns the cached statistics response, rebuilding it if it expired.
+        While one thread rebuilds it, the others keep serving the previous
+        snapshot.
+
+        Returns:
+            StaticResponse: The prebuilt statistics response.
+        """
+        response = self._response
+        if response is not None and time.monotonic() < self._expires:
+            return response
+
+        if response is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            return response
+
+        try:
+            if self._response is None or time.monotonic() >= self._expires:
+                stats = self.collect()
+                # Tracked requests may add latency without visits (OPTIONS,
+                # dedup window, throttled requests)
+                requests = sum(r["count"] for r in stats["latency"].values())
+                etag = f"{stats['generation']}-{stats['total']}-{requests}"
+                self._response = StandardResponse(success=True, data=stats).freeze(etag)
+                self._expires = time.monotonic() + self.ttl
+            return self._response
+        finally:
+            self._lock.release()
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Subscribes to the live feed.
+
+        Returns:
+            Iterator[bytes]: Server-Sent Events frames.
+
+        Raises:
+            FeedFullError: If the feed has no room for another subscriber.
+        """
+        return self.feed.subscribe()
+
+    def history_range(
+        self,
+        resolution: str = "day",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Reads the visit history between two days.
+
+        Args:
+            resolution (str): "hour", "day", "week" or "month".
+            start (str, optional): First day, as YYYY-MM-DD (default depends
+            on the resolution, e.g. 30 days for "day").
+            end (str, optional): Last day, as YYYY-MM-DD (default: today).
+
+        Returns:
+            Dict[str, Any]: The range, the total visits of each bucket and
+            their per-endpoint breakdown.
+
+        Raises:
+            ValueError: If the history is disabled or an argument is invalid.
+        """
+        if self.history is None:
+            raise ValueError("Visit history is disabled.")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown history resolution: '{resolution}'")
+
+        last = date.fromisoformat(end) if end else date.today()
+        first = (
+            date.fromisoformat(start)
+            if start
+            else last - timedelta(days=_DEFAULT_SPANS[resolution] - 1)
+        )
+        if first > last:
+            raise ValueError("History start is after its end.")
+
+        buckets = self.history.query(
+            resolution,
+            datetime.combine(first, day_time.min),
+            datetime.combine(last, day_time.max),
+        )
+        return {
+            "resolution": resolution,
+            "from": str(first),
+            "to": str(last),
+            "totals": {
+                bucket: sum(endpoints.values()) for bucket, endpoints in buckets.items()
+            },
+            "endpoints": buckets,
+        }
@@ -4,10 +4,20 @@
 
 This module defines the TrackService class, responsible
 for tracking visits to a specific endpoint by delegating
-the logging operation to the shared scheduler instance.
+the logging operation to the application's visit tracker.
+
+When called during a request, the client's address and User-Agent
+are combined into a fingerprint so the tracker can estimate unique
+visitors; the fingerprint itself is never stored. The address is only
+read from X-Forwarded-For behind a trusted proxy, where the entry the
+proxy appended (the last one) is used, as clients can forge the others.
 """
 
-from ..utils import scheduler
+from typing import Optional
+
+from flask import has_request_context, request
+
+from ..utils import current_components
 
 
 class TrackService:
@@ -27,9 +37,50 @@ class TrackService:
         """
         self._endpoint = endpoint
 
-    def track(self) -> None:
+    def track(self, trust_proxy: bool = False) -> None:
+        """
+        Logs a visit to the associated endpoint using the application's
+        visit tracker.
+
+        Args:
+            trust_proxy (bool): Whether to trust X-Forwarded-For.
+        """
+        tracker = current_components().get("visit_tracker")
+        tracker.log_visit(self._endpoint, self.fingerprint(trust_proxy))
+
+    @staticmethod
+    def client_address(trust_proxy: bool = False) -> str:
+        """
+        Reads the client address of the current request.
+
+        Args:
+            trust_proxy (bool): Whether to use the address the nearest
+            proxy reports (last X-Forwarded-For entry) instead of the
+            socket peer.
+
+        Returns:
+            str: The client address (empty if unknown).
         """
-        Logs a visit to the associated endpoint using the global
-        scheduler's visit tracker.
+        if trust_proxy:
+            route = request.access_route
+            if route:
+                return route[-1]
+        return request.remote_addr or ""
+
+    @staticmethod
+    def fingerprint(trust_proxy: bool = False) -> Optional[str]:
         """
-        scheduler.visit_tracker.log_visit(self._endpoint)
+        Builds the client fingerprint of the current request.
+
+        Args:
+            trust_proxy (bool): Whether to trust X-Forwarded-For.
+
+        Returns:
+            Optional[str]: "<client address>|<user agent>", or None outside
+            of a request context.
+        """
+        if not has_request_context():
+            return None
+
+        address = TrackService.client_address(trust_proxy)
+        return f"{address}|{request.headers.get('User-Agent', '')}"
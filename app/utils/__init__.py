@@ -2,27 +2,279 @@
 """
 @Author: Eric Santos <ericshantos13@gmail.com>
 
-This package initializer sets up and exports a ready-to-use
-instance of the ReportScheduler. The scheduler is
-responsible for sending daily email reports based on visit
-tracking data.
+This package initializer registers the default application
+components: the VisitTracker, the EmailReporter, the optional
+VisitHistory and the ReportScheduler wiring them together to
+send daily email reports based on visit tracking data.
 
-It internally initializes the VisitTracker and EmailReporter
-components and wires them together to automate the
-reporting process.
+Components are built on first use, so importing the package
+has no side effects. The scheduler thread is only started
+when the application serves its first request.
+
+Environment variables (optional):
+    - VISIT_TRACKER_SHARDS: Number of counter shards. Values
+        above 1 enable the low-contention ShardedVisitStore.
+    - VISIT_TRACKER_SHM_PATH: Path of a memory-mapped counter
+        file shared by all worker processes. Takes precedence
+        over VISIT_TRACKER_SHARDS.
+    - VISIT_TRACKER_SHM_WORKERS / VISIT_TRACKER_SHM_ENDPOINTS:
+        Capacity of the shared counter file when it is created.
+    - VISIT_TRACKER_TOP_K: Number of endpoints counted
+        individually by the bounded-memory HeavyHittersVisitStore;
+        the rest are reported as "other". Takes precedence over
+        VISIT_TRACKER_SHARDS.
+    - VISIT_JOURNAL_DIR: Directory of the durable visit journal
+        used to restore the counters after a restart.
+    - VISIT_JOURNAL_FLUSH_INTERVAL: Seconds between journal
+        group commits (default is 1).
+    - VISIT_LOG_SAMPLE_RATE: Fraction of visits written to the
+        log (default is 1, 0 disables per-visit logging).
+    - VISIT_DEDUP_WINDOW: Seconds within which repeated visits
+        of a client to an endpoint are counted once (unset or 0
+        counts every visit).
+    - VISIT_DEDUP_MAX_ENTRIES: Maximum client/endpoint pairs
+        remembered by the dedup window (default is 100000).
+    - VISIT_HISTORY_PATH: SQLite file keeping the hourly, daily,
+        weekly and monthly visit history (unset disables it).
+    - VISIT_HISTORY_FLUSH_INTERVAL: Seconds between history
+        flushes (default is 60).
+    - EMAIL_OUTBOX_DIR: Directory of the durable email outbox.
+        When set, reports are queued and delivered in the
+        background with retries.
+    - EMAIL_OUTBOX_MAX_ATTEMPTS: Delivery attempts before a
+        report is dead-lettered (default is 5).
 
 Exposed components:
-    - scheduler (ReportScheduler): Singleton-like instance
-        of the report scheduler.
+    - components (Components): Registry of the default
+        components. Each AppFactory builds its own instances
+        from a copy of it.
+    - current_components: Returns the registry of the current
+        Flask application, or the default one.
+    - scheduler (ReportScheduler): The default report
+        scheduler, built when first imported.
 """
 
+from typing import Any, Optional
+
+from flask import current_app, has_app_context
+
+from .dedup_window import DedupWindow
+from .email_notificator import EmailNotificator
+from .email_outbox import EmailOutbox
 from .email_reporter import EmailReporter
+from .env_loader import EnvLoader
+from .hyperloglog import UniqueVisitors
+from .latency_histogram import RouteLatencies
+from .registry import EXTENSION_NAME, Components
 from .report_scheduler import ReportScheduler
+from .visit_histogram import VisitHistogram
+from .visit_history import VisitHistory
+from .visit_journal import VisitJournal
+from .visit_stores import LockedVisitStore, ShardedVisitStore, VisitStore
 from .visit_tracker import VisitTracker
 
-# Instantiates and configures the daily report scheduler
-scheduler = ReportScheduler(visit_tracker=VisitTracker(), reporter=EmailReporter())
 
-__all__ = ["scheduler"]
+def _create_visit_store(loader: EnvLoader) -> VisitStore:
+    """
+    Builds the visit counter store selected by the environment.
+
+    Args:
+        loader (EnvLoader): Loader holding the tracker variables.
+
+    Returns:
+        VisitStore: The store backing the shared VisitTracker.
+    """
+    shm_path = loader.get("VISIT_TRACKER_SHM_PATH")
+    shards = int(loader.get("VISIT_TRACKER_SHARDS") or 1)
+    top_k = int(loader.get("VISIT_TRACKER_TOP_K") or 0)
+
+    if shm_path:
+        # Imported lazily: the shared store relies on POSIX-only fcntl
+        from .shared_visit_store import SharedMemoryVisitStore
+
+        return SharedMemoryVisitStore(
+            path=str(shm_path),
+            max_workers=int(loader.get("VISIT_TRACKER_SHM_WORKERS") or 64),
+            max_endpoints=int(loader.get("VISIT_TRACKER_SHM_ENDPOINTS") or 256),
+        )
+
+    if top_k > 0:
+        from .heavy_hitters import HeavyHittersVisitStore
+
+        return HeavyHittersVisitStore(capacity=top_k)
+
+    if shards > 1:
+        return ShardedVisitStore(shards=shards)
+    return LockedVisitStore()
+
+
+def _create_visit_journal(loader: EnvLoader) -> Optional[VisitJournal]:
+    """
+    Builds the durable visit journal if one is configured.
+
+    Args:
+        loader (EnvLoader): Loader holding the tracker variables.
+
+    Returns:
+        Optional[VisitJournal]: The journal, or None when disabled.
+    """
+    directory = loader.get("VISIT_JOURNAL_DIR")
+
+    if not directory:
+        return None
+    return VisitJournal(
+        directory=str(directory),
+        flush_interval=float(loader.get("VISIT_JOURNAL_FLUSH_INTERVAL") or 1.0),
+    )
+
+
+def _create_dedup_window(loader: EnvLoader) -> Optional[DedupWindow]:
+    """
+    Builds the repeat-visit dedup window if one is configured.
+
+    Args:
+        loader (EnvLoader): Loader holding the tracker variables.
+
+    Returns:
+        Optional[DedupWindow]: The window, or None when disabled.
+    """
+    window = float(loader.get("VISIT_DEDUP_WINDOW") or 0)
+
+    if window <= 0:
+        return None
+    return DedupWindow(
+        window=window,
+        max_entries=int(loader.get("VISIT_DEDUP_MAX_ENTRIES") or 100000),
+    )
+
+
+def _create_visit_tracker() -> VisitTracker:
+    """
+    Builds the VisitTracker and its components from the environment.
+
+    Returns:
+        VisitTracker: The tracker shared by the whole application.
+    """
+    loader = EnvLoader(
+        "VISIT_TRACKER_SHARDS",
+        "VISIT_TRACKER_SHM_PATH",
+        "VISIT_TRACKER_SHM_WORKERS",
+        "VISIT_TRACKER_SHM_ENDPOINTS",
+        "VISIT_TRACKER_TOP_K",
+        "VISIT_JOURNAL_DIR",
+        "VISIT_JOURNAL_FLUSH_INTERVAL",
+        "VISIT_LOG_SAMPLE_RATE",
+        "VISIT_DEDUP_WINDOW",
+        "VISIT_DEDUP_MAX_ENTRIES",
+    )
+    shards = int(loader.get("VISIT_TRACKER_SHARDS") or 1)
+
+    return VisitTracker(
+        store=_create_visit_store(loader),
+        journal=_create_visit_journal(loader),
+        histogram=VisitHistogram(stripes=shards),
+        visitors=UniqueVisitors(stripes=shards),
+        log_sample_rate=float(loader.get("VISIT_LOG_SAMPLE_RATE") or 1.0),
+        dedup=_create_dedup_window(loader),
+        latencies=RouteLatencies(stripes=shards),
+        stripes=shards,
+    )
+
+
+def _create_visit_history(visit_tracker: VisitTracker) -> Optional[VisitHistory]:
+    """
+    Builds the persistent visit history if one is configured.
+
+    Args:
+        visit_tracker (VisitTracker): Tracker whose counters are recorded.
+
+    Returns:
+        Optional[VisitHistory]: The history, or None when disabled.
+    """
+    loader = EnvLoader("VISIT_HISTORY_PATH", "VISIT_HISTORY_FLUSH_INTERVAL")
+    path = loader.get("VISIT_HISTORY_PATH")
+
+    if not path:
+        return None
+    return VisitHistory(
+        visit_tracker,
+        path=str(path),
+        flush_interval=float(loader.get("VISIT_HISTORY_FLUSH_INTERVAL") or 60.0),
+    )
+
+
+def _create_email_reporter() -> EmailReporter:
+    """
+    Builds the EmailReporter, backed by an outbox if one is configured.
+
+    Returns:
+        EmailReporter: The reporter used by the scheduler.
+    """
+    loader = EnvLoader("EMAIL_OUTBOX_DIR", "EMAIL_OUTBOX_MAX_ATTEMPTS")
+    directory = loader.get("EMAIL_OUTBOX_DIR")
+
+    if not directory:
+        return EmailReporter()
+    return EmailReporter(
+        outbox=EmailOutbox(
+            directory=str(directory),
+            sender_factory=lambda: EmailNotificator().email_sender,
+            max_attempts=int(loader.get("EMAIL_OUTBOX_MAX_ATTEMPTS") or 5),
+        )
+    )
+
+
+def _create_report_scheduler(components: Components) -> ReportScheduler:
+    """
+    Builds the daily report scheduler from the registered components.
+
+    Args:
+        components (Components): Registry holding its dependencies.
+
+    Returns:
+        ReportScheduler: The scheduler (not started).
+    """
+    return ReportScheduler(
+        visit_tracker=components.get("visit_tracker"),
+        reporter=components.get("email_reporter"),
+        history=components.get("visit_history"),
+    )
+
+
+# Default components, built on first use: importing the package neither
+# reads the environment nor opens files or starts threads
+components = Components()
+components.register("visit_tracker", lambda _: _create_visit_tracker())
+components.register("email_reporter", lambda _: _create_email_reporter())
+components.register(
+    "visit_history", lambda c: _create_visit_history(c.get("visit_tracker"))
+)
+components.register("scheduler", _create_report_scheduler)
+
+
+def current_components() -> Components:
+    """
+    Returns the components of the current Flask application, or the
+    default components outside of an application context.
+
+    Returns:
+        Components: The component registry.
+    """
+    if has_app_context():
+        return current_app.extensions.get(EXTENSION_NAME, components)
+    return components
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Builds the default report scheduler when `scheduler` is first imported,
+    keeping `from app.utils import scheduler` working.
+    """
+    if name == "scheduler":
+        return components.get("scheduler")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["Components", "components", "current_components", "scheduler"]
 
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the AsyncLogging class, which moves log handler work
+off the request threads.
+
+Once started, the root logger only holds a QueueHandler that hands records
+to a bounded in-memory queue; a QueueListener thread formats them and runs
+the real handlers. Request threads do not wait on handler I/O, and records
+are dropped (and counted) if the queue is full.
+
+Formatting a message is deferred to the listener only when its arguments
+are immutable (strings, numbers...), as they cannot change while the record
+waits in the queue; other arguments are formatted into the message on the
+calling thread. Tracebacks are always rendered on the calling thread, so
+queued records do not keep exception frames (and their locals) alive.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+_DEFAULT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Message arguments that are safe to format later, on the listener thread
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+def _is_immutable(args: object) -> bool:
+    """
+    Checks whether the arguments of a log message are all immutable (a
+    mapping of arguments never is).
+    """
+    if not isinstance(args, tuple):
+        return False
+    return all(isinstance(arg, _IMMUTABLE_TYPES) for arg in args)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that defers formatting to the listener thread when it is
+    safe to, and drops records instead of blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mutable arguments could change before the listener formats them
+        args = record.args
+        if args and not _is_immutable(args):
+            record.msg = record.getMessage()
+            record.args = None
+
+        # The traceback text is what handlers print; dropping exc_info
+        # releases the frames it references
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AsyncLogging:
+    """
+    Installs queue-based logging on the root logger.
+
+    Attributes:
+        level (int): Level set on the root logger.
+        max_queue_size (int): Records buffered before new ones are dropped.
+    """
+
+    def __init__(self, level: int = logging.INFO, max_queue_size: int = 10000):
+        """
+        Initializes the async logging setup (not started yet).
+
+        Args:
+            level (int): Level set on the root logger.
+            max_queue_size (int): Records buffered before new ones are dropped.
+        """
+        self.level = level
+        self.max_queue_size = max_queue_size
+        self._handler: Optional[_NonBlockingQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._handlers: List[logging.Handler] = []
+
+    def start(self) -> None:
+        """
+        Moves the root logger's handlers behind a queue listener. If the
+        root logger has no handlers, a stream handler is used. Calling it
+        again is a no-op.
+        """
+        if self._listener is not None:
+            return
+
+        root = logging.getLogger()
+        self._handlers = root.handlers[:]
+
+        if not self._handlers:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(logging.Formatter(_DEFAULT_FORMAT))
+            self._handlers = [stream_handler]
+
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(self.max_queue_size)
+        self._handler = _NonBlockingQueueHandler(log_queue)
+        self._listener = QueueListener(
+            log_queue, *self._handlers, respect_handler_level=True
+        )
+
+        root.handlers = [self._handler]
+        root.setLevel(self.level)
+
+        self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Flushes the queue, stops the listener thread and restores the
+        original handlers on the root logger.
+        """
+        if self._listener is None:
+            return
+
+        self._listener.stop()
+        self._listener = None
+
+        root = logging.getLogger()
+        if self._handler in root.handlers:
+            root.handlers = self._handlers
+
+    @property
+    def dropped(self) -> int:
+        """
+        Returns:
+            int: Number of records dropped because the queue was full.
+        """
+        return self._handler.dropped if self._handler else 0
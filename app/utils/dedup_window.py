@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the DedupWindow class, a time-bucketed TTL cache used
+to count a given client and endpoint at most once per window.
+
+Keys are grouped into buckets covering window / buckets seconds each.
+Expiring a bucket drops all of its keys at once, so expiry costs O(1)
+amortized per key and never scans the whole cache. When the hard entry cap
+is reached, the oldest bucket is dropped early.
+"""
+
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class DedupWindow:
+    """
+    Remembers (endpoint, visitor) pairs for a fixed window.
+
+    Attributes:
+        window (float): Seconds a pair is remembered after its first visit.
+        max_entries (int): Hard cap on remembered pairs.
+        buckets (int): Number of time buckets the window is split into.
+    """
+
+    def __init__(self, window: float, max_entries: int = 100000, buckets: int = 30):
+        """
+        Initializes an empty window.
+
+        Args:
+            window (float): Seconds a pair is remembered after its first visit.
+            max_entries (int): Hard cap on remembered pairs.
+            buckets (int): Number of time buckets (expiry granularity is
+            window / buckets).
+
+        Raises:
+            ValueError: If a value is not positive.
+        """
+        if window <= 0 or max_entries <= 0 or buckets <= 0:
+            raise ValueError("Dedup window values must be positive.")
+
+        self.window = window
+        self.max_entries = max_entries
+        self.buckets = buckets
+
+        self._granularity = window / buckets
+        # key -> bucket number of its first visit
+        self._seen: Dict[int, int] = {}
+        # (bucket number, keys first seen in it), oldest first
+        self._slots: Deque[Tuple[int, List[int]]] = deque()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def first_visit(
+        self, endpoint: str, visitor: str, now: Optional[float] = None
+    ) -> bool:
+        """
+        Checks whether this is the pair's first visit in the window, and
+        remembers it if so.
+
+        Args:
+            endpoint (str): The path or name of the endpoint.
+            visitor (str): Client fingerprint.
+            now (float, optional): Unix time of the visit (default: now).
+
+        Returns:
+            bool: True if the visit should be counted.
+        """
+        slot = int((now if now is not None else time.time()) / self._granularity)
+        key = hash((endpoint, visitor))
+
+        with self._lock:
+            self._expire(slot - self.buckets)
+
+            first_slot = self._seen.get(key)
+            if first_slot is not None and first_slot > slot - self.buckets:
+                return False
+
+            if len(self._seen) >= self.max_entries:
+                self._drop_oldest()
+
+            self._seen[key] = slot
+            if not self._slots or self._slots[-1][0] != slot:
+                self._slots.append((slot, []))
+            self._slots[-1][1].append(key)
+            return True
+
+    def _expire(self, last_expired: int) -> None:
+        """
+        Drops the buckets numbered last_expired or lower. Must be called
+        with the lock held.
+        """
+        while self._slots and self._slots[0][0] <= last_expired:
+            self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        """
+        Forgets every key of the oldest bucket. Must be called with the
+        lock held.
+        """
+        slot, keys = self._slots.popleft()
+        seen = self._seen
+        for key in keys:
+            # The key may have been seen again in a later bucket
+            if seen.get(key) == slot:
+                del seen[key]
+
+    def clear(self) -> None:
+        """
+        Forgets every pair.
+        """
+        with self._lock:
+            self._seen.clear()
+            self._slots.clear()
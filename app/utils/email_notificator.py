@@ -21,6 +21,7 @@ class EmailNotificator:
         - EMAIL_PASSWORD
         - SMTP_SERVER
         - SMTP_PORT
+        - SMTP_USE_TLS (optional, "false" disables STARTTLS)
     """
 
     def __init__(self):
@@ -29,7 +30,11 @@ class EmailNotificator:
         and initializes the EmailSender instance.
         """
         self._loader = EnvLoader(
-            "EMAIL_ADDRESS", "EMAIL_PASSWORD", "SMTP_SERVER", "SMTP_PORT"
+            "EMAIL_ADDRESS",
+            "EMAIL_PASSWORD",
+            "SMTP_SERVER",
+            "SMTP_PORT",
+            "SMTP_USE_TLS",
         )
         self._email_sender = self._create_email_sender()
 
@@ -41,12 +46,14 @@ class EmailNotificator:
             EmailSender: Configured email sender instance.
         """
         smtp_port = int(self._loader.get("SMTP_PORT", 587))
+        use_tls = str(self._loader.get("SMTP_USE_TLS") or "true").lower() != "false"
 
         return EmailSender(
             email_address=self._loader.get("EMAIL_ADDRESS"),
             email_password=self._loader.get("EMAIL_PASSWORD"),
             smtp_server=self._loader.get("SMTP_SERVER"),
             smtp_port=smtp_port,
+            use_tls=use_tls,
         )
 
     @property
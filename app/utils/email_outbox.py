@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the EmailOutbox class, a durable local queue of
+outgoing emails drained by background delivery workers.
+
+Each message is stored as a JSON file under "pending/" before enqueue
+returns, so nothing is lost if SMTP is down or the process restarts.
+Workers send due messages in batches over their own SMTP session, retry
+failures with exponential backoff and jitter, and move messages that keep
+failing (or are permanently refused, with a 5xx reply) to "dead/". When a
+session fails part-way through a batch, only the messages it did not send
+are retried.
+
+Worker processes may share the outbox directory. Before sending a message,
+a worker claims it by renaming its file to "<id>.<pid>.inflight", which
+only one process can do, so every process may queue every pending file
+without sending it twice. Claims left by a process that died are handed
+back to the queue when the outbox loads.
+"""
+
+import heapq
+import json
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .email_sender import BatchSendError, EmailSender
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    """
+    Checks whether a process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_permanent(error: Exception) -> bool:
+    """
+    Checks whether a refusal is permanent (5xx), as opposed to a transient
+    4xx reply such as greylisting or a full mailbox.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(code >= 500 for code in codes)
+    return getattr(error, "smtp_code", 0) >= 500
+
+
+class EmailOutbox:
+    """
+    Persistent outbox with background delivery and retries.
+
+    Attributes:
+        directory (str): Directory holding the "pending" and "dead" queues.
+        workers (int): Number of delivery threads (each with its own session).
+        max_attempts (int): Attempts before a message is dead-lettered.
+        base_delay (float): Backoff delay after the first failure, in seconds.
+        max_delay (float): Upper bound of the backoff delay, in seconds.
+        batch_size (int): Maximum messages sent per session round.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sender_factory: Callable[[], EmailSender],
+        workers: int = 1,
+        max_attempts: int = 5,
+        base_delay: float = 30.0,
+        max_delay: float = 3600.0,
+        batch_size: int = 20,
+    ):
+        """
+        Initializes the outbox and loads messages left from previous runs.
+
+        Args:
+            directory (str): Directory holding the queues.
+            sender_factory (Callable[[], EmailSender]): Builds one sender
+            per delivery worker.
+            workers (int): Number of delivery threads.
+            max_attempts (int): Attempts before a message is dead-lettered.
+            base_delay (float): Backoff delay after the first failure.
+            max_delay (float): Upper bound of the backoff delay.
+            batch_size (int): Maximum messages sent per session round.
+        """
+        self.directory = directory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = batch_size
+
+        self._sender_factory = sender_factory
+        self._pending_dir = os.path.join(directory, "pending")
+        self._dead_dir = os.path.join(directory, "dead")
+        os.makedirs(self._pending_dir, exist_ok=True)
+        os.makedirs(self._dead_dir, exist_ok=True)
+
+        self._queue: List[Tuple[float, str]] = []
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # Senders built by the workers, kept for their delivery counters
+        self._senders: List[EmailSender] = []
+        self._stats = {"delivered": 0, "retries": 0, "dead_letters": 0}
+
+        self._load()
+
+    def _path(self, message_id: str, dead: bool = False) -> str:
+        return os.path.join(
+            self._dead_dir if dead else self._pending_dir, f"{message_id}.json"
+        )
+
+    def _claim_path(self, message_id: str) -> str:
+        return os.path.join(self._pending_dir, f"{message_id}.{os.getpid()}.inflight")
+
+    def _load(self) -> None:
+        """
+        Hands back the claims of dead processes (or of a previous run of
+        this one), then queues every message found in the pending directory.
+        """
+        for name in os.listdir(self._pending_dir):
+            if not name.endswith(".inflight"):
+                continue
+            message_id, _, pid = name[: -len(".inflight")].rpartition(".")
+            if pid.isdigit() and (int(pid) == os.getpid() or not _pid_alive(int(pid))):
+                try:
+                    os.rename(
+                        os.path.join(self._pending_dir, name), self._path(message_id)
+                    )
+                except FileNotFoundError:
+                    pass  # Another process recovered it first
+
+        for name in os.listdir(self._pending_dir):
+            if not name.endswith(".json"):
+                continue
+            message = self._read(os.path.join(self._pending_dir, name))
+            if message is not None:
+                heapq.heappush(self._queue, (message["next_attempt"], message["id"]))
+
+        if self._queue:
+            logger.info(f"[Outbox] Recovered {len(self._queue)} pending email(s).")
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as message_file:
+                return json.load(message_file)
+        except FileNotFoundError:
+            # Delivered by another process since it was listed
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"[Outbox] Unreadable message {path}: {e}")
+            return None
+
+    def _write(self, message: Dict[str, Any], dead: bool = False) -> None:
+        """
+        Atomically writes a message file (write to a temp file, fsync, rename).
+        """
+        path = self._path(message["id"], dead)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as message_file:
+            json.dump(message, message_file)
+            message_file.flush()
+            os.fsync(message_file.fileno())
+        os.replace(tmp_path, path)
+
+    def enqueue(self, to_address: str, subject: str, html: str) -> str:
+        """
+        Persists a message and schedules it for immediate delivery.
+
+        Args:
+            to_address (str): Recipient's email address.
+            subject (str): Subject line of the email.
+            html (str): HTML content to be sent as the email body.
+
+        Returns:
+            str: The id of the queued message.
+        """
+        now = time.time()
+        message = {
+            "id": f"{int(now * 1000):013d}-{uuid.uuid4().hex[:8]}",
+            "to": to_address,
+            "subject": subject,
+            "html": html,
+            "attempts": 0,
+            "created": now,
+            "next_attempt": now,
+        }
+        self._write(message)
+
+        with self._condition:
+            heapq.heappush(self._queue, (now, message["id"]))
+            self._condition.notify()
+        return message["id"]
+
+    def start(self) -> None:
+        """
+        Starts the delivery workers if they are not running yet.
+        """
+        if any(thread.is_alive() for thread in self._threads):
+            return
+
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True) for _ in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the delivery workers. Undelivered messages stay on disk.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker.
+        """
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _take_due(self) -> List[str]:
+        """
+        Blocks until messages are due (or the outbox stops) and claims up
+        to batch_size of them.
+
+        Returns:
+            List[str]: Ids of the claimed messages (empty when stopping).
+        """
+        with self._condition:
+            while not self._stop_event.is_set():
+                now = time.time()
+                if self._queue and self._queue[0][0] <= now:
+                    batch = []
+                    while self._queue and self._queue[0][0] <= now:
+                        batch.append(heapq.heappop(self._queue)[1])
+                        if len(batch) == self.batch_size:
+                            break
+                    self._in_flight += len(batch)
+                    return batch
+
+                timeout = self._queue[0][0] - now if self._queue else None
+                self._condition.wait(timeout)
+        return []
+
+    def _run(self) -> None:
+        """
+        Worker loop: delivers due messages over the worker's own session,
+        built on first use. A failed round (e.g. the sender cannot be
+        built) is logged and its messages are retried later, so the worker
+        keeps running.
+        """
+        sender: Optional[EmailSender] = None
+        try:
+            while True:
+                batch = self._take_due()
+                if not batch:
+                    break
+                try:
+                    if sender is None:
+                        sender = self._sender_factory()
+                        with self._condition:
+                            self._senders.append(sender)
+                    self._deliver(sender, batch)
+                except Exception as e:
+                    logger.error(f"[Outbox] Delivery round failed: {e}")
+                    self._release(batch)
+                finally:
+                    with self._condition:
+                        self._in_flight -= len(batch)
+        finally:
+            if sender is not None:
+                sender.close()
+
+    def _claim(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claims a pending message for this process.
+
+        Returns:
+            Optional[Dict[str, Any]]: The message, or None if another process
+            claimed or delivered it, or if it is not due yet (rescheduled by
+            another process).
+        """
+        claimed = self._claim_path(message_id)
+        try:
+            os.rename(self._path(message_id), claimed)
+        except FileNotFoundError:
+            return None
+
+        message = self._read(claimed)
+        if message is None:
+            os.replace(claimed, self._path(message_id, dead=True))
+            return None
+
+        if message["next_attempt"] > time.time():
+            os.rename(claimed, self._path(message_id))
+            with self._condition:
+                heapq.heappush(self._queue, (message["next_attempt"], message_id))
+                self._condition.notify()
+            return None
+        return message
+
+    def _release(self, batch: List[str]) -> None:
+        """
+        Hands the claimed messages of a failed round back to the queue,
+        to be retried after the base delay.
+        """
+        next_attempt = time.time() + self.base_delay
+        for message_id in batch:
+            try:
+                os.rename(self._claim_path(message_id), self._path(message_id))
+            except FileNotFoundError:
+                pass  # Not claimed yet, or already handled
+            with self._condition:
+                heapq.heappush(self._queue, (next_attempt, message_id))
+                self._condition.notify()
+
+    def _unclaim(self, message_id: str) -> None:
+        """
+        Deletes the claim of a message that was handled.
+        """
+        try:
+            os.remove(self._claim_path(message_id))
+        except FileNotFoundError:
+            pass
+
+    def _deliver(self, sender: EmailSender, batch: List[str]) -> None:
+        messages = [m for m in (self._claim(message_id) for message_id in batch) if m]
+        if not messages:
+            return
+
+        try:
+            failures = dict(
+                sender.send_many((m["to"], m["subject"], m["html"]) for m in messages)
+            )
+            handled = len(messages)
+        except BatchSendError as e:
+            logger.error(f"[Outbox] SMTP delivery failed: {e.error}")
+            failures, handled = dict(e.failures), e.index
+            for message in messages[handled:]:
+                self._retry(message, e.error)
+
+        for index, message in enumerate(messages[:handled]):
+            error = failures.get(index)
+            if error is None:
+                self._unclaim(message["id"])
+                self._bump("delivered")
+            elif _is_permanent(error):
+                # Refused recipients or content will not succeed on retry
+                message["attempts"] += 1
+                self._dead_letter(message, error)
+            else:
+                self._retry(message, error)
+
+    def _retry(self, message: Dict[str, Any], error: Exception) -> None:
+        """
+        Reschedules a failed message with exponential backoff and jitter,
+        or dead-letters it once it ran out of attempts.
+        """
+        message["attempts"] += 1
+        message["last_error"] = str(error)
+
+        if message["attempts"] >= self.max_attempts:
+            self._dead_letter(message, error)
+            return
+
+        delay = min(self.max_delay, self.base_delay * 2 ** (message["attempts"] - 1))
+        message["next_attempt"] = time.time() + delay * random.uniform(0.5, 1.0)
+        self._write(message)
+        self._unclaim(message["id"])
+        self._bump("retries")
+
+        with self._condition:
+            heapq.heappush(self._queue, (message["next_attempt"], message["id"]))
+            self._condition.notify()
+
+    def _dead_letter(self, message: Dict[str, Any], error: Exception) -> None:
+        message["last_error"] = str(error)
+        self._write(message, dead=True)
+        self._unclaim(message["id"])
+        self._bump("dead_letters")
+        logger.error(
+            f"[Outbox] Email {message['id']} dead-lettered after "
+            f"{message['attempts']} attempt(s): {error}"
+        )
+
+    def _bump(self, stat: str) -> None:
+        with self._condition:
+            self._stats[stat] += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Queue depth (waiting plus in-flight messages) and
+            the delivered, retries and dead_letters counters.
+        """
+        with self._condition:
+            return {"depth": len(self._queue) + self._in_flight, **self._stats}
+
+    def keepalive(self) -> None:
+        """
+        Sends a NOOP on the idle sessions of the delivery workers.
+        """
+        with self._condition:
+            senders = list(self._senders)
+        for sender in senders:
+            sender.keepalive()
+
+    @property
+    def sender_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Returns:
+            Optional[Dict[str, int]]: Delivery counters summed over the
+            workers' senders, or None if no worker has started yet.
+        """
+        with self._condition:
+            senders = list(self._senders)
+        if not senders:
+            return None
+
+        totals: Dict[str, int] = {}
+        for sender in senders:
+            for name, value in sender.stats.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
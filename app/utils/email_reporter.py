@@ -6,14 +6,18 @@ This module defines the EmailReporter class, which is responsible for
 creating and sending a daily visit report as an HTML email.
 
 It integrates data modeling (VisitReport), rendering (VisitReportRenderer),
-and email delivery (EmailSender via EmailNotificator).
+and email delivery (EmailSender via EmailNotificator), optionally through a
+durable EmailOutbox so that delivery happens in the background.
 """
 
 from datetime import datetime
+from typing import Dict, Optional
 
 from ..models import VisitReport
 from ..views import VisitReportRenderer
 from .email_notificator import EmailNotificator
+from .email_outbox import EmailOutbox
+from .email_sender import EmailSender
 
 
 class EmailReporter:
@@ -25,29 +29,111 @@ class EmailReporter:
     and EmailSender to deliver the message.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        outbox: Optional[EmailOutbox] = None,
+        email_sender: Optional[EmailSender] = None,
+    ):
         """
-        Initializes the EmailReporter and sets up the email sender using
-        the default configuration provided by EmailNotificator.
+        Initializes the EmailReporter.
+
+        Args:
+            outbox (EmailOutbox, optional): Outbox to enqueue reports into.
+            If None, reports are sent inline.
+            email_sender (EmailSender, optional): Sender of the reports. If
+            None, one is created from the EmailNotificator configuration
+            when first used.
         """
-        self.email_sender = EmailNotificator().email_sender
+        self._email_sender = email_sender
+        self.outbox = outbox
 
-    def send(self, count: int, log: dict) -> None:
+    @property
+    def email_sender(self) -> EmailSender:
+        """
+        Returns:
+            EmailSender: The sender of the reports.
         """
-        Composes the visit report and sends it as an HTML email.
+        if self._email_sender is None:
+            self._email_sender = EmailNotificator().email_sender
+        return self._email_sender
+
+    def keepalive(self) -> None:
+        """
+        Keeps the open SMTP sessions alive between reports, without
+        building a sender that does not exist yet.
+        """
+        if self.outbox is not None:
+            self.outbox.keepalive()
+        elif self._email_sender is not None:
+            self._email_sender.keepalive()
+
+    @property
+    def sender_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Reads the delivery counters of the senders that send the reports
+        (the outbox workers' senders when an outbox is configured),
+        without building a sender.
+
+        Returns:
+            Optional[Dict[str, int]]: Messages sent and failed, and SMTP
+            connections opened, or None if no sender was built yet.
+        """
+        if self.outbox is not None:
+            return self.outbox.sender_stats
+        if self._email_sender is None:
+            return None
+        return self._email_sender.stats
+
+    def start(self) -> None:
+        """
+        Starts the outbox delivery workers, if an outbox is configured.
+        """
+        if self.outbox is not None:
+            self.outbox.start()
+
+    def send(
+        self,
+        count: int,
+        log: dict,
+        endpoints: Optional[dict] = None,
+        uniques: Optional[dict] = None,
+        unique_count: int = 0,
+        history: Optional[dict] = None,
+        latencies: Optional[dict] = None,
+    ) -> None:
+        """
+        Composes the visit report and sends it as an HTML email (or queues
+        it in the outbox, which returns without waiting on SMTP).
 
         Args:
             count (int): Total number of visits.
             log (dict): Dictionary of visits grouped by time (e.g., {"14h": 5}).
+            endpoints (dict, optional): Dictionary of visits per endpoint.
+            uniques (dict, optional): Estimated unique visitors per endpoint.
+            unique_count (int): Estimated unique visitors overall.
+            history (dict, optional): Visits per day over the last days.
+            latencies (dict, optional): Request duration percentiles per route.
         """
         try:
-            report = VisitReport(count, log, datetime.now())
+            report = VisitReport(
+                count,
+                log,
+                datetime.now(),
+                endpoints or {},
+                uniques or {},
+                unique_count,
+                history or {},
+                latencies or {},
+            )
             html = VisitReportRenderer.render(report)
+            to_address = self.email_sender.email_address
+            subject = "Relatório diário de visitas"
 
-            self.email_sender.send_html(
-                to_address=self.email_sender.email_address,
-                subject="Relatório diário de visitas",
-                html=html,
-            )
+            if self.outbox is not None:
+                self.outbox.enqueue(to_address, subject, html)
+            else:
+                self.email_sender.send_html(
+                    to_address=to_address, subject=subject, html=html
+                )
         except Exception as e:
             print(f"[❌] Erro ao enviar relatório: {e}")
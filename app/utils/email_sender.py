@@ -5,11 +5,59 @@
 This module provides a simple utility class for sending HTML emails via SMTP.
 
 The EmailSender class encapsulates all necessary configuration and
-sending logic, making it reusable for email notification systems.
+sending logic, making it reusable for email notification systems. It keeps
+one authenticated SMTP session open between sends, so the TCP connection,
+STARTTLS and LOGIN are paid once rather than per message, and counts its
+deliveries for monitoring. A message is only resent on a new session when
+the old one dropped before its DATA command, so a message the server may
+already have accepted is never sent twice.
 """
 
+import logging
 import smtplib
+import time
 from email.mime.text import MIMEText
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSendError(smtplib.SMTPException):
+    """
+    Raised when the SMTP session fails part-way through a batch.
+
+    Attributes:
+        index (int): Position of the message being sent when the session
+        failed; it and the following messages were not sent.
+        failures (List[Tuple[int, Exception]]): Index and error of the
+        earlier messages refused by the server.
+        error (Exception): The session error.
+    """
+
+    def __init__(
+        self, index: int, failures: List[Tuple[int, Exception]], error: Exception
+    ):
+        super().__init__(str(error))
+        self.index = index
+        self.failures = failures
+        self.error = error
+
+
+class _Session(smtplib.SMTP):
+    """
+    SMTP session remembering whether the current message reached DATA.
+    """
+
+    data_started = False
+
+    def mail(self, sender: str, options: Sequence[str] = ()) -> Tuple[int, bytes]:
+        self.data_started = False
+        return super().mail(sender, options)
+
+    def data(self, msg: Union[str, bytes]) -> Tuple[int, bytes]:
+        self.data_started = True
+        return super().data(msg)
 
 
 class EmailSender:
@@ -18,7 +66,14 @@ class EmailSender:
     """
 
     def __init__(
-        self, email_address: str, email_password: str, smtp_server: str, smtp_port: int
+        self,
+        email_address: str,
+        email_password: str,
+        smtp_server: str,
+        smtp_port: int,
+        use_tls: bool = True,
+        timeout: float = 30.0,
+        idle_check_after: float = 30.0,
     ):
         """
         Initializes the EmailSender with SMTP credentials and server configuration.
@@ -26,13 +81,128 @@ class EmailSender:
         Args:
             email_address (str): Sender's email address used to authenticate.
             email_password (str): Password or app-specific token for the email account.
+            If empty, no LOGIN is attempted (e.g. a local relay).
             smtp_server (str): Address of the SMTP server (e.g., smtp.gmail.com).
             smtp_port (int): Port used to connect to the SMTP server (usually 587).
+            use_tls (bool): Whether to upgrade the connection with STARTTLS.
+            timeout (float): Socket timeout in seconds.
+            idle_check_after (float): Seconds of inactivity after which the
+            session is probed with NOOP before being reused.
         """
         self.email_address = email_address
         self.email_password = email_password
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_check_after = idle_check_after
+
+        self._session: Optional[_Session] = None
+        self._last_used = 0.0
+        self._lock = Lock()
+        # Only written with the lock held; read without it by `stats`
+        self._stats = {"sent": 0, "failed": 0, "connections": 0}
+
+    def _build_message(self, to_address: str, subject: str, html: str) -> MIMEText:
+        msg = MIMEText(html, "html")
+        msg["Subject"] = subject
+        msg["To"] = to_address
+        msg["From"] = self.email_address
+        return msg
+
+    def _connect(self) -> _Session:
+        """
+        Opens and authenticates a new SMTP session.
+
+        Returns:
+            _Session: The connected session.
+        """
+        server = _Session(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.email_password:
+                server.login(self.email_address, self.email_password)
+        except Exception:
+            server.close()
+            raise
+        self._stats["connections"] += 1
+        return server
+
+    def _close_session(self) -> None:
+        if self._session is None:
+            return
+
+        try:
+            self._session.quit()
+        except (smtplib.SMTPException, OSError):
+            self._session.close()
+        self._session = None
+
+    def _is_alive(self) -> bool:
+        """
+        Probes the current session with NOOP.
+
+        Returns:
+            bool: True if the server answered the probe.
+        """
+        try:
+            return self._session is not None and self._session.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _get_session(self) -> _Session:
+        """
+        Returns a live session, reconnecting if the current one went idle
+        and no longer answers. Must be called with the lock held.
+        """
+        idle = time.monotonic() - self._last_used
+        if self._session is not None and idle > self.idle_check_after:
+            if not self._is_alive():
+                logger.info("[EmailSender] Idle SMTP session lost, reconnecting.")
+                self._close_session()
+
+        if self._session is None:
+            self._session = self._connect()
+        return self._session
+
+    def _send(self, msg: MIMEText) -> None:
+        """
+        Sends one message and counts the outcome. Must be called with the
+        lock held.
+        """
+        try:
+            self._transmit(msg)
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        self._stats["sent"] += 1
+
+    def _transmit(self, msg: MIMEText) -> None:
+        """
+        Sends one message over the shared session, reconnecting once if the
+        server dropped the connection before the message reached DATA. A
+        failed session is always discarded. Must be called with the lock
+        held.
+        """
+        for attempt in range(2):
+            session = self._get_session()
+            try:
+                session.send_message(msg)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError):
+                # The message was refused but the session is still usable
+                raise
+            except (smtplib.SMTPException, OSError) as e:
+                session.close()
+                self._session = None
+                # Past DATA, the server may have accepted the message
+                retry = isinstance(e, smtplib.SMTPServerDisconnected)
+                if attempt or not retry or session.data_started:
+                    raise
+                logger.info("[EmailSender] SMTP session dropped, reconnecting.")
+            else:
+                self._last_used = time.monotonic()
+                return
 
     def send_html(self, to_address: str, subject: str, html: str) -> None:
         """
@@ -43,12 +213,74 @@ class EmailSender:
             subject (str): Subject line of the email.
             html (str): HTML content to be sent as the email body.
         """
-        msg = MIMEText(html, "html")
-        msg["Subject"] = subject
-        msg["To"] = to_address
-        msg["From"] = self.email_address
+        with self._lock:
+            self._send(self._build_message(to_address, subject, html))
+
+    def send_many(
+        self, messages: Iterable[Tuple[str, str, str]]
+    ) -> List[Tuple[int, Exception]]:
+        """
+        Sends several HTML emails over a single SMTP session. A message
+        refused by the server does not stop the rest of the batch; a
+        session error does, and reports which messages were already
+        handled.
 
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-            server.starttls()
-            server.login(self.email_address, self.email_password)
-            server.send_message(msg)
+        Args:
+            messages (Iterable[Tuple[str, str, str]]): (to_address, subject,
+            html) for each email.
+
+        Returns:
+            List[Tuple[int, Exception]]: Index and error of every message
+            that could not be sent (empty if all were delivered).
+
+        Raises:
+            BatchSendError: If the server cannot be reached or the session
+            fails; the messages before its index were sent or refused.
+        """
+        failures: List[Tuple[int, Exception]] = []
+
+        with self._lock:
+            for index, (to_address, subject, html) in enumerate(messages):
+                try:
+                    self._send(self._build_message(to_address, subject, html))
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                    failures.append((index, e))
+                except (smtplib.SMTPException, OSError) as e:
+                    raise BatchSendError(index, failures, e) from e
+        return failures
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Reads the delivery counters without waiting for a send in progress.
+
+        Returns:
+            Dict[str, int]: Messages sent and failed, and SMTP connections
+            opened so far.
+        """
+        return dict(self._stats)
+
+    def keepalive(self) -> None:
+        """
+        Sends a NOOP on the open session, dropping it if the server no
+        longer answers. Meant to be called periodically between sends
+        (see ReportScheduler); a session busy sending is left alone.
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._session is None:
+                return
+            if self._is_alive():
+                self._last_used = time.monotonic()
+            else:
+                self._close_session()
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        """
+        Closes the SMTP session, if any.
+        """
+        with self._lock:
+            self._close_session()
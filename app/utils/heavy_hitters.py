@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines a bounded-memory visit store for deployments where the
+set of endpoint names is open-ended (raw paths, IDs, scanner noise).
+
+    - CountMinSketch: fixed-size frequency estimates for any key; never
+      underestimates, overestimates by at most ~e/width of the total with
+      high probability.
+    - HeavyHittersVisitStore: Space-Saving table of the top-K endpoints,
+      admitting a new endpoint only when its Count-Min estimate beats the
+      smallest tracked one. Visits outside the table are reported as "other".
+
+Memory stays flat regardless of how many distinct endpoints are seen.
+"""
+
+import hashlib
+from array import array
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from .visit_stores import VisitStore
+
+OVERFLOW_ENDPOINT = "other"
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch of 64-bit counters.
+
+    Attributes:
+        width (int): Counters per row.
+        depth (int): Number of rows (independent hash functions).
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            width (int): Counters per row.
+            depth (int): Number of rows.
+        """
+        self.width = width
+        self.depth = depth
+        self._rows: List[array] = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _indexes(self, key: str) -> List[int]:
+        # Double hashing: row i uses h1 + i * h2 (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        Adds occurrences of a key.
+
+        Args:
+            key (str): The key to count.
+            count (int): Occurrences to add.
+
+        Returns:
+            int: The key's estimate after the update.
+        """
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += count
+            value = row[index]
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        """
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            int: Upper-bound estimate of the key's count.
+        """
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
+class HeavyHittersVisitStore(VisitStore):
+    """
+    Visit store keeping exact-ish counts for the K most visited endpoints
+    and estimating the long tail with a Count-Min sketch.
+
+    The total is always exact. counts() returns the tracked endpoints plus
+    an "other" entry holding every visit not attributed to them.
+    """
+
+    def __init__(self, capacity: int = 64, width: int = 2048, depth: int = 4):
+        """
+        Initializes the store.
+
+        Args:
+            capacity (int): Number of endpoints tracked individually (K).
+            width (int): Counters per Count-Min row.
+            depth (int): Number of Count-Min rows.
+        """
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+
+        self.lock = Lock()
+        self._access_count = 0
+        self._top: Dict[str, int] = {}
+        self._floor = 0
+        self._sketch = CountMinSketch(width, depth)
+
+    def add(self, endpoint: str, count: int = 1) -> None:
+        with self.lock:
+            self._add(endpoint, count)
+
+    def add_many(self, counts: Dict[str, int]) -> None:
+        with self.lock:
+            for endpoint, count in counts.items():
+                self._add(endpoint, count)
+
+    def _add(self, endpoint: str, count: int) -> None:
+        """
+        Counts visits to an endpoint. Must be called with the lock held.
+        """
+        self._access_count += count
+        estimate = self._sketch.add(endpoint, count)
+
+        if endpoint in self._top:
+            self._top[endpoint] += count
+        elif len(self._top) < self.capacity:
+            self._top[endpoint] = estimate
+        elif estimate > self._floor:
+            # Space-Saving eviction, gated by the sketch so one-off
+            # paths cannot churn the table. Tracked counts only grow,
+            # so the last minimum stays a lower bound and most misses
+            # skip the O(K) scan.
+            smallest = min(self._top, key=self._top.__getitem__)
+            self._floor = self._top[smallest]
+            if estimate > self._floor:
+                del self._top[smallest]
+                self._top[endpoint] = estimate
+
+    def get(self, endpoint: str) -> int:
+        with self.lock:
+            if endpoint in self._top:
+                return self._top[endpoint]
+            return self._sketch.estimate(endpoint)
+
+    def total(self) -> int:
+        return self._access_count
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            return self._with_overflow(self._access_count, dict(self._top))
+
+    def reset(self) -> None:
+        with self.lock:
+            self._access_count = 0
+            self._top = {}
+            self._floor = 0
+            self._sketch = CountMinSketch(self.width, self.depth)
+
+    def swap(self) -> Tuple[int, Dict[str, int]]:
+        with self.lock:
+            total, top = self._access_count, self._top
+            self._access_count = 0
+            self._top = {}
+            self._floor = 0
+            self._sketch = CountMinSketch(self.width, self.depth)
+        return total, self._with_overflow(total, top)
+
+    @staticmethod
+    def _with_overflow(total: int, top: Dict[str, int]) -> Dict[str, int]:
+        """
+        Adds the "other" bucket: visits not attributed to a tracked endpoint.
+        Admission estimates may exceed the true counts, so it never goes
+        below zero.
+        """
+        other = total - sum(top.values()) + top.pop(OVERFLOW_ENDPOINT, 0)
+        if other > 0:
+            top[OVERFLOW_ENDPOINT] = other
+        return top
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module provides approximate distinct counting with HyperLogLog.
+
+    - HyperLogLog: a fixed-size sketch (2^precision one-byte registers,
+      4 KB by default, ~1.6% standard error) that can be merged with other
+      sketches and serialized, e.g. to combine workers or days.
+    - UniqueVisitors: one sketch per endpoint, striped across threads like
+      the visit counters, used by VisitTracker to estimate unique visitors.
+"""
+
+import hashlib
+import math
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from .thread_stripes import ThreadStripes
+
+OVERFLOW_ENDPOINT = "other"
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch.
+
+    Attributes:
+        precision (int): Number of index bits; the sketch has 2^precision
+        registers.
+    """
+
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None):
+        """
+        Initializes an empty sketch (or one restored from its registers).
+
+        Args:
+            precision (int): Number of index bits (4 to 16).
+            registers (bytes, optional): Registers from to_bytes().
+
+        Raises:
+            ValueError: If the precision or the registers are invalid.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16.")
+
+        self.precision = precision
+        size = 1 << precision
+
+        if registers is not None and len(registers) != size:
+            raise ValueError("Register count does not match the precision.")
+        self.registers = bytearray(registers or size)
+
+    @staticmethod
+    def hash(value: str) -> int:
+        """
+        Hashes a value to the 64-bit integer the sketch consumes.
+
+        Args:
+            value (str): Value to hash.
+
+        Returns:
+            int: 64-bit hash.
+        """
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def add_hash(self, hashed: int) -> None:
+        """
+        Adds a 64-bit hash to the sketch.
+
+        Args:
+            hashed (int): Value returned by HyperLogLog.hash().
+        """
+        remaining_bits = 64 - self.precision
+        index = hashed >> remaining_bits
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, value: str) -> None:
+        """
+        Adds a value to the sketch.
+
+        Args:
+            value (str): Value to count.
+        """
+        self.add_hash(self.hash(value))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Merges another sketch of the same precision into this one.
+
+        Args:
+            other (HyperLogLog): Sketch to merge.
+
+        Raises:
+            ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """
+        Estimates the number of distinct values added.
+
+        Returns:
+            int: The estimated cardinality.
+        """
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-rank for rank in self.registers)
+
+        # Small-range correction: linear counting while registers are empty
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns:
+            bytes: The registers, restorable with HyperLogLog(precision, data).
+        """
+        return bytes(self.registers)
+
+
+class _VisitorStripe:
+    """
+    One stripe of UniqueVisitors: a lock and the sketches it guards.
+    """
+
+    __slots__ = ("lock", "sketches")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.sketches: Dict[str, HyperLogLog] = {}
+
+
+class UniqueVisitors:
+    """
+    Per-endpoint HyperLogLog sketches of visitor fingerprints.
+
+    Attributes:
+        precision (int): Precision of every sketch.
+        max_endpoints (int): Endpoints tracked individually per stripe;
+        further endpoints share the "other" sketch.
+    """
+
+    def __init__(self, precision: int = 12, max_endpoints: int = 64, stripes: int = 1):
+        """
+        Initializes the sketches.
+
+        Args:
+            precision (int): Precision of every sketch.
+            max_endpoints (int): Endpoints tracked individually per stripe.
+            stripes (int): Number of independently locked stripes.
+        """
+        self.precision = precision
+        self.max_endpoints = max_endpoints
+        self._stripes: ThreadStripes[_VisitorStripe] = ThreadStripes(
+            _VisitorStripe, stripes
+        )
+
+    def add(self, endpoint: str, visitor: str) -> None:
+        """
+        Records a visitor of an endpoint.
+
+        Args:
+            endpoint (str): The path or name of the endpoint.
+            visitor (str): Client fingerprint (hashed, never stored).
+        """
+        hashed = HyperLogLog.hash(visitor)
+        stripe = self._stripes.local()
+
+        with stripe.lock:
+            self._sketch(stripe, endpoint).add_hash(hashed)
+
+    def add_many(self, visitors: Iterable[Tuple[str, str]]) -> None:
+        """
+        Records several visitors in one bulk update.
+
+        Args:
+            visitors (Iterable[Tuple[str, str]]): (endpoint, visitor) pairs.
+        """
+        hashed = [
+            (endpoint, HyperLogLog.hash(visitor)) for endpoint, visitor in visitors
+        ]
+        stripe = self._stripes.local()
+
+        with stripe.lock:
+            for endpoint, value in hashed:
+                self._sketch(stripe, endpoint).add_hash(value)
+
+    def _sketch(self, stripe: _VisitorStripe, endpoint: str) -> HyperLogLog:
+        """
+        Returns the endpoint's sketch in the stripe, creating it (or falling
+        back to the overflow sketch) if needed. Must be called with the
+        stripe lock held.
+        """
+        sketch = stripe.sketches.get(endpoint)
+        if sketch is None:
+            if len(stripe.sketches) >= self.max_endpoints:
+                endpoint = OVERFLOW_ENDPOINT
+            sketch = stripe.sketches.get(endpoint)
+            if sketch is None:
+                sketch = stripe.sketches[endpoint] = HyperLogLog(self.precision)
+        return sketch
+
+    def sketches(self) -> Dict[str, HyperLogLog]:
+        """
+        Returns:
+            Dict[str, HyperLogLog]: Per-endpoint sketches merged across stripes.
+        """
+        merged: Dict[str, HyperLogLog] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for endpoint, sketch in stripe.sketches.items():
+                    target = merged.setdefault(endpoint, HyperLogLog(self.precision))
+                    target.merge(sketch)
+        return merged
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Estimated unique visitors per endpoint.
+        """
+        return {endpoint: s.count() for endpoint, s in self.sketches().items()}
+
+    def total(self) -> int:
+        """
+        Returns:
+            int: Estimated unique visitors across all endpoints.
+        """
+        combined = HyperLogLog(self.precision)
+        for sketch in self.sketches().values():
+            combined.merge(sketch)
+        return combined.count()
+
+    def reset(self) -> None:
+        """
+        Clears all sketches.
+        """
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.sketches = {}
+
+    def swap(self) -> "UniqueVisitors":
+        """
+        Replaces the sketches with empty ones, handing the old sketches over
+        in a detached instance.
+
+        Returns:
+            UniqueVisitors: Instance holding the replaced sketches.
+        """
+        old = UniqueVisitors(self.precision, self.max_endpoints, len(self._stripes))
+        for stripe, old_stripe in zip(self._stripes, old._stripes):
+            with stripe.lock:
+                old_stripe.sketches, stripe.sketches = stripe.sketches, {}
+        return old
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the JobScheduler class, a timer queue that runs every
+periodic job of the application.
+
+Jobs are kept in a heap ordered by their next run time. The timer thread
+sleeps on one Event until the nearest deadline, so adding, cancelling or
+stopping wakes it immediately. Short jobs run on the timer thread itself;
+jobs scheduled as blocking (network I/O such as SMTP) are handed to a
+second worker thread, so they never delay the other jobs. A blocking job
+that is still queued or running when it is due again skips that run.
+Schedules are either fixed intervals (in seconds) or cron-like expressions
+("minute hour day month weekday").
+"""
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+
+class CronSpec:
+    """
+    Cron-like schedule with five fields: minute, hour, day of month, month
+    and day of week (0 or 7 = Sunday). Each field accepts "*", numbers,
+    ranges ("1-5"), lists ("1,15") and steps ("*/15", "8-18/2"), as well as
+    the aliases @hourly, @daily, @weekly and @monthly.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parses the cron expression.
+
+        Args:
+            expression (str): The cron expression.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        self.expression = expression
+        fields = _ALIASES.get(expression, expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression: '{expression}'")
+
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = {day % 7 for day in _parse_field(fields[4], 0, 7)}
+
+        # Standard cron semantics: if both day fields are restricted, a
+        # day matches when either of them does. A field starting with "*"
+        # (e.g. "*/2") counts as unrestricted, as in Vixie cron.
+        self._any_day = fields[2].startswith("*")
+        self._any_weekday = fields[4].startswith("*")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Computes the first matching minute strictly after the given moment.
+
+        Args:
+            moment (datetime): Reference time (naive, local).
+
+        Returns:
+            datetime: The next matching time.
+
+        Raises:
+            ValueError: If nothing matches within the next five years.
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=5 * 366)
+
+        # Skips whole months, days and hours that cannot match
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = datetime(year, candidate.month % 12 + 1, 1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+class IntervalSpec:
+    """
+    Schedule repeating every fixed number of seconds.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds (float): Interval between runs.
+
+        Raises:
+            ValueError: If the interval is not positive.
+        """
+        if seconds <= 0:
+            raise ValueError("Interval must be positive.")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+
+Spec = Union[CronSpec, IntervalSpec]
+
+
+class _Job:
+    """
+    A scheduled job and its bookkeeping.
+    """
+
+    __slots__ = ("name", "spec", "func", "blocking", "next_run", "cancelled", "busy")
+
+    def __init__(self, name: str, spec: Spec, func: Callable[[], None], blocking: bool):
+        self.name = name
+        self.spec = spec
+        self.func = func
+        self.blocking = blocking
+        self.next_run = spec.next_after(datetime.now())
+        self.cancelled = False
+        # Set while a blocking job waits for or runs on the worker thread
+        self.busy = False
+
+
+class JobScheduler:
+    """
+    Runs recurring jobs from a timer thread, and blocking jobs from a worker
+    thread of their own.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[datetime, int, _Job]] = []
+        self._jobs: Dict[str, _Job] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._blocking: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def schedule(
+        self,
+        name: str,
+        spec: Union[str, float, Spec],
+        func: Callable[[], None],
+        blocking: bool = False,
+    ) -> None:
+        """
+        Registers (or replaces) a recurring job.
+
+        Args:
+            name (str): Unique job name.
+            spec (Union[str, float, Spec]): Cron expression, interval in
+            seconds, or a spec object.
+            func (Callable[[], None]): Function to run.
+            blocking (bool): Whether the job may block (e.g. on the
+            network), in which case it runs on the worker thread.
+        """
+        if isinstance(spec, str):
+            spec = CronSpec(spec)
+        elif isinstance(spec, (int, float)):
+            spec = IntervalSpec(spec)
+
+        job = _Job(name, spec, func, blocking)
+        with self._lock:
+            previous = self._jobs.get(name)
+            if previous is not None:
+                previous.cancelled = True
+            self._jobs[name] = job
+            heapq.heappush(self._heap, (job.next_run, next(self._sequence), job))
+        self._wakeup.set()
+
+    def cancel(self, name: str) -> bool:
+        """
+        Cancels a job. It will not run again, even if already due.
+
+        Args:
+            name (str): Name of the job.
+
+        Returns:
+            bool: True if the job existed.
+        """
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.cancelled = True
+        self._wakeup.set()
+        return True
+
+    def next_run(self, name: str) -> Optional[datetime]:
+        """
+        Args:
+            name (str): Name of the job.
+
+        Returns:
+            Optional[datetime]: When the job runs next, or None if unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(name)
+            return job.next_run if job else None
+
+    @property
+    def jobs(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Names of the scheduled jobs.
+        """
+        with self._lock:
+            return list(self._jobs)
+
+    def start(self) -> None:
+        """
+        Starts the scheduler threads if they are not already running.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_blocking, daemon=True)
+                self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the scheduler threads promptly (a running job is not
+        interrupted, and blocking jobs already handed over still run).
+
+        Args:
+            timeout (float, optional): Seconds to wait for each thread.
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._worker is not None:
+            self._blocking.put(None)
+            self._worker.join(timeout)
+
+    def _next_due(self) -> Tuple[Optional[_Job], Optional[float]]:
+        """
+        Pops the next due job, or returns how long to sleep until one is.
+
+        Returns:
+            Tuple[Optional[_Job], Optional[float]]: The due job (or None) and
+            the seconds until the nearest deadline (None if no jobs).
+        """
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None, None
+
+            delay = (self._heap[0][0] - datetime.now()).total_seconds()
+            if delay > 0:
+                return None, delay
+            return heapq.heappop(self._heap)[2], None
+
+    def _execute(self, job: _Job) -> None:
+        """
+        Runs a job, logging its failure.
+        """
+        try:
+            job.func()
+        except Exception as e:
+            logger.error(f"[Scheduler] Job '{job.name}' failed: {e}")
+        finally:
+            job.busy = False
+
+    def _run_blocking(self) -> None:
+        """
+        Worker loop: runs the blocking jobs handed over by the timer thread,
+        until stopped.
+        """
+        while True:
+            job = self._blocking.get()
+            if job is None:
+                return
+            self._execute(job)
+
+    def _run(self) -> None:
+        """
+        Main loop: sleeps until the nearest deadline, runs due jobs (or
+        hands blocking ones to the worker) and puts them back in the heap
+        with their next run time.
+        """
+        while not self._stop_event.is_set():
+            job, delay = self._next_due()
+            if job is None:
+                self._wakeup.wait(delay)
+                self._wakeup.clear()
+                continue
+
+            if not job.blocking:
+                self._execute(job)
+            elif job.busy:
+                logger.warning(f"[Scheduler] Job '{job.name}' still running, skipped.")
+            else:
+                job.busy = True
+                self._blocking.put(job)
+
+            # Schedule from the planned time, not the finish time, so runs do
+            # not drift; missed runs are skipped rather than replayed.
+            now = datetime.now()
+            next_run = job.spec.next_after(job.next_run)
+            while next_run <= now:
+                next_run = job.spec.next_after(next_run)
+            job.next_run = next_run
+            with self._lock:
+                if not job.cancelled:
+                    heapq.heappush(
+                        self._heap, (job.next_run, next(self._sequence), job)
+                    )
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    """
+    Parses one cron field into the set of values it allows.
+
+    Raises:
+        ValueError: If the field is malformed or out of range.
+    """
+    values: Set[int] = set()
+
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron field '{field}'")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+
+    return values
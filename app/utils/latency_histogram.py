@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the LatencyHistogram class, a fixed-size log-linear
+(HDR-style) histogram of request durations, and RouteLatencies, which
+keeps one histogram per route.
+
+Durations are recorded in microseconds. Each power of two is split into
+16 linear sub-buckets, so any recorded value is known within 1/16 (6.25%)
+of its magnitude, from 1 µs up to about two minutes, in 384 counters per
+histogram. Histograms with the same layout merge by adding their counters,
+which makes them cheap to combine across threads (stripes) and, through
+to_bytes / from_bytes, across worker processes.
+"""
+
+import math
+import struct
+from array import array
+from threading import Lock
+from typing import Dict, Optional
+
+from .thread_stripes import ThreadStripes
+
+_SUB_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BITS
+# Values of 2^(_MAX_EXPONENT + 1) µs (~134 s) and above share the last bucket
+_MAX_EXPONENT = 26
+
+BUCKETS = _SUB_BUCKETS + (_MAX_EXPONENT - _SUB_BITS + 1) * _SUB_BUCKETS
+
+_HEADER = struct.Struct("<QQ")
+
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+
+def _bucket(micros: int) -> int:
+    """
+    Maps a duration to its bucket index.
+    """
+    if micros < _SUB_BUCKETS:
+        return micros
+
+    exponent = micros.bit_length() - 1
+    if exponent > _MAX_EXPONENT:
+        return BUCKETS - 1
+    shift = exponent - _SUB_BITS
+    return shift * _SUB_BUCKETS + (micros >> shift)
+
+
+def _upper_bound(index: int) -> int:
+    """
+    Returns the exclusive upper bound, in microseconds, of a bucket.
+    """
+    if index < _SUB_BUCKETS:
+        return index + 1
+
+    shift = index // _SUB_BUCKETS - 1
+    return (index % _SUB_BUCKETS + _SUB_BUCKETS + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations.
+
+    Attributes:
+        counts (array): Number of durations recorded per bucket.
+        total (int): Sum of the recorded durations, in microseconds.
+        max (int): Longest recorded duration, in microseconds.
+    """
+
+    __slots__ = ("counts", "total", "max")
+
+    def __init__(
+        self, counts: Optional[array] = None, total: int = 0, maximum: int = 0
+    ):
+        """
+        Initializes the histogram (empty unless counters are given).
+
+        Args:
+            counts (array, optional): Bucket counters to start from.
+            total (int): Sum of the durations already counted.
+            maximum (int): Longest duration already counted.
+        """
+        self.counts = counts if counts is not None else array("Q", [0]) * BUCKETS
+        self.total = total
+        self.max = maximum
+
+    def record(self, seconds: float) -> None:
+        """
+        Records one duration.
+
+        Args:
+            seconds (float): The duration, in seconds.
+        """
+        micros = int(seconds * 1_000_000)
+        self.counts[_bucket(micros)] += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the durations of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): Histogram to merge in.
+        """
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def count(self) -> int:
+        """
+        Returns:
+            int: Number of durations recorded.
+        """
+        return sum(self.counts)
+
+    def percentiles(self, quantiles: Dict[str, float]) -> Dict[str, float]:
+        """
+        Estimates several quantiles in a single pass over the buckets.
+        Each estimate is the upper bound of the bucket holding that rank,
+        capped at the recorded maximum.
+
+        Args:
+            quantiles (Dict[str, float]): Quantiles by name (e.g. {"p99": 0.99}).
+
+        Returns:
+            Dict[str, float]: The estimates, in milliseconds (0 if empty).
+        """
+        count = self.count
+        results = {name: 0.0 for name in quantiles}
+        if not count:
+            return results
+
+        # Ranks are 1-based: the p-quantile is the ceil(p * count)-th value
+        pending = sorted(
+            (max(1, math.ceil(quantile * count)), name)
+            for name, quantile in quantiles.items()
+        )
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while pending and pending[0][0] <= seen:
+                _, name = pending.pop(0)
+                results[name] = min(_upper_bound(index), self.max) / 1000
+            if not pending:
+                break
+        return results
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: Request count, then the p50, p95, p99, max
+            and mean durations in milliseconds.
+        """
+        count = self.count
+        return {
+            "count": count,
+            **self.percentiles(PERCENTILES),
+            "max": self.max / 1000,
+            "mean": round(self.total / count / 1000, 3) if count else 0.0,
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the histogram (e.g. to merge it in another process).
+
+        Returns:
+            bytes: The total, maximum and bucket counters.
+        """
+        return _HEADER.pack(self.total, self.max) + self.counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencyHistogram":
+        """
+        Rebuilds a histogram serialized by to_bytes.
+
+        Args:
+            data (bytes): The serialized histogram.
+
+        Returns:
+            LatencyHistogram: The histogram.
+
+        Raises:
+            ValueError: If the data does not match the bucket layout.
+        """
+        if len(data) != _HEADER.size + BUCKETS * 8:
+            raise ValueError("Serialized histogram has the wrong size.")
+
+        total, longest = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        counts = array("Q")
+        counts.frombytes(data[offset:])
+        return cls(counts, total, longest)
+
+
+class _LatencyStripe:
+    """
+    One stripe of RouteLatencies: a lock and the histograms it guards.
+    """
+
+    __slots__ = ("lock", "histograms")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+
+class RouteLatencies:
+    """
+    Per-route latency histograms, striped across threads.
+    """
+
+    def __init__(self, stripes: int = 1):
+        """
+        Initializes the histograms.
+
+        Args:
+            stripes (int): Number of independently locked stripes.
+        """
+        self._stripes: ThreadStripes[_LatencyStripe] = ThreadStripes(
+            _LatencyStripe, stripes
+        )
+
+    def record(self, route: str, seconds: float) -> None:
+        """
+        Records the duration of one request.
+
+        Args:
+            route (str): The URL rule of the request (e.g. "/stats").
+            seconds (float): The duration, in seconds.
+        """
+        stripe = self._stripes.local()
+
+        with stripe.lock:
+            histogram = stripe.histograms.get(route)
+            if histogram is None:
+                histogram = stripe.histograms[route] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        """
+        Returns:
+            Dict[str, LatencyHistogram]: Per-route histograms merged across
+            stripes.
+        """
+        merged: Dict[str, LatencyHistogram] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for route, histogram in stripe.histograms.items():
+                    merged.setdefault(route, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def summaries(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            Dict[str, Dict[str, float]]: Count, percentiles, maximum and
+            mean duration (ms) per route.
+        """
+        return {route: h.summary() for route, h in self.histograms().items()}
+
+    def reset(self) -> None:
+        """
+        Clears all histograms.
+        """
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.histograms = {}
+
+    def swap(self) -> "RouteLatencies":
+        """
+        Replaces the histograms with empty ones, handing the old histograms
+        over in a detached instance.
+
+        Returns:
+            RouteLatencies: Instance holding the replaced histograms.
+        """
+        old = RouteLatencies(len(self._stripes))
+        for stripe, old_stripe in zip(self._stripes, old._stripes):
+            with stripe.lock:
+                old_stripe.histograms, stripe.histograms = stripe.histograms, {}
+        return old
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the Components class, a small registry that builds the
+application components (visit tracker, report scheduler, services...) on
+first use instead of at import time.
+
+Each component is registered under a name together with a factory that
+receives the registry, so a factory resolves its own dependencies through
+it. A component is built at most once, under a lock; later lookups are a
+dictionary read. Registering an instance instead of a factory replaces the
+component, which is how an AppFactory configuration (or a test) swaps in
+its own tracker or scheduler. A registry created from another one
+starts with its factories, but builds its own instances.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+EXTENSION_NAME = "components"
+
+Factory = Callable[["Components"], Any]
+
+# Marks components that are registered but not built yet (None is a valid
+# component, e.g. a disabled history)
+_UNBUILT = object()
+
+
+class Components:
+    """
+    Registry of lazily built application components.
+    """
+
+    def __init__(self, base: Optional["Components"] = None):
+        """
+        Initializes the registry.
+
+        Args:
+            base (Components, optional): Registry whose factories (and
+            provided instances) are copied. If None, the registry is empty.
+        """
+        self._factories: Dict[str, Factory] = {}
+        self._instances: Dict[str, Any] = {}
+        if base is not None:
+            with base._lock:
+                self._factories.update(base._factories)
+                self._instances.update(
+                    (name, instance)
+                    for name, instance in base._instances.items()
+                    if name not in base._factories
+                )
+        # Reentrant, as factories look up their dependencies while building
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories or name in self._instances
+
+    def register(self, name: str, factory: Factory) -> None:
+        """
+        Registers the factory of a component, discarding any instance
+        already built under that name.
+
+        Args:
+            name (str): Component name (e.g. "visit_tracker").
+            factory (Factory): Callable building the component from the
+            registry.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def provide(self, name: str, instance: Any) -> None:
+        """
+        Registers a ready-built component.
+
+        Args:
+            name (str): Component name.
+            instance (Any): The component.
+        """
+        with self._lock:
+            self._factories.pop(name, None)
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        """
+        Returns a component, building it on first use.
+
+        Args:
+            name (str): Component name.
+
+        Returns:
+            Any: The component.
+
+        Raises:
+            KeyError: If no component is registered under that name.
+        """
+        instance = self._instances.get(name, _UNBUILT)
+        if instance is not _UNBUILT:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name, _UNBUILT)
+            if instance is _UNBUILT:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown component: '{name}'")
+                instance = self._factories[name](self)
+                self._instances[name] = instance
+            return instance
+
+    def built(self, name: str) -> bool:
+        """
+        Checks whether a component was already built (or provided).
+
+        Args:
+            name (str): Component name.
+
+        Returns:
+            bool: True if a lookup would not build anything.
+        """
+        return name in self._instances
@@ -3,30 +3,44 @@
 @Author: Eric Santos <ericshantos13@gmail.com>
 
 This module defines the ReportScheduler class, which automates the daily sending
-of visit reports using a separate background thread.
-
-The scheduler calculates the wait time until the next scheduled report,
-sends the report via an EmailReporter, and resets the visit data afterward.
+of visit reports using the application's JobScheduler.
+
+The report runs as a recurring job at the configured time of day; it swaps in
+fresh visit counters and sends the previous generation via an EmailReporter. Other
+periodic work can be registered on the same JobScheduler through `jobs`; when a
+VisitHistory is given, its flushes run there too, off the request path, and
+the reporter's open SMTP sessions are kept alive with a periodic NOOP. These
+jobs wait on SMTP or disk, so they are scheduled as blocking: they run in
+order on the JobScheduler's worker thread, and never delay the short jobs
+of its timer thread (e.g. the live feed sampler).
 """
 
 import logging
-import threading
-import time as time_module
-from datetime import datetime, time, timedelta
-from typing import Optional
+from datetime import datetime, time
+from typing import Dict, Optional
 
+from ..models import VisitSnapshot
 from .email_reporter import EmailReporter
+from .job_scheduler import JobScheduler
+from .visit_history import VisitHistory
 from .visit_tracker import VisitTracker
 
 logger = logging.getLogger(__name__)
 
+REPORT_JOB = "daily-report"
+HISTORY_JOB = "visit-history"
+KEEPALIVE_JOB = "smtp-keepalive"
+
+# Days of history charted in the daily report
+REPORT_HISTORY_DAYS = 7
+
 
 class ReportScheduler:
     """
     A scheduler responsible for sending daily visit reports at a specified time.
 
-    This class runs a background thread that waits until the scheduled time,
-    triggers the report generation, and clears the visit data afterward.
+    The report is a recurring job of a JobScheduler, whose single background
+    thread also serves any other periodic job registered on `jobs`.
     """
 
     def __init__(
@@ -34,6 +48,9 @@ class ReportScheduler:
         visit_tracker: VisitTracker,
         report_time: time = time(18, 0),
         reporter: Optional[EmailReporter] = None,
+        jobs: Optional[JobScheduler] = None,
+        history: Optional[VisitHistory] = None,
+        keepalive_interval: Optional[float] = 120.0,
     ):
         """
         Initializes the report scheduler.
@@ -43,63 +60,120 @@ class ReportScheduler:
             report_time (datetime.time): Time of day to send the report (default is 18:00).
             reporter (EmailReporter, optional): Instance responsible for sending the report.
             If None, a default EmailReporter is created.
+            jobs (JobScheduler, optional): Timer queue running the report job.
+            If None, a new JobScheduler is created.
+            history (VisitHistory, optional): Store the counters are flushed
+            to periodically. If None, no history is kept.
+            keepalive_interval (float, optional): Seconds between NOOPs on the
+            reporter's open SMTP sessions. If None, idle sessions are only
+            probed before the next send.
         """
         self.visit_tracker = visit_tracker
         self.report_time = report_time
         self.report_sender = reporter or EmailReporter()
-        self.thread = threading.Thread(target=self._run, daemon=True)
-        self._stop_event = threading.Event()
+        self.jobs = jobs or JobScheduler()
+        self.history = history
+        self.last_report: Optional[datetime] = None
+        self.jobs.schedule(
+            REPORT_JOB,
+            f"{report_time.minute} {report_time.hour} * * *",
+            self._run,
+            blocking=True,
+        )
+        if history is not None:
+            self.jobs.schedule(
+                HISTORY_JOB, history.flush_interval, self._flush_history, blocking=True
+            )
+        if keepalive_interval:
+            self.jobs.schedule(
+                KEEPALIVE_JOB,
+                keepalive_interval,
+                self.report_sender.keepalive,
+                blocking=True,
+            )
 
     def start(self) -> None:
         """
         Starts the scheduler in a background daemon thread if not already running.
         """
-        if not self.thread.is_alive():
-            self.thread.start()
+        self.report_sender.start()
+        self.jobs.start()
+        logger.info(f"[Scheduler] Next report at {self.next_report}.")
 
-    def _calculate_wait_seconds(self) -> float:
+    def stop(self) -> None:
         """
-        Calculates the number of seconds to wait until the next report time.
+        Stops the scheduler thread immediately, flushing the history.
+        """
+        self.jobs.stop()
+        if self.history is not None:
+            self._flush_history()
 
+    @property
+    def next_report(self) -> Optional[datetime]:
+        """
         Returns:
-            float: Time to wait in seconds until the next scheduled report.
+            Optional[datetime]: When the next report is due.
         """
-        now = datetime.now()
-        target = datetime.combine(now.date(), self.report_time)
-
-        # If the target time today has already passed, schedule for tomorrow
-        if now > target:
-            target += timedelta(days=1)
+        return self.jobs.next_run(REPORT_JOB)
 
-        return (target - now).total_seconds()
+    def _flush_history(self) -> None:
+        """
+        History job: records the visits counted since the last flush.
+        """
+        # With a store shared between workers, only the reporter records it
+        if self.visit_tracker.is_reporter:
+            self.history.flush()
 
     def _run(self) -> None:
         """
-        Main loop that waits until the scheduled time, sends the report,
-        and resets the visit data. The loop repeats daily unless interrupted.
+        Report job: sends the report and resets the visit data.
         """
-        while True:
-            wait_seconds = self._calculate_wait_seconds()
-            logger.info(
-                f"[Scheduler] Next report at {self.report_time.strftime('%H:%M')}. Waiting {wait_seconds:.0f} seconds..."
-            )
-            time_module.sleep(wait_seconds)
-
-            self._send_report()
-            self.visit_tracker._reset_data()
+        # With a store shared between workers, only one process reports
+        if not self.visit_tracker.is_reporter:
+            return
+
+        snapshot = self.visit_tracker.snapshot_and_reset()
+        self.last_report = snapshot.taken_at
+        if self.history is not None:
+            try:
+                self.history.close_generation(snapshot)
+            except Exception as e:
+                logger.error(f"[Scheduler] Failed to record visit history: {e}")
+        self._send_report(snapshot)
+
+    def _recent_history(self) -> Dict[str, int]:
+        """
+        Reads the visits of the last days for the report.
 
-            if self._stop_event.wait(timeout=wait_seconds):
-                break
+        Returns:
+            Dict[str, int]: Visits per day, empty without a history.
+        """
+        if self.history is None:
+            return {}
+        try:
+            return self.history.recent_days(REPORT_HISTORY_DAYS)
+        except Exception as e:
+            logger.error(f"[Scheduler] Failed to read visit history: {e}")
+            return {}
 
-    def _send_report(self) -> None:
+    def _send_report(self, snapshot: VisitSnapshot) -> None:
         """
         Attempts to send the visit report using the configured EmailReporter.
         Logs any exceptions encountered.
+
+        Args:
+            snapshot (VisitSnapshot): Counters of the generation to report.
         """
         try:
             logger.info("[Scheduler] Sending report...")
             self.report_sender.send(
-                self.visit_tracker.total_accesses, self.visit_tracker.visit_log
+                snapshot.total,
+                snapshot.hourly,
+                snapshot.endpoints,
+                uniques=snapshot.uniques,
+                unique_count=snapshot.unique_total,
+                history=self._recent_history(),
+                latencies=snapshot.latencies,
             )
         except Exception as e:
             logger.error(f"[Scheduler] Failed to send report: {e}")
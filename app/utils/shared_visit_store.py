@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the SharedMemoryVisitStore, a visit store backed by a
+memory-mapped file so that every pre-forked worker of a gunicorn
+deployment counts into the same place.
+
+File layout (all integers little-endian):
+    - header: magic, number of worker rows, endpoint capacity,
+      number of registered endpoints and the baseline total.
+    - names: fixed-size slots holding the endpoint names.
+    - baseline: per-endpoint counts captured at the last reset.
+    - rows: one row per worker process (pid, total, per-endpoint counts).
+
+Each process only ever writes its own row, so increments need no
+cross-process lock. Readers sum all rows and subtract the baseline, which
+also makes reset a matter of moving the baseline forward. Registering a new
+endpoint or claiming a row is rare and serialized with flock.
+
+POSIX only (relies on fcntl).
+"""
+
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import weakref
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .visit_stores import VisitStore
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"NSVISIT1"
+_HEADER = struct.Struct("<8sIIIxxxxq")
+_COUNT = struct.Struct("<q")
+_ROW_HEADER = struct.Struct("<qq")
+_NAME_SIZE = 64
+
+OVERFLOW_ENDPOINT = "other"
+
+
+class SharedMemoryVisitStore(VisitStore):
+    """
+    Visit store shared by all worker processes through an mmap-backed file.
+
+    Attributes:
+        path (str): Location of the backing file (e.g. under /dev/shm).
+        max_workers (int): Number of worker rows in the file.
+        max_endpoints (int): Maximum number of distinct endpoints. The
+        last slot is reserved for the overflow endpoint "other".
+    """
+
+    shared = True
+
+    def __init__(self, path: str, max_workers: int = 64, max_endpoints: int = 256):
+        """
+        Opens (or creates) the shared counter file.
+
+        Args:
+            path (str): Path of the backing file.
+            max_workers (int): Worker rows to allocate when creating the file.
+            max_endpoints (int): Endpoint capacity when creating the file.
+
+        Raises:
+            ValueError: If the file exists but is not a visit counter file.
+        """
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                self._create(max_workers, max_endpoints)
+
+            header = os.pread(self._fd, _HEADER.size, 0)
+            magic, self.max_workers, self.max_endpoints, _, _ = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"'{path}' is not a shared visit counter file.")
+
+            self._mm = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._names_offset = _HEADER.size
+        self._baseline_offset = self._names_offset + self.max_endpoints * _NAME_SIZE
+        self._rows_offset = self._baseline_offset + self.max_endpoints * _COUNT.size
+        self._row_size = _ROW_HEADER.size + self.max_endpoints * _COUNT.size
+
+        self._fd_pid = os.getpid()
+        self._meta_lock = Lock()
+        self._indexes: Dict[str, int] = {}
+        self._pid: Optional[int] = None
+        self._row_offset = 0
+        self._lock = Lock()
+        self._reporter_fd: Optional[int] = None
+        self._reporter_pid: Optional[int] = None
+        self._reporter_fd_pid: Optional[int] = None
+
+        # Locks held by other threads at fork time would stay locked forever
+        # in the child; the hook runs before the child has other threads
+        os.register_at_fork(after_in_child=_after_fork_hook(weakref.ref(self)))
+
+    def _after_fork(self) -> None:
+        """
+        Gives a forked child its own thread locks.
+        """
+        self._meta_lock = Lock()
+        self._lock = Lock()
+
+    def _create(self, max_workers: int, max_endpoints: int) -> None:
+        """
+        Writes the header and sizes a freshly created file.
+        """
+        tables = max_endpoints * (_NAME_SIZE + _COUNT.size)
+        rows = max_workers * (_ROW_HEADER.size + max_endpoints * _COUNT.size)
+        os.ftruncate(self._fd, _HEADER.size + tables + rows)
+        os.pwrite(self._fd, _HEADER.pack(_MAGIC, max_workers, max_endpoints, 0, 0), 0)
+
+    def _locked(self) -> "_FileLock":
+        """
+        Returns a guard serializing metadata changes across threads and
+        processes. flock is tied to the open file description, which a
+        forked child shares with its parent, so the file is reopened once
+        per process before locking.
+        """
+        pid = os.getpid()
+        if self._fd_pid != pid:
+            with self._meta_lock:
+                if self._fd_pid != pid:
+                    self._fd = os.open(self.path, os.O_RDWR)
+                    self._fd_pid = pid
+        return _FileLock(self._fd, self._meta_lock)
+
+    def _ensure_row(self) -> None:
+        """
+        Claims a worker row for the current process. Runs again after a
+        fork, since the child must not share the parent's row.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._locked():
+            row = self._find_row(pid)
+            self._row_offset = self._rows_offset + row * self._row_size
+            _ROW_HEADER.pack_into(
+                self._mm,
+                self._row_offset,
+                pid,
+                _ROW_HEADER.unpack_from(self._mm, self._row_offset)[1],
+            )
+        self._pid = pid
+
+    def _find_row(self, pid: int) -> int:
+        """
+        Finds a free row, preferring empty rows and falling back to rows
+        whose process has exited. Counts already in a reused row are kept.
+        """
+        dead: List[int] = []
+        for row in range(self.max_workers):
+            owner, _ = _ROW_HEADER.unpack_from(
+                self._mm, self._rows_offset + row * self._row_size
+            )
+            if owner in (0, pid):
+                return row
+            if not _is_alive(owner):
+                dead.append(row)
+
+        if dead:
+            return dead[0]
+        raise RuntimeError("No free worker rows left in the shared visit counter.")
+
+    def _index(self, endpoint: str) -> int:
+        """
+        Returns the slot of an endpoint, registering it if needed.
+        """
+        index = self._indexes.get(endpoint)
+        if index is not None:
+            return index
+
+        name = _fit_name(endpoint)
+        with self._locked():
+            self._load_names()
+            index = self._indexes.get(name)
+            if index is None:
+                index = self._register(name)
+        self._indexes[endpoint] = index
+        return index
+
+    def _register(self, endpoint: str) -> int:
+        """
+        Appends a new endpoint name (already fitted to the slot size).
+        Must be called with the file locked.
+        """
+        registered = self._registered()
+        if registered >= self.max_endpoints - 1:
+            logger.warning(
+                f"Shared visit counter full; counting '{endpoint}' as '{OVERFLOW_ENDPOINT}'"
+            )
+            return self.max_endpoints - 1
+
+        encoded = endpoint.encode("utf-8")
+        slot = bytes([len(encoded)]) + encoded.ljust(_NAME_SIZE - 1, b"\0")
+        start = self._names_offset + registered * _NAME_SIZE
+        end = start + _NAME_SIZE
+        self._mm[start:end] = slot
+        self._set_registered(registered + 1)
+        return registered
+
+    def _registered(self) -> int:
+        return _HEADER.unpack_from(self._mm, 0)[3]
+
+    def _set_registered(self, registered: int) -> None:
+        magic, workers, endpoints, _, baseline = _HEADER.unpack_from(self._mm, 0)
+        _HEADER.pack_into(self._mm, 0, magic, workers, endpoints, registered, baseline)
+
+    def _load_names(self) -> List[str]:
+        """
+        Refreshes the local name cache from the file.
+
+        Returns:
+            List[str]: Registered endpoint names ordered by slot.
+        """
+        names = []
+        for index in range(self._registered()):
+            start = self._names_offset + index * _NAME_SIZE + 1
+            end = start + self._mm[start - 1]
+            names.append(self._mm[start:end].decode("utf-8", "replace"))
+        for index, name in enumerate(names):
+            self._indexes.setdefault(name, index)
+        return names
+
+    def _column_sums(self) -> List[int]:
+        """
+        Sums every worker row, minus the baseline, per endpoint slot.
+        """
+        fmt = f"<{self.max_endpoints}q"
+        sums = [0] * self.max_endpoints
+        for row in range(self.max_workers):
+            offset = self._rows_offset + row * self._row_size
+            if _ROW_HEADER.unpack_from(self._mm, offset)[0] == 0:
+                continue
+            row_counts = struct.unpack_from(fmt, self._mm, offset + _ROW_HEADER.size)
+            sums = [a + b for a, b in zip(sums, row_counts)]
+
+        baseline = struct.unpack_from(fmt, self._mm, self._baseline_offset)
+        return [a - b for a, b in zip(sums, baseline)]
+
+    def _raw_total(self) -> int:
+        total = 0
+        for row in range(self.max_workers):
+            pid, row_total = _ROW_HEADER.unpack_from(
+                self._mm, self._rows_offset + row * self._row_size
+            )
+            if pid:
+                total += row_total
+        return total
+
+    def add(self, endpoint: str, count: int = 1) -> None:
+        self._ensure_row()
+        offset = self._row_offset + _ROW_HEADER.size + self._index(endpoint) * 8
+
+        with self._lock:
+            pid, total = _ROW_HEADER.unpack_from(self._mm, self._row_offset)
+            _ROW_HEADER.pack_into(self._mm, self._row_offset, pid, total + count)
+            (visits,) = _COUNT.unpack_from(self._mm, offset)
+            _COUNT.pack_into(self._mm, offset, visits + count)
+
+    def add_many(self, counts: Dict[str, int]) -> None:
+        self._ensure_row()
+        offsets = [
+            (self._row_offset + _ROW_HEADER.size + self._index(endpoint) * 8, count)
+            for endpoint, count in counts.items()
+        ]
+
+        with self._lock:
+            pid, total = _ROW_HEADER.unpack_from(self._mm, self._row_offset)
+            _ROW_HEADER.pack_into(
+                self._mm, self._row_offset, pid, total + sum(counts.values())
+            )
+            for offset, count in offsets:
+                (visits,) = _COUNT.unpack_from(self._mm, offset)
+                _COUNT.pack_into(self._mm, offset, visits + count)
+
+    def get(self, endpoint: str) -> int:
+        return self.counts().get(endpoint, 0)
+
+    def total(self) -> int:
+        return self._raw_total() - _HEADER.unpack_from(self._mm, 0)[4]
+
+    def counts(self) -> Dict[str, int]:
+        return self._named_counts(self._load_names(), self._column_sums())
+
+    @staticmethod
+    def _named_counts(names: List[str], sums: List[int]) -> Dict[str, int]:
+        counts = {name: sums[i] for i, name in enumerate(names) if sums[i]}
+
+        if sums[-1]:
+            counts[OVERFLOW_ENDPOINT] = counts.get(OVERFLOW_ENDPOINT, 0) + sums[-1]
+        return counts
+
+    def reset(self) -> None:
+        self.swap()
+
+    def swap(self) -> Tuple[int, Dict[str, int]]:
+        """
+        Moves the baseline forward by the counts it returns. Rows are never
+        zeroed, so increments landing meanwhile simply show up in the next
+        generation.
+        """
+        with self._locked():
+            names = self._load_names()
+            sums = self._column_sums()
+            fmt = f"<{self.max_endpoints}q"
+            baseline = struct.unpack_from(fmt, self._mm, self._baseline_offset)
+            struct.pack_into(
+                fmt,
+                self._mm,
+                self._baseline_offset,
+                *[a + b for a, b in zip(sums, baseline)],
+            )
+
+            magic, workers, endpoints, registered, total = _HEADER.unpack_from(
+                self._mm, 0
+            )
+            _HEADER.pack_into(
+                self._mm, 0, magic, workers, endpoints, registered, total + sum(sums)
+            )
+
+        return sum(sums), self._named_counts(names, sums)
+
+    @property
+    def is_reporter(self) -> bool:
+        """
+        Elects a single reporting process through a non-blocking flock on a
+        sidecar file. The election is retried until one process holds it.
+
+        Returns:
+            bool: True if this process should send the shared report.
+        """
+        pid = os.getpid()
+        if self._reporter_pid == pid:
+            return True
+
+        # A descriptor inherited across fork would share the parent's lock
+        if self._reporter_fd is None or self._reporter_fd_pid != pid:
+            self._reporter_fd_pid = pid
+            self._reporter_fd = os.open(
+                f"{self.path}.reporter", os.O_RDWR | os.O_CREAT, 0o600
+            )
+        try:
+            fcntl.flock(self._reporter_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+
+        self._reporter_pid = pid
+        return True
+
+
+class _FileLock:
+    """
+    Context manager holding a thread lock and an exclusive flock on a
+    file descriptor (flock alone does not exclude threads of one process).
+    """
+
+    def __init__(self, fd: int, lock: Lock):
+        self._fd = fd
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+
+def _fit_name(endpoint: str) -> str:
+    """
+    Truncates an endpoint name to what fits in a name slot, without
+    splitting multi-byte characters.
+    """
+    encoded = endpoint.encode("utf-8")[: _NAME_SIZE - 1]
+    return encoded.decode("utf-8", "ignore")
+
+
+def _after_fork_hook(
+    store: "weakref.ReferenceType[SharedMemoryVisitStore]",
+) -> Callable[[], None]:
+    """
+    Builds the fork hook of a store, holding it weakly so the hook does not
+    keep a discarded store alive.
+    """
+
+    def hook() -> None:
+        instance = store()
+        if instance is not None:
+            instance._after_fork()
+
+    return hook
+
+
+def _is_alive(pid: int) -> bool:
+    """
+    Checks whether a process with the given pid still exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the ThreadStripes class, a small helper that spreads
+mutable state across several independent stripes so that concurrent
+threads rarely touch the same lock.
+
+Each thread is pinned to one stripe the first time it asks for one, and
+stripes are handed out round-robin, so with at least as many stripes as
+worker threads every writer ends up with an uncontended lock.
+"""
+
+import threading
+from itertools import count
+from typing import Callable, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+class ThreadStripes(Generic[T]):
+    """
+    Fixed collection of stripe objects with a per-thread affinity.
+
+    Attributes:
+        _stripes (List[T]): The stripe objects, created once at startup.
+        _local (threading.local): Per-thread cache of the assigned stripe.
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int):
+        """
+        Initializes the stripes.
+
+        Args:
+            factory (Callable[[], T]): Callable used to build each stripe.
+            size (int): Number of stripes to create (at least 1).
+        """
+        if size < 1:
+            raise ValueError("ThreadStripes requires at least one stripe.")
+
+        self._stripes: List[T] = [factory() for _ in range(size)]
+        self._next = count()
+        self._local = threading.local()
+
+    def local(self) -> T:
+        """
+        Returns the stripe assigned to the calling thread, assigning
+        one on first use.
+
+        Returns:
+            T: The stripe owned by the current thread.
+        """
+        try:
+            return self._local.stripe
+        except AttributeError:
+            # itertools.count is advanced atomically under the GIL
+            stripe = self._stripes[next(self._next) % len(self._stripes)]
+            self._local.stripe = stripe
+            return stripe
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._stripes)
+
+    def __len__(self) -> int:
+        return len(self._stripes)
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the VisitFeed class, which pushes live visit-rate
+updates to Server-Sent Events subscribers.
+
+An interval job of the application's JobScheduler samples the tracker
+while anyone is subscribed (it is cancelled when the last subscriber
+leaves), so the request path of VisitTracker.log_visit is untouched and no
+thread is dedicated to the feed: increments are
+coalesced into one delta per interval, encoded once as an SSE frame and
+appended to every subscriber's buffer. Buffers are bounded deques that drop
+their oldest frames, so a slow client only loses updates; it never blocks
+the sampler nor grows memory.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional
+
+from .job_scheduler import JobScheduler
+from .visit_tracker import VisitTracker
+
+logger = logging.getLogger(__name__)
+
+_RETRY_FRAME = b"retry: 3000\n\n"
+_HEARTBEAT_FRAME = b": keepalive\n\n"
+
+FEED_JOB = "visit-feed"
+
+
+class FeedFullError(Exception):
+    """
+    Raised when the feed already has its maximum number of subscribers.
+    """
+
+
+class _Subscriber:
+    """
+    Bounded frame buffer of one connected client.
+    """
+
+    __slots__ = ("frames",)
+
+    def __init__(self, buffer_size: int):
+        self.frames: Deque[bytes] = deque(maxlen=buffer_size)
+
+
+class VisitFeed:
+    """
+    Fans periodic visit deltas out to SSE subscribers.
+
+    Attributes:
+        visit_tracker (VisitTracker): Tracker sampled by the feed.
+        interval (float): Seconds between samples (and frames).
+        buffer_size (int): Frames buffered per subscriber before the oldest
+        are dropped.
+        max_subscribers (int): Maximum number of concurrent subscribers.
+        heartbeat (float): Seconds of silence after which a comment frame
+        is sent to keep idle connections open.
+        jobs (JobScheduler): Timer queue running the sampler job.
+    """
+
+    def __init__(
+        self,
+        visit_tracker: VisitTracker,
+        interval: float = 1.0,
+        buffer_size: int = 32,
+        max_subscribers: int = 500,
+        heartbeat: float = 15.0,
+        jobs: Optional[JobScheduler] = None,
+    ):
+        """
+        Initializes the feed (the sampler is scheduled with the first
+        subscriber).
+
+        Args:
+            visit_tracker (VisitTracker): Tracker sampled by the feed.
+            interval (float): Seconds between samples.
+            buffer_size (int): Frames buffered per subscriber.
+            max_subscribers (int): Maximum number of concurrent subscribers.
+            heartbeat (float): Seconds between keep-alive comments.
+            jobs (JobScheduler, optional): Timer queue running the sampler,
+            e.g. the report scheduler's. If None, the feed creates one.
+            Either way, it is started with the first subscriber if it is
+            not running yet.
+        """
+        self.visit_tracker = visit_tracker
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self.jobs = jobs or JobScheduler()
+
+        self._subscribers: List[_Subscriber] = []
+        self._condition = threading.Condition()
+        self._dropped = 0
+
+        self._generation = visit_tracker.generation
+        self._total = visit_tracker.total_accesses
+        self._endpoints: Optional[Dict[str, int]] = None
+
+    @property
+    def subscribers(self) -> int:
+        """
+        Returns:
+            int: Number of connected subscribers.
+        """
+        with self._condition:
+            return len(self._subscribers)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Returns:
+            int: Frames dropped from full subscriber buffers so far.
+        """
+        with self._condition:
+            return self._dropped
+
+    def subscribe(self) -> Iterator[bytes]:
+        """
+        Registers a subscriber and returns its SSE byte stream. The
+        subscriber is removed when the stream is closed.
+
+        Returns:
+            Iterator[bytes]: SSE frames for the client.
+
+        Raises:
+            FeedFullError: If max_subscribers are already connected.
+        """
+        subscriber = _Subscriber(self.buffer_size)
+        with self._condition:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise FeedFullError("Too many stream subscribers.")
+            self._subscribers.append(subscriber)
+            if len(self._subscribers) == 1:
+                # The first sample after a pause only sets the baseline
+                self._endpoints = None
+                self.jobs.schedule(FEED_JOB, self.interval, self._tick)
+
+        # The app may not have started the shared scheduler
+        self.jobs.start()
+        return self._stream(subscriber)
+
+    def _stream(self, subscriber: _Subscriber) -> Iterator[bytes]:
+        try:
+            yield _RETRY_FRAME
+            while True:
+                with self._condition:
+                    if not subscriber.frames:
+                        self._condition.wait(self.heartbeat)
+                    frames = b"".join(subscriber.frames)
+                    subscriber.frames.clear()
+                yield frames or _HEARTBEAT_FRAME
+        finally:
+            with self._condition:
+                self._subscribers.remove(subscriber)
+                if not self._subscribers:
+                    self.jobs.cancel(FEED_JOB)
+
+    def _tick(self) -> None:
+        """
+        Sampler job: one delta frame per interval while anyone listens.
+        """
+        try:
+            frame = self._sample()
+        except Exception as e:
+            logger.error(f"[Feed] Sampling failed: {e}")
+            return
+
+        if frame is not None:
+            self._publish(frame)
+
+    def _sample(self) -> Optional[bytes]:
+        """
+        Computes the visits since the previous sample.
+
+        Returns:
+            Optional[bytes]: The encoded SSE frame, or None when there were
+            no visits (or nobody is listening).
+        """
+        tracker = self.visit_tracker
+        generation, total = tracker.generation, tracker.total_accesses
+        reset = generation != self._generation or total < self._total
+
+        if not self.subscribers:
+            # Nobody listens: skip the per-endpoint copy and let the next
+            # subscriber start from a fresh baseline
+            self._generation, self._total, self._endpoints = generation, total, None
+            return None
+        if total == self._total and not reset and self._endpoints is not None:
+            return None
+
+        # The per-endpoint copy is only paid when something changed
+        endpoints = tracker.visit_log
+        previous, previous_total = self._endpoints, self._total
+        self._generation, self._total, self._endpoints = generation, total, endpoints
+        if previous is None:
+            return None
+        if reset:
+            previous, previous_total = {}, 0
+
+        delta = {
+            endpoint: count - previous.get(endpoint, 0)
+            for endpoint, count in endpoints.items()
+            if count != previous.get(endpoint, 0)
+        }
+        visits = total - previous_total
+
+        payload = {
+            "time": round(time.time(), 3),
+            "interval": self.interval,
+            "generation": generation,
+            "total": total,
+            "visits": visits,
+            "rate": round(visits / self.interval, 3),
+            "endpoints": delta,
+            "reset": reset,
+        }
+        data = json.dumps(payload, separators=(",", ":"))
+        return f"event: visits\ndata: {data}\n\n".encode("utf-8")
+
+    def _publish(self, frame: bytes) -> None:
+        """
+        Appends one frame to every subscriber buffer and wakes the streams.
+        """
+        with self._condition:
+            for subscriber in self._subscribers:
+                if len(subscriber.frames) == self.buffer_size:
+                    self._dropped += 1
+                subscriber.frames.append(frame)
+            self._condition.notify_all()
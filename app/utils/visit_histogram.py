@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the VisitHistogram class, which keeps the time
+distribution of visits as per-minute buckets without storing raw events.
+
+Each endpoint owns a ring buffer of minute buckets preallocated as an
+array, so recording a visit never allocates: it only clears the buckets
+the clock moved past and increments one slot. Hourly rollups for the daily
+report are derived from the rings on read.
+"""
+
+import time
+from array import array
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .thread_stripes import ThreadStripes
+
+OVERFLOW_ENDPOINT = "other"
+
+
+class _MinuteRing:
+    """
+    Fixed-size ring of per-minute visit counters for one endpoint.
+    """
+
+    __slots__ = ("buckets", "last_minute")
+
+    def __init__(self, size: int):
+        self.buckets = array("I", bytes(4 * size))
+        self.last_minute = -1
+
+    def add(self, minute: int, count: int) -> None:
+        size = len(self.buckets)
+
+        if minute > self.last_minute:
+            # Clear, in place, the buckets the clock moved past since the
+            # last visit (a fresh ring is already zeroed)
+            if self.last_minute >= 0:
+                start = max(self.last_minute + 1, minute - size + 1)
+                for skipped in range(start, minute + 1):
+                    self.buckets[skipped % size] = 0
+            self.last_minute = minute
+        elif minute <= self.last_minute - size:
+            return
+
+        self.buckets[minute % size] += count
+
+    def count(self, minute: int) -> int:
+        size = len(self.buckets)
+        if minute > self.last_minute or minute <= self.last_minute - size:
+            return 0
+        return self.buckets[minute % size]
+
+
+class _HistogramStripe:
+    """
+    One stripe of a VisitHistogram: a lock and the rings it guards.
+    """
+
+    __slots__ = ("lock", "rings")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.rings: Dict[str, _MinuteRing] = {}
+
+
+class VisitHistogram:
+    """
+    Per-endpoint, per-minute visit histogram over a sliding window.
+
+    Attributes:
+        window_minutes (int): Number of minute buckets kept per endpoint.
+        max_endpoints (int): Endpoints tracked individually per stripe;
+        visits to further endpoints are bucketed as "other".
+    """
+
+    def __init__(
+        self, window_minutes: int = 1440, max_endpoints: int = 64, stripes: int = 1
+    ):
+        """
+        Initializes the histogram.
+
+        Args:
+            window_minutes (int): Minutes of history to keep (default 24h).
+            max_endpoints (int): Endpoints tracked individually per stripe.
+            stripes (int): Number of independently locked stripes.
+        """
+        self.window_minutes = window_minutes
+        self.max_endpoints = max_endpoints
+        self._stripes: ThreadStripes[_HistogramStripe] = ThreadStripes(
+            _HistogramStripe, stripes
+        )
+
+    def record(
+        self, endpoint: str, timestamp: Optional[float] = None, count: int = 1
+    ) -> None:
+        """
+        Adds visits to the minute bucket of the given time.
+
+        Args:
+            endpoint (str): The path or name of the endpoint.
+            timestamp (float, optional): Unix time of the visit (default: now).
+            count (int): Number of visits to add (default is 1).
+        """
+        minute = int(timestamp if timestamp is not None else time.time()) // 60
+        stripe = self._stripes.local()
+
+        with stripe.lock:
+            self._ring(stripe, endpoint).add(minute, count)
+
+    def record_many(self, visits: Dict[Tuple[str, int], int]) -> None:
+        """
+        Adds several visits in one bulk update.
+
+        Args:
+            visits (Dict[Tuple[str, int], int]): Visits per (endpoint,
+            Unix time) pair.
+        """
+        stripe = self._stripes.local()
+
+        with stripe.lock:
+            for (endpoint, timestamp), count in visits.items():
+                self._ring(stripe, endpoint).add(int(timestamp) // 60, count)
+
+    def _ring(self, stripe: _HistogramStripe, endpoint: str) -> _MinuteRing:
+        """
+        Returns the endpoint's ring in the stripe, creating it (or falling
+        back to the overflow ring) if needed. Must be called with the
+        stripe lock held.
+        """
+        ring = stripe.rings.get(endpoint)
+        if ring is None:
+            if len(stripe.rings) >= self.max_endpoints:
+                endpoint = OVERFLOW_ENDPOINT
+            ring = stripe.rings.get(endpoint)
+            if ring is None:
+                ring = stripe.rings[endpoint] = _MinuteRing(self.window_minutes)
+        return ring
+
+    def minutes(
+        self, endpoint: Optional[str] = None, now: Optional[float] = None
+    ) -> List[int]:
+        """
+        Returns the per-minute counts of the window, oldest first.
+
+        Args:
+            endpoint (str, optional): Restrict to one endpoint (default: all).
+            now (float, optional): Unix time closing the window (default: now).
+
+        Returns:
+            List[int]: One count per minute of the window.
+        """
+        last = int(now if now is not None else time.time()) // 60
+        first = last - self.window_minutes + 1
+        totals = [0] * self.window_minutes
+
+        for stripe in self._stripes:
+            with stripe.lock:
+                for name, ring in stripe.rings.items():
+                    if endpoint is not None and name != endpoint:
+                        continue
+                    for offset in range(self.window_minutes):
+                        totals[offset] += ring.count(first + offset)
+        return totals
+
+    def hourly(
+        self, endpoint: Optional[str] = None, now: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Rolls the window up into local-time hours, in chronological order,
+        keeping only hours with visits.
+
+        Args:
+            endpoint (str, optional): Restrict to one endpoint (default: all).
+            now (float, optional): Unix time closing the window (default: now).
+
+        Returns:
+            Dict[str, int]: Visits per hour (e.g. {"14h": 5}).
+        """
+        last = int(now if now is not None else time.time()) // 60
+        first = last - self.window_minutes + 1
+        hours: Dict[str, int] = defaultdict(int)
+
+        for offset, visits in enumerate(self.minutes(endpoint, now)):
+            if visits:
+                hour = time.localtime((first + offset) * 60).tm_hour
+                hours[f"{hour:02d}h"] += visits
+        return dict(hours)
+
+    def reset(self) -> None:
+        """
+        Clears all buckets.
+        """
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.rings = {}
+
+    def swap(self) -> "VisitHistogram":
+        """
+        Replaces the buckets with empty ones, handing the old buckets over in
+        a detached histogram that can be read without blocking writers.
+
+        Returns:
+            VisitHistogram: Histogram holding the replaced buckets.
+        """
+        old = VisitHistogram(
+            self.window_minutes, self.max_endpoints, len(self._stripes)
+        )
+        for stripe, old_stripe in zip(self._stripes, old._stripes):
+            with stripe.lock:
+                old_stripe.rings, stripe.rings = stripe.rings, {}
+        return old
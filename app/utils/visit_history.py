@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the VisitHistory class, which keeps the visit history
+in an embedded SQLite database so the counters outlive the daily reset.
+
+The history never stores raw visits. On every flush, the difference
+between the tracker's counters and those of the previous flush is
+upserted, in one transaction, into hourly, daily, weekly and monthly
+rollup tables; each table is clustered on its bucket key, so range
+queries are index scans whatever the size of the history. Deltas are
+stamped with the flush time, which makes the hourly buckets accurate to
+the flush interval. Flushes run on the report scheduler thread, never on
+the request path, and the database uses WAL mode so that readers (the
+stats API) never block the writer.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from datetime import time as day_time
+from datetime import timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from ..models import VisitSnapshot
+from .visit_tracker import VisitTracker
+
+
+def _week_key(moment: datetime) -> str:
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+# resolution -> (rollup table, bucket key of a moment); keys sort in time order
+RESOLUTIONS: Dict[str, Tuple[str, Callable[[datetime], str]]] = {
+    "hour": ("visits_hourly", lambda moment: moment.strftime("%Y-%m-%dT%H")),
+    "day": ("visits_daily", lambda moment: moment.strftime("%Y-%m-%d")),
+    "week": ("visits_weekly", _week_key),
+    "month": ("visits_monthly", lambda moment: moment.strftime("%Y-%m")),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    bucket TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    visits INTEGER NOT NULL,
+    PRIMARY KEY (bucket, endpoint)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO {table} (bucket, endpoint, visits) VALUES (?, ?, ?)
+ON CONFLICT (bucket, endpoint) DO UPDATE SET visits = visits + excluded.visits
+"""
+
+_SELECT = """
+SELECT bucket, endpoint, visits FROM {table}
+WHERE bucket BETWEEN ? AND ? ORDER BY bucket
+"""
+
+
+class VisitHistory:
+    """
+    Durable, multi-resolution history of the visit counters.
+
+    Attributes:
+        visit_tracker (VisitTracker): Tracker whose counters are recorded.
+        path (str): Path of the SQLite database file.
+        flush_interval (float): Seconds between flushes.
+    """
+
+    def __init__(
+        self, visit_tracker: VisitTracker, path: str, flush_interval: float = 60.0
+    ):
+        """
+        Opens (or creates) the history database. Visits already counted
+        when the history is created (e.g. replayed from the journal after
+        a restart) are assumed to be recorded and are not flushed again.
+
+        Args:
+            visit_tracker (VisitTracker): Tracker whose counters are recorded.
+            path (str): Path of the SQLite database file.
+            flush_interval (float): Seconds between flushes.
+        """
+        self.visit_tracker = visit_tracker
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = visit_tracker.generation
+        self._baseline = visit_tracker.visit_log
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        for table, _ in RESOLUTIONS.values():
+            connection.execute(_SCHEMA.format(table=table))
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the calling thread's connection, opening it on first use
+        (and again after a fork, as connections must not cross processes).
+        """
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, "pid", None) != pid:
+            connection = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            local.connection, local.pid = connection, pid
+        return local.connection
+
+    def flush(self) -> int:
+        """
+        Records the visits counted since the previous flush.
+
+        Returns:
+            int: Number of visits recorded.
+        """
+        with self._lock:
+            tracker = self.visit_tracker
+            generation, endpoints = tracker.generation, tracker.visit_log
+            # After a reset the counters started again from zero
+            previous = self._baseline if generation == self._generation else {}
+
+            recorded = self._write(_delta(endpoints, previous))
+            self._generation, self._baseline = generation, endpoints
+            return recorded
+
+    def close_generation(self, snapshot: VisitSnapshot) -> int:
+        """
+        Records the last visits of a generation that was just reset, from
+        its final counters, so no visit is lost between the last flush and
+        the reset.
+
+        Args:
+            snapshot (VisitSnapshot): Counters of the generation that ended.
+
+        Returns:
+            int: Number of visits recorded.
+        """
+        with self._lock:
+            previous = self._baseline if snapshot.generation == self._generation else {}
+
+            recorded = self._write(_delta(snapshot.endpoints, previous))
+            self._generation, self._baseline = snapshot.generation + 1, {}
+            return recorded
+
+    def _write(self, delta: Dict[str, int], moment: Optional[datetime] = None) -> int:
+        """
+        Upserts the delta into every rollup table in a single transaction.
+
+        Args:
+            delta (Dict[str, int]): Visits to add per endpoint.
+            moment (datetime, optional): Time the visits are attributed to
+            (default: now).
+
+        Returns:
+            int: Number of visits recorded.
+        """
+        if not delta:
+            return 0
+
+        moment = moment or datetime.now()
+        items = list(delta.items())
+        connection = self._connection()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for table, key in RESOLUTIONS.values():
+                bucket = key(moment)
+                connection.executemany(
+                    _UPSERT.format(table=table),
+                    [(bucket, endpoint, visits) for endpoint, visits in items],
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return sum(delta.values())
+
+    def query(
+        self, resolution: str, start: datetime, end: datetime
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Reads the per-endpoint visits of the buckets between two moments.
+
+        Args:
+            resolution (str): "hour", "day", "week" or "month".
+            start (datetime): Moment within the first bucket.
+            end (datetime): Moment within the last bucket (inclusive).
+
+        Returns:
+            Dict[str, Dict[str, int]]: Visits per endpoint for each bucket
+            with visits, in chronological order.
+
+        Raises:
+            ValueError: If the resolution is unknown.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown history resolution: '{resolution}'")
+
+        table, key = RESOLUTIONS[resolution]
+        rows = self._connection().execute(
+            _SELECT.format(table=table), (key(start), key(end))
+        )
+
+        buckets: Dict[str, Dict[str, int]] = {}
+        for bucket, endpoint, visits in rows:
+            if visits:
+                buckets.setdefault(bucket, {})[endpoint] = visits
+        return buckets
+
+    def totals(self, resolution: str, start: datetime, end: datetime) -> Dict[str, int]:
+        """
+        Reads the total visits of the buckets between two moments.
+
+        Args:
+            resolution (str): "hour", "day", "week" or "month".
+            start (datetime): Moment within the first bucket.
+            end (datetime): Moment within the last bucket (inclusive).
+
+        Returns:
+            Dict[str, int]: Total visits of each bucket with visits, in
+            chronological order.
+        """
+        return {
+            bucket: sum(endpoints.values())
+            for bucket, endpoints in self.query(resolution, start, end).items()
+        }
+
+    def recent_days(
+        self, days: int = 7, today: Optional[date] = None
+    ) -> Dict[str, int]:
+        """
+        Reads the total visits of the last days, including days without
+        visits.
+
+        Args:
+            days (int): Number of days, ending today.
+            today (date, optional): Last day (default: today).
+
+        Returns:
+            Dict[str, int]: Visits per day (e.g. {"2024-05-01": 12}), oldest
+            first.
+        """
+        today = today or date.today()
+        first = today - timedelta(days=days - 1)
+        totals = self.totals(
+            "day",
+            datetime.combine(first, day_time.min),
+            datetime.combine(today, day_time.max),
+        )
+
+        labels = (str(first + timedelta(days=offset)) for offset in range(days))
+        return {label: totals.get(label, 0) for label in labels}
+
+
+def _delta(current: Dict[str, int], previous: Dict[str, int]) -> Dict[str, int]:
+    """
+    Computes the per-endpoint change between two counter states.
+    """
+    delta = {
+        endpoint: count - previous.get(endpoint, 0)
+        for endpoint, count in current.items()
+        if count != previous.get(endpoint, 0)
+    }
+    for endpoint, count in previous.items():
+        if endpoint not in current and count:
+            delta[endpoint] = -count
+    return delta
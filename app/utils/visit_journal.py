@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the VisitJournal class, an append-only binary log of
+visits that lets VisitTracker rebuild its counters after a restart.
+
+Every visit becomes a fixed-size 8-byte record (uint32 timestamp, uint32
+endpoint id). Visits are queued without locking on the request path; a
+background thread resolves their endpoint ids and writes them in batches,
+with one fsync per batch (group commit), so a crash loses at most the last
+flush interval.
+
+Worker processes may share the journal directory. Each process claims a
+worker slot (an exclusive lock file) and only writes and replays the
+segments of its slot, so a restarted worker takes over the slot of the one
+it replaces instead of replaying the visits of every worker. Slots, and
+their generations, are independent from one another.
+
+Files in the journal directory:
+    - endpoints.jsonl: endpoint names, one JSON string per line; the line
+      number is the endpoint id. New names are appended under an exclusive
+      file lock after reading the lines other processes appended, so
+      worker processes sharing the directory agree on every id.
+    - worker-<slot>.lock: held by the process owning the slot.
+    - visits-w<slot>-<generation>-<YYYYMMDD>.bin: record segments. A new
+      segment is opened every day, and a new generation starts whenever the
+      tracker resets its counters. Only the latest generation is replayed.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, deque
+from typing import BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX, a single process writes
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_RECORD_SIZE = 8
+# Segments written before worker slots existed belong to slot 0
+_SEGMENT_PATTERN = re.compile(r"^visits-(?:w(\d{3})-)?(\d{6})-(\d{8})\.bin$")
+_MAX_SLOTS = 1000
+
+
+class VisitJournal:
+    """
+    Durable, append-only journal of visits with daily segment rotation.
+
+    Attributes:
+        directory (str): Directory holding the journal files.
+        flush_interval (float): Seconds between group commits.
+        batch_size (int): Pending records that trigger an early flush.
+        retention_days (int): Days to keep segments of past generations.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        flush_interval: float = 1.0,
+        batch_size: int = 4096,
+        retention_days: int = 7,
+    ):
+        """
+        Opens the journal, creating the directory if needed. The worker
+        slot is claimed on first use by the process using the journal.
+
+        Args:
+            directory (str): Directory holding the journal files.
+            flush_interval (float): Seconds between group commits.
+            batch_size (int): Pending records that trigger an early flush.
+            retention_days (int): Days to keep segments of past generations.
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._names_path = os.path.join(directory, "endpoints.jsonl")
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # Bytes of the name table already read
+        self._names_offset = 0
+        self._names_lock = threading.Lock()
+
+        self._pending: Deque[Tuple[str, int]] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_pid: Optional[int] = None
+        self._segment_day = ""
+        self._segment_fd: Optional[int] = None
+
+        self._slot = 0
+        self._slot_fd: Optional[int] = None
+        self._slot_pid: Optional[int] = None
+        self._generation = 0
+
+    def _claim_slot(self) -> None:
+        """
+        Claims the first free worker slot for the current process (again
+        after a fork, as the lock belongs to the parent) and reads the
+        slot's latest generation. Must be called with the lock held.
+        """
+        pid = os.getpid()
+        if self._slot_pid == pid:
+            return
+
+        self._slot, self._slot_fd = 0, None
+        if fcntl is not None:
+            for slot in range(_MAX_SLOTS):
+                path = os.path.join(self.directory, f"worker-{slot:03d}.lock")
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    os.close(fd)
+                    continue
+                self._slot, self._slot_fd = slot, fd
+                break
+            else:
+                raise RuntimeError("Every visit journal worker slot is taken.")
+
+        self._segment_fd = None
+        self._generation = max(
+            (gen for gen, _, _ in self._segments(self._slot)), default=0
+        )
+        self._slot_pid = pid
+
+    def _load_names(self) -> None:
+        """
+        Reads the names other processes appended to the endpoint name table
+        since the last read.
+        """
+        with self._names_lock:
+            if os.path.exists(self._names_path):
+                with open(self._names_path, "rb") as names_file:
+                    self._read_names(names_file)
+
+    def _read_names(self, names_file: BinaryIO) -> None:
+        """
+        Reads the complete lines past the known part of the name table.
+        Must be called with the names lock held.
+        """
+        names_file.seek(self._names_offset)
+        data = names_file.read()
+        # A line still being written by another process is read next time
+        complete = data[: data.rfind(b"\n") + 1]
+
+        for line in complete.splitlines():
+            if line.strip():
+                name = json.loads(line)
+                self._ids.setdefault(name, len(self._names))
+                self._names.append(name)
+        self._names_offset += len(complete)
+
+    def _segments(self, slot: int) -> List[Tuple[int, str, str]]:
+        """
+        Lists the segment files of a worker slot.
+
+        Args:
+            slot (int): The worker slot.
+
+        Returns:
+            List[Tuple[int, str, str]]: (generation, day, path) sorted by
+            generation and day.
+        """
+        segments = []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_PATTERN.match(name)
+            if match and int(match.group(1) or 0) == slot:
+                path = os.path.join(self.directory, name)
+                segments.append((int(match.group(2)), match.group(3), path))
+        return sorted(segments)
+
+    def _endpoint_ids(self, endpoints: List[str]) -> Dict[str, int]:
+        """
+        Returns the ids of endpoints, appending the new ones to the name
+        table with a single fsync. Runs on the flusher thread. The ids are
+        the lines the names end up on, which the file lock keeps
+        consistent across processes.
+        """
+        with self._names_lock:
+            missing = [name for name in endpoints if name not in self._ids]
+            if missing:
+                # The lock is released when the file is closed
+                with open(self._names_path, "a+b") as names_file:
+                    if fcntl is not None:
+                        fcntl.flock(names_file.fileno(), fcntl.LOCK_EX)
+
+                    # Another process may have appended them (or other names)
+                    self._read_names(names_file)
+                    missing = [name for name in missing if name not in self._ids]
+                    if missing:
+                        names_file.write(
+                            b"".join(
+                                json.dumps(name).encode("utf-8") + b"\n"
+                                for name in missing
+                            )
+                        )
+                        names_file.flush()
+                        os.fsync(names_file.fileno())
+                        self._read_names(names_file)
+            return {name: self._ids[name] for name in endpoints}
+
+    def append(self, endpoint: str, timestamp: Optional[float] = None) -> None:
+        """
+        Queues a visit record. The record reaches disk on the next flush.
+
+        Args:
+            endpoint (str): The path or name of the endpoint.
+            timestamp (float, optional): Unix time of the visit (default: now).
+        """
+        self._ensure_thread()
+
+        # deque.append is atomic, so request threads never take a lock here
+        ts = int(timestamp if timestamp is not None else time.time())
+        self._pending.append((endpoint, ts))
+
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        """
+        Starts the flusher thread for the current process (threads do not
+        survive a fork, so each worker starts its own).
+        """
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+
+        with self._lock:
+            if self._thread_pid != pid:
+                self._claim_slot()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                self._thread_pid = pid
+
+    def _run(self) -> None:
+        """
+        Flusher loop: writes pending records every flush interval, or
+        earlier when a full batch is waiting.
+        """
+        while not self._stop_event.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"[Journal] Failed to flush visits: {e}")
+
+    def flush(self) -> None:
+        """
+        Writes every pending record to the current segment and fsyncs it.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        visits = []
+        for _ in range(len(self._pending)):
+            visits.append(self._pending.popleft())
+
+        if not visits:
+            return
+
+        self._claim_slot()
+        # New names reach disk before the records referring to them
+        ids = self._endpoint_ids(list({endpoint for endpoint, _ in visits}))
+        records = array("Q", (ts | (ids[endpoint] << 32) for endpoint, ts in visits))
+        if sys.byteorder == "big":
+            records.byteswap()
+
+        fd = self._current_segment()
+        os.write(fd, records.tobytes())
+        os.fsync(fd)
+
+    def _current_segment(self) -> int:
+        """
+        Returns the descriptor of today's segment for the current
+        generation, rotating when the day changes.
+        """
+        day = time.strftime("%Y%m%d")
+        if self._segment_fd is not None and day == self._segment_day:
+            return self._segment_fd
+
+        if self._segment_fd is not None:
+            os.close(self._segment_fd)
+            self._prune()
+
+        path = os.path.join(
+            self.directory,
+            f"visits-w{self._slot:03d}-{self._generation:06d}-{day}.bin",
+        )
+        self._segment_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        self._segment_day = day
+        return self._segment_fd
+
+    def _prune(self) -> None:
+        """
+        Deletes segments of past generations older than the retention period.
+        """
+        cutoff = time.strftime(
+            "%Y%m%d", time.localtime(time.time() - self.retention_days * 86400)
+        )
+        for generation, day, path in self._segments(self._slot):
+            if generation < self._generation and day < cutoff:
+                os.remove(path)
+
+    def start_generation(self) -> None:
+        """
+        Flushes pending records and starts a new generation, so that a later
+        replay ignores everything recorded before this point. Called when
+        the tracker resets its counters.
+        """
+        with self._lock:
+            self._flush_locked()
+            self._claim_slot()
+            if self._segment_fd is not None:
+                os.close(self._segment_fd)
+                self._segment_fd = None
+            self._generation += 1
+            # The empty segment marks the generation as current on disk
+            self._current_segment()
+
+    def replay(self) -> Iterator[Tuple[str, int, int]]:
+        """
+        Scans the segments of the latest generation of this process's
+        worker slot through mmap and aggregates identical records in C
+        (collections.Counter over the raw 64-bit records), so a day of
+        visits replays in a fraction of a second. Visits of the same
+        endpoint within the same second are merged.
+
+        Yields:
+            Tuple[str, int, int]: (endpoint, unix timestamp, visit count).
+        """
+        aggregated: Counter = Counter()
+        with self._lock:
+            self._claim_slot()
+            slot, current = self._slot, self._generation
+        self._load_names()
+
+        for generation, _, path in self._segments(slot):
+            if generation != current:
+                continue
+
+            size = os.path.getsize(path)
+            usable = size - size % _RECORD_SIZE
+            if not usable:
+                continue
+
+            records = array("Q")
+            with open(path, "rb") as segment:
+                with mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    records.frombytes(mm[:usable])
+
+            # Records are stored little-endian
+            if sys.byteorder == "big":
+                records.byteswap()
+            aggregated.update(records)
+
+        for record, visits in aggregated.items():
+            endpoint_id = record >> 32
+            if endpoint_id < len(self._names):
+                yield self._names[endpoint_id], record & 0xFFFFFFFF, visits
+
+    def close(self) -> None:
+        """
+        Stops the flusher thread and writes any pending records.
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None and self._thread_pid == os.getpid():
+            self._thread.join()
+        self.flush()
+
+        # Hands the worker slot over to the next process
+        if self._slot_fd is not None and self._slot_pid == os.getpid():
+            os.close(self._slot_fd)
+            self._slot_fd, self._slot_pid = None, None
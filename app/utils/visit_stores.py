@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module defines the counter stores used by VisitTracker to keep the
+total number of accesses and the per-endpoint visit counts.
+
+Stores:
+    - LockedVisitStore: a single lock guarding one dictionary (default).
+    - ShardedVisitStore: striped counters, one lock per stripe, merged on
+      read. Suited to threaded workers where writes vastly outnumber reads.
+"""
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Tuple
+
+from .thread_stripes import ThreadStripes
+
+
+class VisitStore(ABC):
+    """
+    Abstract base class describing the interface every visit counter store provides.
+
+    Attributes:
+        shared (bool): True if the counters are shared between processes.
+    """
+
+    shared = False
+
+    @abstractmethod
+    def add(self, endpoint: str, count: int = 1) -> None:
+        """
+        Adds visits to the given endpoint.
+
+        Args:
+            endpoint (str): The path or name of the endpoint.
+            count (int): Number of visits to add (default is 1).
+        """
+
+    def add_many(self, counts: Dict[str, int]) -> None:
+        """
+        Adds visits to several endpoints in one bulk update. Stores
+        override it to take their lock only once.
+
+        Args:
+            counts (Dict[str, int]): Visits to add per endpoint.
+        """
+        for endpoint, count in counts.items():
+            self.add(endpoint, count)
+
+    @abstractmethod
+    def get(self, endpoint: str) -> int:
+        """
+        Args:
+            endpoint (str): The path or name of the endpoint.
+
+        Returns:
+            int: Number of visits recorded for the endpoint.
+        """
+
+    @abstractmethod
+    def total(self) -> int:
+        """
+        Returns:
+            int: Total number of visits across all endpoints.
+        """
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: A copy of the per-endpoint visit counts.
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Clears all stored counts.
+        """
+
+    @abstractmethod
+    def swap(self) -> Tuple[int, Dict[str, int]]:
+        """
+        Atomically replaces the counters with empty ones and returns the old
+        ones, so no visit is lost between reading and resetting.
+
+        Returns:
+            Tuple[int, Dict[str, int]]: Total and per-endpoint counts of the
+            replaced generation.
+        """
+
+    @property
+    def is_reporter(self) -> bool:
+        """
+        Tells whether this process should report the stored counts. Stores
+        shared between processes elect a single reporter; local stores
+        always report.
+
+        Returns:
+            bool: True if the current process owns the report.
+        """
+        return True
+
+
+class LockedVisitStore(VisitStore):
+    """
+    Visit store guarded by a single lock.
+    """
+
+    def __init__(self) -> None:
+        self._access_count = 0
+        self._visit_log: Dict[str, int] = defaultdict(int)
+        self.lock = Lock()
+
+    def add(self, endpoint: str, count: int = 1) -> None:
+        with self.lock:
+            self._access_count += count
+            self._visit_log[endpoint] += count
+
+    def add_many(self, counts: Dict[str, int]) -> None:
+        with self.lock:
+            visit_log = self._visit_log
+            for endpoint, count in counts.items():
+                self._access_count += count
+                visit_log[endpoint] += count
+
+    def get(self, endpoint: str) -> int:
+        with self.lock:
+            return self._visit_log.get(endpoint, 0)
+
+    def total(self) -> int:
+        return self._access_count
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self._visit_log)
+
+    def reset(self) -> None:
+        with self.lock:
+            self._access_count = 0
+            self._visit_log = defaultdict(int)
+
+    def swap(self) -> Tuple[int, Dict[str, int]]:
+        # Only references are exchanged under the lock; the old dictionary
+        # is no longer reachable by writers and is copied afterwards.
+        with self.lock:
+            total, visit_log = self._access_count, self._visit_log
+            self._access_count = 0
+            self._visit_log = defaultdict(int)
+        return total, dict(visit_log)
+
+
+class _VisitShard:
+    """
+    One stripe of a ShardedVisitStore.
+    """
+
+    __slots__ = ("lock", "access_count", "visit_log")
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.access_count = 0
+        self.visit_log: Dict[str, int] = defaultdict(int)
+
+
+class ShardedVisitStore(VisitStore):
+    """
+    Visit store that spreads writes across independent shards.
+
+    Each writer thread is pinned to one shard, so increments only contend
+    with threads sharing the same shard. Reads walk every shard and merge
+    the results, which makes them O(shards + endpoints).
+    """
+
+    def __init__(self, shards: int = 8):
+        """
+        Initializes the sharded store.
+
+        Args:
+            shards (int): Number of shards. Matching it to the number of
+            request threads per worker removes write contention entirely.
+        """
+        self._shards: ThreadStripes[_VisitShard] = ThreadStripes(_VisitShard, shards)
+
+    def add(self, endpoint: str, count: int = 1) -> None:
+        shard = self._shards.local()
+        with shard.lock:
+            shard.access_count += count
+            shard.visit_log[endpoint] += count
+
+    def add_many(self, counts: Dict[str, int]) -> None:
+        shard = self._shards.local()
+        with shard.lock:
+            for endpoint, count in counts.items():
+                shard.access_count += count
+                shard.visit_log[endpoint] += count
+
+    def get(self, endpoint: str) -> int:
+        visits = 0
+        for shard in self._shards:
+            with shard.lock:
+                visits += shard.visit_log.get(endpoint, 0)
+        return visits
+
+    def total(self) -> int:
+        return sum(shard.access_count for shard in self._shards)
+
+    def counts(self) -> Dict[str, int]:
+        merged: Dict[str, int] = defaultdict(int)
+        for shard in self._shards:
+            with shard.lock:
+                items = list(shard.visit_log.items())
+            for endpoint, visits in items:
+                merged[endpoint] += visits
+        return dict(merged)
+
+    def reset(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.access_count = 0
+                shard.visit_log = defaultdict(int)
+
+    def swap(self) -> Tuple[int, Dict[str, int]]:
+        generations = []
+        for shard in self._shards:
+            with shard.lock:
+                generations.append((shard.access_count, shard.visit_log))
+                shard.access_count = 0
+                shard.visit_log = defaultdict(int)
+
+        merged: Dict[str, int] = defaultdict(int)
+        for _, visit_log in generations:
+            for endpoint, visits in visit_log.items():
+                merged[endpoint] += visits
+        return sum(total for total, _ in generations), dict(merged)
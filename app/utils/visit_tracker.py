@@ -8,13 +8,34 @@ multi-threaded environment.
 
 It provides synchronized methods for logging and retrieving
 visit counts, and includes a mechanism to reset the data
-periodically (e.g., by a scheduler).
+periodically (e.g., by a scheduler). The counters themselves
+live in a pluggable VisitStore (see visit_stores), optionally
+backed by a durable VisitJournal, while a VisitHistogram keeps
+the time distribution of the visits and UniqueVisitors estimates
+how many distinct clients made them. Both are per process: with
+a store shared between workers they are not kept, as they would
+only describe the reporting worker. An optional DedupWindow
+counts repeated visits of a client to an endpoint only once.
+RouteLatencies keeps the request durations of every route, so the
+reports show tail latency alongside traffic.
 """
 
+import itertools
 import logging
+import time
 from collections import defaultdict
+from contextlib import ExitStack
 from threading import Lock
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import VisitSnapshot
+from .dedup_window import DedupWindow
+from .hyperloglog import UniqueVisitors
+from .latency_histogram import RouteLatencies
+from .thread_stripes import ThreadStripes
+from .visit_histogram import VisitHistogram
+from .visit_journal import VisitJournal
+from .visit_stores import LockedVisitStore, VisitStore
 
 logger = logging.getLogger(__name__)
 
@@ -29,28 +50,175 @@ class VisitTracker:
     usage is needed.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        store: Optional[VisitStore] = None,
+        journal: Optional[VisitJournal] = None,
+        histogram: Optional[VisitHistogram] = None,
+        visitors: Optional[UniqueVisitors] = None,
+        log_sample_rate: float = 1.0,
+        dedup: Optional[DedupWindow] = None,
+        latencies: Optional[RouteLatencies] = None,
+        stripes: int = 1,
+    ) -> None:
+        """
+        Initializes a VisitTracker instance with its counter store.
+
+        Args:
+            store (VisitStore, optional): Store holding the counters.
+            If None, a LockedVisitStore is used.
+            journal (VisitJournal, optional): Durable journal of visits.
+            When given, the counters are rebuilt from it at startup.
+            histogram (VisitHistogram, optional): Per-minute visit buckets.
+            If None, a VisitHistogram covering the last 24 hours is used.
+            visitors (UniqueVisitors, optional): Unique-visitor sketches.
+            If None, a UniqueVisitors with default precision is used.
+            log_sample_rate (float): Fraction of visits written to the log
+            (1.0 logs every visit, 0 disables per-visit logging).
+            dedup (DedupWindow, optional): Window within which repeated
+            visits of the same visitor to an endpoint are not counted.
+            latencies (RouteLatencies, optional): Per-route request durations.
+            If None, a RouteLatencies with a single stripe is used.
+            stripes (int): Number of locks keeping the store and the
+            journal in the same generation across a reset (only used
+            with a journal).
+        """
+        self.store = store or LockedVisitStore()
+        self.journal = journal
+        self.histogram = histogram or VisitHistogram()
+        self.visitors = visitors or UniqueVisitors()
+        self.dedup = dedup
+        self.latencies = latencies or RouteLatencies()
+        self.generation = 0
+
+        # A visit is counted and journaled under one of these locks, and a
+        # reset takes them all, so both sides of it agree on its generation
+        self._journal_locks: ThreadStripes[Lock] = ThreadStripes(Lock, stripes)
+
+        # The minute buckets and sketches of the other workers never reach
+        # the reporter, so a shared store would report one worker's only
+        self._local_stats = not self.store.shared
+
+        # Log one visit out of every N; 0 disables per-visit logging
+        self._log_every = round(1 / log_sample_rate) if log_sample_rate > 0 else 0
+        self._visit_sequence = itertools.count()
+
+        # A shared store already outlives worker restarts; replaying into it
+        # from every worker would count the same visits several times.
+        if journal is not None and not self.store.shared:
+            self._replay()
+
+    def _replay(self) -> None:
         """
-        Initializes a VisitTracker instance with internal
-        counters and thread lock.
+        Rebuilds the counters from the journal's current generation.
         """
-        self._access_count = 0
-        self._visit_log: Dict[str, int] = defaultdict(int)
-        self.lock = Lock()
+        totals: Dict[str, int] = defaultdict(int)
+        for endpoint, timestamp, count in self.journal.replay():
+            totals[endpoint] += count
+            self.histogram.record(endpoint, timestamp, count)
+
+        for endpoint, count in totals.items():
+            self.store.add(endpoint, count)
+
+        logger.info(f"[Journal] Replayed {sum(totals.values())} visit(s).")
 
-    def log_visit(self, endpoint: str) -> None:
+    def log_visit(self, endpoint: str, visitor: Optional[str] = None) -> None:
         """
         Records a visit to the specified endpoint.
 
         Args:
             endpoint (str): The path or name of the
             endpoint being accessed.
+            visitor (str, optional): Client fingerprint used to count unique
+            visitors (and to skip repeats when deduplication is enabled).
+            It is only kept hashed, never stored.
+        """
+        if not self._counts(endpoint, visitor):
+            return
+
+        now = time.time()
+        if self.journal is None:
+            self.store.add(endpoint)
+        else:
+            with self._journal_locks.local():
+                self.store.add(endpoint)
+                self.journal.append(endpoint, now)
+
+        if self._local_stats:
+            self.histogram.record(endpoint, now)
+
+        if visitor is not None and self._local_stats:
+            self.visitors.add(endpoint, visitor)
+
+        # Sampled and lazily formatted, so unlogged visits cost one counter bump
+        if self._log_every and next(self._visit_sequence) % self._log_every == 0:
+            logger.info("Visit logged for endpoint '%s'", endpoint)
+
+    def log_visits(self, visits: Iterable[Tuple[str, float, Optional[str]]]) -> int:
+        """
+        Records a batch of visits (e.g. client-side beacons) with one bulk
+        update per component instead of one locked update per visit.
+
+        Args:
+            visits (Iterable[Tuple[str, float, Optional[str]]]): (endpoint,
+            Unix time, visitor fingerprint or None) for each visit.
+
+        Returns:
+            int: Number of visits recorded.
+        """
+        counts: Dict[str, int] = defaultdict(int)
+        minutes: Dict[Tuple[str, int], int] = defaultdict(int)
+        visitors = []
+        journaled: List[Tuple[str, float]] = []
+
+        for endpoint, timestamp, visitor in visits:
+            if not self._counts(endpoint, visitor):
+                continue
+            counts[endpoint] += 1
+            minutes[(endpoint, int(timestamp) // 60 * 60)] += 1
+            if visitor is not None and self._local_stats:
+                visitors.append((endpoint, visitor))
+            if self.journal is not None:
+                journaled.append((endpoint, timestamp))
+
+        if not counts:
+            return 0
+
+        if self.journal is None:
+            self.store.add_many(counts)
+        else:
+            with self._journal_locks.local():
+                self.store.add_many(counts)
+                for endpoint, timestamp in journaled:
+                    self.journal.append(endpoint, timestamp)
+        if self._local_stats:
+            self.histogram.record_many(minutes)
+        if visitors:
+            self.visitors.add_many(visitors)
+
+        recorded = sum(counts.values())
+        if self._log_every and next(self._visit_sequence) % self._log_every == 0:
+            logger.info("Batch of %d visit(s) logged", recorded)
+        return recorded
+
+    def _counts(self, endpoint: str, visitor: Optional[str]) -> bool:
+        """
+        Tells whether a visit should be counted: always, unless the
+        visitor already visited the endpoint within the dedup window.
+        """
+        if self.dedup is None or visitor is None:
+            return True
+        return self.dedup.first_visit(endpoint, visitor)
+
+    def record_latency(self, route: str, seconds: float) -> None:
         """
-        with self.lock:
-            self._access_count += 1
-            self._visit_log[endpoint] += 1
+        Records how long a request to a route took.
 
-        logger.info(f"Visit logged for endpoint '{endpoint}'")
+        Args:
+            route (str): The URL rule of the request.
+            seconds (float): The duration of the request, in seconds.
+        """
+        self.latencies.record(route, seconds)
 
     def get_visits(self, endpoint: str) -> int:
         """
@@ -62,19 +230,46 @@ class VisitTracker:
         Returns:
             int: Number of visits to the given endpoint.
         """
-        with self.lock:
-            return self._visit_log.get(endpoint, 0)
+        return self.store.get(endpoint)
+
+    def snapshot_and_reset(self) -> VisitSnapshot:
+        """
+        Atomically swaps in fresh counters and returns the previous
+        generation. Request threads keep counting into the new generation
+        while the old one is being reported, so no visit is lost.
+
+        Returns:
+            VisitSnapshot: Counters of the generation that just ended.
+        """
+        logger.info("[Scheduler] Resetting visit data.")
+
+        with ExitStack() as stack:
+            if self.journal is not None:
+                for lock in self._journal_locks:
+                    stack.enter_context(lock)
+                self.journal.start_generation()
+            total, endpoints = self.store.swap()
+        histogram = self.histogram.swap()
+        visitors = self.visitors.swap()
+        latencies = self.latencies.swap()
+        generation, self.generation = self.generation, self.generation + 1
+
+        return VisitSnapshot(
+            total=total,
+            endpoints=endpoints,
+            hourly=histogram.hourly(),
+            uniques=visitors.counts(),
+            unique_total=visitors.total(),
+            latencies=latencies.summaries(),
+            generation=generation,
+        )
 
     def _reset_data(self) -> None:
         """
         Resets all stored visit data (used by schedulers or
         manual maintenance).
         """
-        logger.info("[Scheduler] Resetting visit data.")
-
-        with self.lock:
-            self._access_count = 0
-            self._visit_log = defaultdict(int)
+        self.snapshot_and_reset()
 
     @property
     def total_accesses(self) -> int:
@@ -82,7 +277,44 @@ class VisitTracker:
         Returns:
             int: The total number of accesses across all endpoints.
         """
-        return self._access_count
+        return self.store.total()
+
+    @property
+    def hourly_log(self) -> Dict[str, int]:
+        """
+        Returns:
+            dict: Visits grouped by local hour, in chronological
+            order (e.g. {"14h": 5}); empty with a store shared between
+            workers.
+        """
+        return self.histogram.hourly()
+
+    @property
+    def unique_visitors(self) -> Dict[str, int]:
+        """
+        Returns:
+            dict: Estimated unique visitors per endpoint (empty with a
+            store shared between workers).
+        """
+        return self.visitors.counts()
+
+    @property
+    def latency_summaries(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            dict: Request count and p50, p95, p99, max and mean durations
+            (ms) per route.
+        """
+        return self.latencies.summaries()
+
+    @property
+    def is_reporter(self) -> bool:
+        """
+        Returns:
+            bool: True if this process is responsible for reporting the
+            visits (always True unless the store is shared between workers).
+        """
+        return self.store.is_reporter
 
     @property
     def visit_log(self) -> Dict[str, int]:
@@ -91,5 +323,4 @@ class VisitTracker:
             dict: A dictionary with endpoint names as keys and
             visit counts as values.
         """
-        with self.lock:
-            return dict(self._visit_log)
+        return self.store.counts()
@@ -11,11 +11,12 @@ Modules:
 
 Exports:
 - StandardResponse: A standard response wrapper for API output or internal messaging.
+- StaticResponse: A prebuilt StandardResponse for content that never changes.
 - VisitReportRenderer: Responsible for generating HTML reports from visit logs.
 """
 
-from .standard_response import StandardResponse
+from .standard_response import StandardResponse, StaticResponse
 from .visit_report_renderer import VisitReportRenderer
 
-__all__ = ["StandardResponse", "VisitReportRenderer"]
+__all__ = ["StandardResponse", "StaticResponse", "VisitReportRenderer"]
 __author__ = "Eric Santos <ericshantos13@gmail.com>"
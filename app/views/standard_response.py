@@ -6,15 +6,184 @@ This module defines the StandardResponse class, a helper for creating
 consistent and structured HTTP responses in Flask APIs.
 
 It wraps response content in a standardized format using the APIResponse model
-and returns it as a Flask-compatible JSON response.
+and returns it as a Flask-compatible JSON response. Responses whose content
+never changes can be frozen into a StaticResponse, serialized only once.
+
+The envelope is written straight to bytes by a JSONSerializer selected per
+application (see AppFactory): orjson when installed, or the standard
+library json module otherwise.
 """
 
+import dataclasses
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal
 from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
 
-from flask import Response, jsonify
+from flask import Flask, Response, current_app, has_app_context, request
+from werkzeug.http import http_date
 
 from ..models import APIResponse
 
+EXTENSION_NAME = "json_serializer"
+
+
+class JSONSerializer(ABC):
+    """
+    Abstract base class of the JSON backends used to serialize responses.
+
+    Attributes:
+        name (str): Backend name, as accepted by create_serializer().
+    """
+
+    name = ""
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serializes a value to compact UTF-8 JSON.
+
+        Args:
+            value (Any): JSON-serializable value (dataclasses, dates,
+            UUIDs and decimals are supported too).
+
+        Returns:
+            bytes: The JSON document.
+        """
+
+    def envelope(self, response: APIResponse) -> bytes:
+        """
+        Serializes a response envelope without building an intermediate
+        dictionary. Keys are sorted and a None payload is omitted, exactly
+        like APIResponse.to_json().
+
+        Args:
+            response (APIResponse): The response to serialize.
+
+        Returns:
+            bytes: The JSON body, newline-terminated.
+        """
+        body = b"{"
+        if response.data is not None:
+            body += b'"data":' + self.dumps(response.data) + b","
+        if response.message is not None:
+            body += b'"message":' + self.dumps(response.message) + b","
+        if response.success:
+            return body + b'"success":true}\n'
+        return body + b'"success":false}\n'
+
+    def install(self, app: Flask) -> None:
+        """
+        Makes this serializer the one used by the application's responses.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        app.extensions[EXTENSION_NAME] = self
+
+
+def _default(value: Any) -> Any:
+    """
+    Converts the non-JSON types the serializers accept, the way Flask's
+    default JSON provider does (dates become HTTP dates).
+    """
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJSONSerializer(JSONSerializer):
+    """
+    Serializer backed by the standard library json module. Its output
+    matches Flask's default JSON provider (ASCII-escaped, sorted keys).
+    """
+
+    name = "json"
+
+    def __init__(self) -> None:
+        self._encoder = json.JSONEncoder(
+            sort_keys=True, separators=(",", ":"), default=_default
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value).encode("utf-8")
+
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    Serializer backed by orjson (an optional dependency), several times
+    faster than the standard library on large payloads. Keys are sorted
+    and dates are encoded as HTTP dates too, but non-ASCII text is written
+    as raw UTF-8.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        # Dates go through _default instead of orjson's RFC 3339 encoding
+        passthrough = orjson.OPT_PASSTHROUGH_DATETIME
+        self._options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | passthrough
+
+    def dumps(self, value: Any) -> bytes:
+        return self._dumps(value, default=_default, option=self._options)
+
+
+_SERIALIZERS = {
+    StdlibJSONSerializer.name: StdlibJSONSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+}
+
+_DEFAULT_SERIALIZER = StdlibJSONSerializer()
+
+
+def create_serializer(backend: str = "auto") -> JSONSerializer:
+    """
+    Builds the serializer for the given backend.
+
+    Args:
+        backend (str): "orjson", "json", or "auto" to use orjson when it is
+        installed and fall back to the standard library otherwise.
+
+    Returns:
+        JSONSerializer: The serializer.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If "orjson" is requested but not installed.
+    """
+    if backend == "auto":
+        try:
+            return OrjsonSerializer()
+        except ImportError:
+            return StdlibJSONSerializer()
+
+    if backend not in _SERIALIZERS:
+        raise ValueError(f"Unknown JSON backend: '{backend}'")
+    return _SERIALIZERS[backend]()
+
+
+def current_serializer() -> JSONSerializer:
+    """
+    Returns:
+        JSONSerializer: The serializer installed on the current application,
+        or the standard library one outside of an application context.
+    """
+    if has_app_context():
+        return current_app.extensions.get(EXTENSION_NAME, _DEFAULT_SERIALIZER)
+    return _DEFAULT_SERIALIZER
+
 
 class StandardResponse:
     """
@@ -51,4 +220,106 @@ class StandardResponse:
         Returns:
             Tuple[Response, int]: A Flask Response object with a JSON body and status code.
         """
-        return jsonify(self.response.to_json()), self.status_code
+        body = current_serializer().envelope(self.response)
+        return Response(body, mimetype="application/json"), self.status_code
+
+    def freeze(self, etag: Optional[str] = None) -> "StaticResponse":
+        """
+        Serializes the response once into a reusable StaticResponse.
+
+        Args:
+            etag (str, optional): Version tag of the content. If None, the
+            ETag is a hash of the serialized body.
+
+        Returns:
+            StaticResponse: The prebuilt response.
+        """
+        return StaticResponse(self.response, self.status_code, etag)
+
+
+class _PreparedBody:
+    """
+    A StaticResponse body serialized by one serializer, with its headers.
+    """
+
+    __slots__ = ("body", "etag", "headers", "not_modified_headers")
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            "ETag": f'"{self.etag}"',
+        }
+        self.not_modified_headers = {"ETag": self.headers["ETag"]}
+
+
+class StaticResponse:
+    """
+    A JSON response serialized once and served as prebuilt bytes.
+
+    The body, its Content-Length and a strong ETag are computed the first
+    time the response is served by a given serializer, then reused; a
+    request whose If-None-Match matches the ETag gets a bodiless
+    304 Not Modified.
+
+    Attributes:
+        response (APIResponse): The response content.
+        status_code (int): HTTP status code to return.
+        etag (Optional[str]): Version tag used instead of a hash of the body.
+    """
+
+    def __init__(
+        self,
+        response: APIResponse,
+        status_code: int = 200,
+        etag: Optional[str] = None,
+    ):
+        """
+        Initializes the static response.
+
+        Args:
+            response (APIResponse): The response content.
+            status_code (int): HTTP status code (default is 200).
+            etag (str, optional): Version tag of the content. If None, the
+            ETag is a hash of the serialized body.
+        """
+        self.response = response
+        self.status_code = status_code
+        self.etag = etag
+        self._prepared: Dict[JSONSerializer, _PreparedBody] = {}
+
+    def prepare(self, serializer: Optional[JSONSerializer] = None) -> _PreparedBody:
+        """
+        Serializes the response, once per serializer.
+
+        Args:
+            serializer (JSONSerializer, optional): Serializer to use. If
+            None, the current application's serializer is used.
+
+        Returns:
+            _PreparedBody: The body bytes, ETag and headers.
+        """
+        serializer = serializer or current_serializer()
+        prepared = self._prepared.get(serializer)
+        if prepared is None:
+            prepared = _PreparedBody(serializer.envelope(self.response), self.etag)
+            self._prepared[serializer] = prepared
+        return prepared
+
+    def __call__(self) -> Tuple[Response, int]:
+        """
+        Builds the Flask response for the current request.
+
+        Returns:
+            Tuple[Response, int]: The prebuilt response and its status code,
+            or an empty response with 304 if the client's copy is current.
+        """
+        prepared = self.prepare()
+
+        if "If-None-Match" in request.headers and request.method in ("GET", "HEAD"):
+            if request.if_none_match.contains_weak(prepared.etag):
+                return Response(headers=prepared.not_modified_headers), 304
+
+        return Response(prepared.body, headers=prepared.headers), self.status_code
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+This module builds small inline SVG charts for the HTML reports, so the
+emails carry a real chart without hosting any image.
+
+Rendering is a single pass over the buckets (linear in their number) and
+the result is markup ready to be embedded in a template.
+"""
+
+from html import escape
+from typing import Dict
+
+from markupsafe import Markup
+
+_BAR_COLOR = "#4f46e5"
+_AXIS_COLOR = "#9ca3af"
+_LABEL_STYLE = 'font-family="Arial, sans-serif" font-size="10" fill="#374151"'
+
+
+def bar_chart(
+    buckets: Dict[str, int],
+    width: int = 480,
+    height: int = 160,
+    title: str = "Visits per hour",
+) -> Markup:
+    """
+    Renders a bar chart of the buckets, in their given order.
+
+    Args:
+        buckets (Dict[str, int]): Value per label (e.g. {"14h": 5}).
+        width (int): Chart width in pixels.
+        height (int): Chart height in pixels.
+        title (str): Accessible title of the chart.
+
+    Returns:
+        Markup: The <svg> element (empty if there are no buckets).
+    """
+    if not buckets:
+        return Markup("")
+
+    label_height = 14
+    top = 12
+    plot_height = height - label_height - top
+    slot = width / len(buckets)
+    bar_width = max(1.0, slot * 0.7)
+    peak = max(buckets.values()) or 1
+
+    # Labels are thinned out so they never overlap (about 28px each)
+    label_every = max(1, int(28 // slot) + (1 if 28 % slot else 0))
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="0 0 {width} {height}" role="img">',
+        f"<title>{escape(title)}</title>",
+        f'<line x1="0" y1="{top + plot_height}" x2="{width}" '
+        f'y2="{top + plot_height}" stroke="{_AXIS_COLOR}" stroke-width="1"/>',
+    ]
+
+    for index, (label, value) in enumerate(buckets.items()):
+        bar_height = plot_height * value / peak
+        x = index * slot + (slot - bar_width) / 2
+        y = top + plot_height - bar_height
+        center = index * slot + slot / 2
+
+        parts.append(
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" '
+            f'height="{bar_height:.1f}" fill="{_BAR_COLOR}">'
+            f"<title>{escape(str(label))}: {value}</title></rect>"
+        )
+        if value == peak:
+            parts.append(
+                f'<text x="{center:.1f}" y="{y - 2:.1f}" text-anchor="middle" '
+                f"{_LABEL_STYLE}>{value}</text>"
+            )
+        if index % label_every == 0:
+            parts.append(
+                f'<text x="{center:.1f}" y="{height - 2}" text-anchor="middle" '
+                f"{_LABEL_STYLE}>{escape(str(label))}</text>"
+            )
+
+    parts.append("</svg>")
+    return Markup("".join(parts))
@@ -5,19 +5,46 @@
 This module provides functionality for generating HTML reports based on
 daily visit data received by a portfolio. Its main responsibility is to
 render the data in a clear and user-friendly visual format.
+
+The Jinja2 template is compiled once, when the first report is rendered,
+and the hourly buckets are drawn as an inline SVG chart.
 """
 
-import html
+import os
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from ..models import VisitReport
+from .svg_chart import bar_chart
+
+OVERFLOW_ENDPOINT = "other"
+
+_TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# Autoescaping protects the report from HTML injection through endpoint
+# names; templates are compiled on first load and cached by the environment.
+_environment = Environment(
+    loader=FileSystemLoader(_TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+)
 
 
 class VisitReportRenderer:
     """
     Class responsible for rendering an HTML report from a VisitReport instance
     containing access data for a specific day.
+
+    Attributes:
+        template (jinja2.Template): The compiled report template, None until
+        the first report is rendered.
     """
 
+    template: Optional[Template] = None
+
     @classmethod
     def render(cls, report: VisitReport) -> str:
         """
@@ -25,37 +52,34 @@ class VisitReportRenderer:
 
         Args:
             report (VisitReport): Object containing the date, total visit count,
-            and a log of visit times and their counts.
+            a log of visit times and their counts, and the per-endpoint counts.
 
         Returns:
             str: A string containing the HTML content of the daily access report.
         """
+        # The log is already in chronological order (it may wrap midnight);
+        # endpoints are listed most visited first, "other" last.
+        if cls.template is None:
+            cls.template = _environment.get_template("visit_report.html")
 
-        # Generate the list of visit times if any logs are available
-        if report.log:
-            items = "".join(
-                f"<li>{html.escape(str(hour))} → {html.escape(str(visits))} visit(s)</li>"
-                for hour, visits in sorted(report.log.items())
-            )
-            time_list_html = f"<ul>{items}</ul>"
-        else:
-            # Default message if no visits were logged
-            time_list_html = "<p>No visits recorded today.</p>"
-
-        # Escape sensitive values to prevent HTML injection
-        count = html.escape(str(report.count))
-        date = report.date.strftime("%d/%m/%Y")
-
-        # Build and return the final HTML content
-        return f"""
-        <html>
-        <head><title>Daily Report</title></head>
-        <body>
-            <p>Your portfolio received <strong>{count}</strong> visit(s) today! 🤩🙏</p>
-            <p>Daily access report - {date}</p>
-            <p><strong>Visit times:</strong></p>
-            {time_list_html}
-            <img src="GIF OR IMAGE" alt="Visit chart">
-        </body>
-        </html>
+        return cls.template.render(
+            report=report,
+            chart=bar_chart(report.log),
+            history_chart=bar_chart(report.history, title="Visits per day"),
+            endpoints=cls._ordered_endpoints(report.endpoints),
+        )
+
+    @staticmethod
+    def _ordered_endpoints(endpoints: Dict[str, int]) -> List[Tuple[str, int]]:
+        """
+        Sorts endpoints by visits, keeping the "other" bucket at the end.
+
+        Args:
+            endpoints (Dict[str, int]): Visits per endpoint.
+
+        Returns:
+            List[Tuple[str, int]]: (endpoint, visits) pairs in display order.
         """
+        ordered = sorted(endpoints.items(), key=lambda item: item[1], reverse=True)
+        other = [item for item in ordered if item[0] == OVERFLOW_ENDPOINT]
+        return [item for item in ordered if item[0] != OVERFLOW_ENDPOINT] + other
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Benchmark suite for the visit tracking hot path.
+
+Modules:
+    - micro: Microbenchmarks of VisitTracker and VisitReportRenderer under
+      contending threads (python -m benchmarks.micro).
+    - load: Load test of the full application, through the WSGI test client
+      or a local gunicorn (python -m benchmarks.load).
+    - smtp: EmailSender against a local stand-in SMTP server: session
+      reuse and recovery of dropped sessions (python -m benchmarks.smtp).
+    - compare: Side-by-side comparison of two JSON result files
+      (python -m benchmarks.compare).
+
+The application reads its settings at import time, so they are prepared
+here, before any benchmark imports it.
+"""
+
+from .common import prepare_env
+
+prepare_env()
+
+__author__ = "Eric Santos <ericshantos13@gmail.com>"
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Helpers shared by the benchmarks: percentiles, memory usage, run metadata
+and the JSON result format.
+
+Every benchmark writes one JSON document holding the environment it ran in
+(commit, Python version, CPU count) and a list of result rows, so that runs
+of two commits can be compared with benchmarks.compare.
+"""
+
+import json
+import os
+import platform
+import resource
+import subprocess  # nosec B404 - only runs git with fixed arguments
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Importing the application requires its SMTP settings; benchmarks never
+# send email, and per-visit logging would dominate the measures.
+BENCHMARK_ENV = {"SMTP_PORT": "587", "VISIT_LOG_SAMPLE_RATE": "0"}
+
+
+def prepare_env() -> None:
+    """
+    Sets the environment variables the application needs, keeping any
+    value already defined.
+    """
+    for name, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(name, value)
+
+
+def percentile(ordered: Sequence[float], quantile: float) -> float:
+    """
+    Reads a quantile of sorted samples (nearest rank).
+
+    Args:
+        ordered (Sequence[float]): Samples in ascending order.
+        quantile (float): Quantile between 0 and 1.
+
+    Returns:
+        float: The sample at that rank (0 if there are none).
+    """
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, int(round(quantile * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarizes durations measured in seconds.
+
+    Args:
+        samples (List[float]): The durations, in seconds (sorted in place).
+
+    Returns:
+        Dict[str, float]: p50, p99 and max, in microseconds.
+    """
+    samples.sort()
+    return {
+        "p50_us": round(percentile(samples, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(samples, 0.99) * 1e6, 2),
+        "max_us": round(samples[-1] * 1e6, 2) if samples else 0.0,
+    }
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Reads the resident memory of a process.
+
+    Args:
+        pid (int, optional): Process to inspect (default: this one).
+
+    Returns:
+        Optional[float]: Resident set size in MiB; for this process the peak
+        is used when /proc is unavailable, and None for other processes.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    if pid is not None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(  # nosec B603 B607
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describes where the benchmark runs.
+
+    Returns:
+        Dict[str, Any]: Commit, Python and platform details.
+    """
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(
+    benchmark: str, results: List[Dict[str, Any]], output: Optional[str]
+) -> None:
+    """
+    Writes the results as JSON to a file, or to the standard output.
+
+    Args:
+        benchmark (str): Name of the benchmark (e.g. "micro").
+        results (List[Dict[str, Any]]): One row per measured case.
+        output (str, optional): Path of the JSON file; None prints it.
+    """
+    document = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+
+    if output is None:
+        print(text)
+        return
+    with open(output, "w") as file:
+        file.write(text + "\n")
+    print(f"[Benchmark] Results written to {output}", file=sys.stderr)
+
+
+def parse_ints(text: str) -> List[int]:
+    """
+    Parses a comma-separated list of integers (e.g. "1,4,16").
+
+    Args:
+        text (str): The list.
+
+    Returns:
+        List[int]: The integers.
+    """
+    return [int(value) for value in text.split(",") if value.strip()]
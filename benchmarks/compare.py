@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Compares two benchmark result files (e.g. of a base commit and of a
+change), matching their rows by case and thread count (micro) or by
+server and concurrency (load).
+
+Usage:
+    python -m benchmarks.compare base.json head.json
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# benchmark -> (row key fields, throughput field)
+_LAYOUTS = {
+    "micro": (("case", "threads"), "ops_per_second"),
+    "load": (("server", "concurrency"), "requests_per_second"),
+}
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _ratio(head: float, base: float) -> str:
+    return f"{head / base:.2f}x" if base else "-"
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any]) -> List[str]:
+    """
+    Formats the comparison of two result documents.
+
+    Args:
+        base (Dict[str, Any]): Results of the reference run.
+        head (Dict[str, Any]): Results of the run being evaluated.
+
+    Returns:
+        List[str]: Table lines: throughput and p99 latency of both runs
+        and their ratios (above 1x is faster throughput / slower p99).
+
+    Raises:
+        ValueError: If the documents come from different benchmarks.
+    """
+    if base["benchmark"] != head["benchmark"]:
+        raise ValueError("Results come from different benchmarks.")
+
+    key_fields, throughput = _LAYOUTS[base["benchmark"]]
+    base_rows: Dict[Tuple[Any, ...], Dict[str, Any]] = {
+        tuple(row[field] for field in key_fields): row for row in base["results"]
+    }
+
+    lines = [
+        f"base {base['environment']['commit']} -> head {head['environment']['commit']}",
+        f"{'':<36}{'base':>14}{'head':>14}{'ratio':>8}"
+        f"{'base p99':>12}{'head p99':>12}{'ratio':>8}",
+    ]
+    for row in head["results"]:
+        key = tuple(row[field] for field in key_fields)
+        before: Optional[Dict[str, Any]] = base_rows.get(key)
+        if before is None:
+            continue
+        label = " ".join(str(part) for part in key)
+        lines.append(
+            f"{label:<36}{before[throughput]:>14,.0f}{row[throughput]:>14,.0f}"
+            f"{_ratio(row[throughput], before[throughput]):>8}"
+            f"{before['p99_us']:>12.1f}{row['p99_us']:>12.1f}"
+            f"{_ratio(row['p99_us'], before['p99_us']):>8}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("base", help="JSON results of the reference run.")
+    parser.add_argument("head", help="JSON results of the run to evaluate.")
+    args = parser.parse_args(argv)
+
+    for line in compare(_load(args.base), _load(args.head)):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
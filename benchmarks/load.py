@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Load test of the full application built by AppFactory.
+
+A fixed number of client threads send requests back to back for a fixed
+duration, after a warm-up, and the run reports the throughput, the p50/p99
+latency and the resident memory of the server. The server is either the
+WSGI test client in this process (no sockets, measures the application
+alone) or a local gunicorn started from run.py (measures the deployment,
+including the HTTP stack and worker model). With gunicorn, the Python
+client threads can saturate before the server does: check that the client
+process is not pinned at 100% CPU before reading the numbers.
+
+Usage:
+    python -m benchmarks.load [--server wsgi|gunicorn] [--concurrency 16]
+        [--duration 10] [--paths /,/stats] [--workers 2] [--threads 8]
+        [--output load.json]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess  # nosec B404 - only starts gunicorn with fixed arguments
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .common import latency_summary, parse_ints, rss_mb, write_results
+
+# A request function returns the HTTP status of one request to a path
+Requester = Callable[[str], int]
+
+
+def _wsgi_clients(app: Any, concurrency: int) -> Tuple[List[Requester], Callable]:
+    """
+    Builds one test client of the in-process application per thread.
+
+    Returns:
+        Tuple[List[Requester], Callable]: The request functions and a
+        function reading the server memory.
+    """
+
+    def requester() -> Requester:
+        client = app.test_client()
+        return lambda path: client.get(path).status_code
+
+    return [requester() for _ in range(concurrency)], rss_mb
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    """
+    Lists the child processes of a process (Linux only).
+    """
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The parent pid follows the parenthesized command name
+                if int(stat.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def _start_gunicorn(workers: int, threads: int) -> Tuple[subprocess.Popen, int]:
+    """
+    Starts gunicorn on a free local port and waits until it accepts
+    connections.
+
+    Returns:
+        Tuple[subprocess.Popen, int]: The server process and its port.
+
+    Raises:
+        RuntimeError: If the server does not come up within 30 seconds.
+    """
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(workers),
+        "--threads",
+        str(threads),
+        "--worker-class",
+        "gthread",
+        "--log-level",
+        "warning",
+        "run:app",
+    ]
+    server = subprocess.Popen(command)  # nosec B603
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup.")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server, port
+        except OSError:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError("gunicorn did not start within 30 seconds.")
+
+
+def _http_clients(
+    port: int, server: subprocess.Popen, concurrency: int
+) -> Tuple[List[Requester], Callable]:
+    """
+    Builds one keep-alive HTTP connection per thread.
+
+    Returns:
+        Tuple[List[Requester], Callable]: The request functions and a
+        function reading the memory of the gunicorn master and workers.
+    """
+
+    def requester() -> Requester:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+        def request(path: str) -> int:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+
+        return request
+
+    def server_rss() -> Optional[float]:
+        sizes = [rss_mb(pid) for pid in [server.pid, *_children(server.pid)]]
+        known = [size for size in sizes if size is not None]
+        return round(sum(known), 1) if known else None
+
+    return [requester() for _ in range(concurrency)], server_rss
+
+
+def drive(
+    requesters: List[Requester], paths: List[str], warmup: float, duration: float
+) -> Dict[str, Any]:
+    """
+    Sends requests from one thread per request function until the
+    duration elapses. Requests of the warm-up period are not measured.
+
+    Args:
+        requesters (List[Requester]): One request function per thread.
+        paths (List[str]): Paths requested in turn by every thread.
+        warmup (float): Seconds of unmeasured load before the run.
+        duration (float): Seconds of measured load.
+
+    Returns:
+        Dict[str, Any]: Request and error counts, throughput and latency.
+    """
+    start_barrier = threading.Barrier(len(requesters) + 1)
+    samples: List[List[float]] = [[] for _ in requesters]
+    errors = [0] * len(requesters)
+    measure_from = 0.0
+    stop_at = 0.0
+
+    def worker(index: int) -> None:
+        request, local = requesters[index], samples[index]
+        clock = time.perf_counter
+        start_barrier.wait()
+        sent = 0
+        while True:
+            started = clock()
+            if started >= stop_at:
+                return
+            try:
+                ok = request(paths[sent % len(paths)]) < 500
+            except (OSError, http.client.HTTPException):
+                ok = False
+            sent += 1
+            if started >= measure_from:
+                local.append(clock() - started)
+                if not ok:
+                    errors[index] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(index,))
+        for index in range(len(requesters))
+    ]
+    for thread in threads:
+        thread.start()
+    measure_from = time.perf_counter() + warmup
+    stop_at = measure_from + duration
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    latencies = [sample for local in samples for sample in local]
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "seconds": duration,
+        "requests_per_second": round(len(latencies) / duration, 1),
+        **latency_summary(latencies),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--server", choices=["wsgi", "gunicorn"], default="wsgi")
+    parser.add_argument(
+        "--concurrency",
+        default="16",
+        type=parse_ints,
+        help="Client threads; a comma-separated list runs one test per value.",
+    )
+    parser.add_argument("--duration", default=10.0, type=float)
+    parser.add_argument("--warmup", default=2.0, type=float)
+    parser.add_argument("--paths", default="/", help="Comma-separated paths.")
+    parser.add_argument("--workers", default=2, type=int, help="gunicorn workers.")
+    parser.add_argument("--threads", default=8, type=int, help="gunicorn threads.")
+    parser.add_argument("--output", help="JSON file to write (default: stdout).")
+    args = parser.parse_args(argv)
+    paths = args.paths.split(",")
+
+    server: Optional[subprocess.Popen] = None
+    if args.server == "gunicorn":
+        server, port = _start_gunicorn(args.workers, args.threads)
+    else:
+        from app import AppFactory
+
+        app = AppFactory(async_logging=False)()
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            if server is None:
+                requesters, memory = _wsgi_clients(app, concurrency)
+            else:
+                requesters, memory = _http_clients(port, server, concurrency)
+
+            result = {
+                "server": args.server,
+                "concurrency": concurrency,
+                "paths": paths,
+                **drive(requesters, paths, args.warmup, args.duration),
+                "rss_mb": memory(),
+            }
+            if server is not None:
+                result.update(workers=args.workers, threads=args.threads)
+            results.append(result)
+            print(
+                f"[Benchmark] {args.server} concurrency={concurrency:<3} "
+                f"{result['requests_per_second']:>10,.1f} req/s  "
+                f"p50={result['p50_us'] / 1000:.2f}ms "
+                f"p99={result['p99_us'] / 1000:.2f}ms "
+                f"errors={result['errors']}",
+                file=sys.stderr,
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    write_results("load", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+Microbenchmarks of the tracking hot path under contending threads.
+
+Each case runs a fixed total number of operations split evenly across 1 to
+64 threads that start together on a barrier, and reports the throughput
+and the per-operation latency (which includes ~0.1 µs of timer overhead).
+
+Usage:
+    python -m benchmarks.micro [--threads 1,4,16,64] [--scale 1.0]
+        [--cases log_visit,render] [--output micro.json]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from app.models import VisitReport
+from app.utils.hyperloglog import UniqueVisitors
+from app.utils.latency_histogram import RouteLatencies
+from app.utils.visit_histogram import VisitHistogram
+from app.utils.visit_stores import LockedVisitStore, ShardedVisitStore
+from app.utils.visit_tracker import VisitTracker
+from app.views import VisitReportRenderer
+
+from .common import latency_summary, parse_ints, rss_mb, write_results
+
+ENDPOINTS = ["/", "/posts/<int:id>", "/about", "/contact", "/stats"]
+
+Operation = Callable[[], Any]
+
+
+class Case(NamedTuple):
+    """
+    A microbenchmark: builds its state for a thread count, then hands each
+    thread the operation it repeats.
+    """
+
+    setup: Callable[[int], Any]
+    operation: Callable[[Any, int], Operation]
+    operations: int
+
+
+def _tracker(sharded: bool, threads: int) -> VisitTracker:
+    """
+    Builds a tracker like the application does, with one stripe per thread
+    when sharded.
+    """
+    if not sharded:
+        return VisitTracker(store=LockedVisitStore())
+
+    return VisitTracker(
+        store=ShardedVisitStore(shards=threads),
+        histogram=VisitHistogram(stripes=threads),
+        visitors=UniqueVisitors(stripes=threads),
+        latencies=RouteLatencies(stripes=threads),
+    )
+
+
+def _log_visit(tracker: VisitTracker, index: int) -> Operation:
+    endpoint = ENDPOINTS[index % len(ENDPOINTS)]
+    return lambda: tracker.log_visit(endpoint)
+
+
+def _log_visit_visitor(tracker: VisitTracker, index: int) -> Operation:
+    endpoint = ENDPOINTS[index % len(ENDPOINTS)]
+    visitor = f"10.0.0.{index}|Mozilla/5.0"
+    return lambda: tracker.log_visit(endpoint, visitor)
+
+
+def _filled_tracker(sharded: bool, threads: int) -> VisitTracker:
+    tracker = _tracker(sharded, threads)
+    for number in range(200):
+        tracker.log_visit(f"/posts/{number}", f"visitor-{number}")
+    return tracker
+
+
+def _visit_log(tracker: VisitTracker, _index: int) -> Operation:
+    return lambda: tracker.visit_log
+
+
+def _report(_threads: int) -> VisitReport:
+    latency = {"count": 100, "p50": 1.2, "p95": 4.8, "p99": 9.6, "max": 20.1}
+    return VisitReport(
+        count=2400,
+        log={f"{hour:02d}h": 100 for hour in range(24)},
+        date=datetime.now(),
+        endpoints={f"/posts/{number}": 100 - number for number in range(20)},
+        uniques={f"/posts/{number}": 50 for number in range(20)},
+        unique_count=800,
+        history={f"2024-05-{day:02d}": 2000 + day for day in range(1, 8)},
+        latencies={endpoint: latency for endpoint in ENDPOINTS},
+    )
+
+
+CASES: Dict[str, Case] = {
+    "log_visit/locked": Case(
+        lambda threads: _tracker(False, threads), _log_visit, 200_000
+    ),
+    "log_visit/sharded": Case(
+        lambda threads: _tracker(True, threads), _log_visit, 200_000
+    ),
+    "log_visit_visitor/sharded": Case(
+        lambda threads: _tracker(True, threads), _log_visit_visitor, 100_000
+    ),
+    "visit_log/locked": Case(
+        lambda threads: _filled_tracker(False, threads), _visit_log, 20_000
+    ),
+    "visit_log/sharded": Case(
+        lambda threads: _filled_tracker(True, threads), _visit_log, 20_000
+    ),
+    "render": Case(
+        _report, lambda report, _: lambda: VisitReportRenderer.render(report), 5_000
+    ),
+}
+
+
+def run_case(name: str, case: Case, threads: int, scale: float) -> Dict[str, Any]:
+    """
+    Runs one case at one thread count.
+
+    Args:
+        name (str): Name of the case.
+        case (Case): The case.
+        threads (int): Number of contending threads.
+        scale (float): Multiplier of the case's operation count.
+
+    Returns:
+        Dict[str, Any]: Throughput and latency of the run.
+    """
+    state = case.setup(threads)
+    per_thread = max(1, int(case.operations * scale) // threads)
+    barrier = threading.Barrier(threads + 1)
+    samples: List[List[float]] = [[] for _ in range(threads)]
+
+    def worker(index: int) -> None:
+        operation = case.operation(state, index)
+        local = samples[index]
+        clock = time.perf_counter
+        barrier.wait()
+        for _ in range(per_thread):
+            started = clock()
+            operation()
+            local.append(clock() - started)
+
+    workers = [
+        threading.Thread(target=worker, args=(index,)) for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    operations = per_thread * threads
+    return {
+        "case": name,
+        "threads": threads,
+        "operations": operations,
+        "seconds": round(elapsed, 4),
+        "ops_per_second": round(operations / elapsed, 1),
+        **latency_summary([sample for local in samples for sample in local]),
+        "rss_mb": rss_mb(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--threads", default="1,2,4,8,16,32,64", type=parse_ints)
+    parser.add_argument(
+        "--cases", default=",".join(CASES), help="Comma-separated case names."
+    )
+    parser.add_argument(
+        "--scale", default=1.0, type=float, help="Multiplier of the operation counts."
+    )
+    parser.add_argument("--output", help="JSON file to write (default: stdout).")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.cases.split(","):
+        if name not in CASES:
+            parser.error(f"unknown case '{name}' (choose from {', '.join(CASES)})")
+        for threads in args.threads:
+            result = run_case(name, CASES[name], threads, args.scale)
+            results.append(result)
+            print(
+                f"[Benchmark] {name:<26} threads={threads:<3} "
+                f"{result['ops_per_second']:>12,.0f} ops/s  "
+                f"p50={result['p50_us']}µs p99={result['p99_us']}µs",
+                file=sys.stderr,
+            )
+
+    write_results("micro", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+@Author: Eric Santos <ericshantos13@gmail.com>
+
+EmailSender against a local stand-in SMTP server.
+
+The stand-in speaks enough SMTP for smtplib (EHLO, MAIL, RCPT, DATA, NOOP,
+RSET, QUIT), waits a configurable time before its greeting to stand for
+the TCP, STARTTLS and LOGIN round trips of a real server, and can drop a
+session on purpose. The benchmark sends the same messages with a new
+session per message, over one reused session and as one batch, and
+reports the time taken and the sessions opened. With --faults it checks
+the recovery of a dropped session instead: a message is resent when the
+session dropped before DATA, and never when it dropped after it.
+
+Usage:
+    python -m benchmarks.smtp [--messages 50] [--handshake-ms 20]
+        [--faults] [--output smtp.json]
+"""
+
+import argparse
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.email_sender import EmailSender
+
+from .common import write_results
+
+Scenario = Callable[["StandInSMTPServer"], Dict[str, Any]]
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one SMTP session of the stand-in server.
+    """
+
+    server: "StandInSMTPServer"
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        server = self.server
+        server.count("connections")
+        time.sleep(server.handshake)
+        self._reply("220 stand-in ESMTP")
+
+        for raw in self.rfile:
+            command = raw.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+
+            if verb == "MAIL" and server.take_fault("mail"):
+                return
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 stand-in")
+            elif verb == "RCPT" and "reject" in command.lower():
+                self._reply("550 No such user")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                for line in self.rfile:
+                    if line in (b".\r\n", b".\n"):
+                        break
+                server.count("accepted")
+                if server.take_fault("data"):
+                    return
+                self._reply("250 Queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Local SMTP server accepting every message, for benchmarks and checks.
+
+    Attributes:
+        handshake (float): Seconds waited before the greeting of a session.
+        stats (Dict[str, int]): Sessions opened and messages accepted.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake: float = 0.0):
+        """
+        Binds the server to a free local port (not serving yet).
+
+        Args:
+            handshake (float): Seconds waited before each greeting.
+        """
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.handshake = handshake
+        self.stats = {"connections": 0, "accepted": 0}
+        self._faults: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def drop_next(self, stage: str) -> None:
+        """
+        Drops the session at the next MAIL command ("mail"), or after the
+        next message data, without replying to it ("data").
+
+        Args:
+            stage (str): "mail" or "data".
+        """
+        with self._lock:
+            self._faults.append(stage)
+
+    def take_fault(self, stage: str) -> bool:
+        with self._lock:
+            if stage in self._faults:
+                self._faults.remove(stage)
+                return True
+            return False
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {"connections": 0, "accepted": 0}
+
+    def start(self) -> None:
+        """
+        Serves in a background daemon thread.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def sender(self) -> EmailSender:
+        """
+        Returns:
+            EmailSender: A sender for this server (no STARTTLS nor LOGIN).
+        """
+        return EmailSender(
+            "bench@localhost", "", "127.0.0.1", self.port, use_tls=False, timeout=5.0
+        )
+
+
+def _messages(count: int) -> List[Any]:
+    return [
+        (f"user{index}@localhost", f"Report {index}", "<p>Visits</p>")
+        for index in range(count)
+    ]
+
+
+def run_case(name: str, server: StandInSMTPServer, count: int) -> Dict[str, Any]:
+    """
+    Sends the messages one way and measures it.
+
+    Args:
+        name (str): "per_message", "session" or "batch".
+        server (StandInSMTPServer): The server receiving the messages.
+        count (int): Number of messages.
+
+    Returns:
+        Dict[str, Any]: The result row.
+    """
+    messages = _messages(count)
+    server.reset_stats()
+    started = time.perf_counter()
+
+    if name == "per_message":
+        for message in messages:
+            sender = server.sender()
+            sender.send_html(*message)
+            sender.close()
+    else:
+        sender = server.sender()
+        if name == "session":
+            for message in messages:
+                sender.send_html(*message)
+        else:
+            sender.send_many(messages)
+        sender.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "case": name,
+        "messages": count,
+        "seconds": round(elapsed, 4),
+        "messages_per_second": round(count / elapsed, 1),
+        **server.stats,
+    }
+
+
+def _dropped_before_data(server: StandInSMTPServer) -> Dict[str, Any]:
+    sender = server.sender()
+    sender.send_html("a@localhost", "First", "<p>1</p>")
+    server.drop_next("mail")
+    sender.send_html("a@localhost", "Second", "<p>2</p>")
+    sender.close()
+    # The second message is resent once on a new session
+    return {"ok": server.stats == {"connections": 2, "accepted": 2}}
+
+
+def _dropped_after_data(server: StandInSMTPServer) -> Dict[str, Any]:
+    sender = server.sender()
+    server.drop_next("data")
+    try:
+        sender.send_html("a@localhost", "Once", "<p>1</p>")
+        raised = False
+    except smtplib.SMTPServerDisconnected:
+        raised = True
+    discarded = sender._session is None
+    sender.send_html("a@localhost", "Next", "<p>2</p>")
+    sender.close()
+    # Not resent, and the dead session is replaced for the next message
+    accepted = server.stats == {"connections": 2, "accepted": 2}
+    return {"ok": raised and discarded and accepted}
+
+
+def _refused_recipient(server: StandInSMTPServer) -> Dict[str, Any]:
+    sender = server.sender()
+    failures = sender.send_many(
+        [("a@localhost", "Kept", "<p>1</p>"), ("reject@localhost", "No", "<p>2</p>")]
+    )
+    sender.send_html("a@localhost", "Same session", "<p>3</p>")
+    sender.close()
+    refused = [index for index, _ in failures] == [1]
+    return {"ok": refused and server.stats == {"connections": 1, "accepted": 2}}
+
+
+FAULTS: Dict[str, Scenario] = {
+    "dropped_before_data": _dropped_before_data,
+    "dropped_after_data": _dropped_after_data,
+    "refused_recipient": _refused_recipient,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument(
+        "--handshake-ms",
+        type=float,
+        default=20.0,
+        help="Delay before each greeting, standing for STARTTLS and LOGIN.",
+    )
+    parser.add_argument(
+        "--faults", action="store_true", help="Check the session recovery instead."
+    )
+    parser.add_argument("--output", help="JSON file to write (default: stdout).")
+    args = parser.parse_args(argv)
+
+    server = StandInSMTPServer(handshake=args.handshake_ms / 1000)
+    server.start()
+    results = []
+    try:
+        if args.faults:
+            for name, scenario in FAULTS.items():
+                server.reset_stats()
+                results.append({"case": name, **scenario(server), **server.stats})
+        else:
+            for name in ("per_message", "session", "batch"):
+                results.append(run_case(name, server, args.messages))
+                print(
+                    f"[Benchmark] {name}: {results[-1]['seconds']}s",
+                    file=sys.stderr,
+                )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    write_results("smtp", results, args.output)
+    if not all(row.get("ok", True) for row in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()